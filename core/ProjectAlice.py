@@ -52,17 +52,24 @@ class ProjectAlice(Singleton):
 		else:
 			with Stopwatch() as stopWatch:
 				self._superManager = SuperManager(self)
+				profiler = self._superManager.bootProfiler
 
-				self._superManager.initManagers()
-				self._superManager.onStart()
+				with profiler.measure(name='Boot'):
+					with profiler.measure(name='Init managers'):
+						self._superManager.initManagers()
 
-				if self._superManager.ConfigManager.getAliceConfigByName('useHLC'):
-					self._superManager.Commons.runRootSystemCommand(['systemctl', 'start', 'hermesledcontrol'])
+					with profiler.measure(name='Start managers'):
+						self._superManager.onStart()
 
-				self._superManager.onBooted()
+					if self._superManager.ConfigManager.getAliceConfigByName('useHLC'):
+						self._superManager.Commons.runRootSystemCommand(['systemctl', 'start', 'hermesledcontrol'])
+
+					with profiler.measure(name='Boot managers'):
+						self._superManager.onBooted()
 
 			self._logger.logInfo(f'Started in {stopWatch} seconds')
 			self._booted = True
+			profiler.save(path=Path(self._superManager.Commons.rootDir(), 'var', 'logs', 'bootTrace.json'))
 
 
 	def checkDependencies(self) -> bool:
@@ -187,3 +187,7 @@ class StateAlreadyRegistered(ProjectAliceException):
 	def __init__(self, message: str = None):
 		super().__init__()
 		self._logger.logWarning(message)
+
+
+class WorkerPoolFull(ProjectAliceException):
+	pass  # Raised for capture only
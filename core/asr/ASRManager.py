@@ -17,20 +17,22 @@
 #
 #  Last modified: 2021.07.31 at 15:54:28 CEST
 
+import threading
 from importlib import import_module, reload
 
-import paho.mqtt.client as mqtt
 from googletrans import Translator
 from langdetect import detect
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Optional
 
+from core.ProjectAliceExceptions import WorkerPoolFull
 from core.asr.model import Asr
 from core.asr.model.ASRResult import ASRResult
 from core.asr.model.Recorder import Recorder
 from core.base.model.Manager import Manager
 from core.commons import constants
 from core.dialog.model.DialogSession import DialogSession
+from core.util.model.WorkerPool import WorkerPool
 
 
 class ASRManager(Manager):
@@ -43,11 +45,17 @@ class ASRManager(Manager):
 		self._streams: Dict[str, Recorder] = dict()
 		self._translator = Translator()
 		self._usingFallback = False
+		self._decodeLimit = 1
+		self._decodeSlots = threading.BoundedSemaphore(1)
+		self._decodeStatsLock = threading.Lock()
+		self._activeDecodes = 0
+		self._queuedDecodes = 0
 
 
 	def onStart(self):
 		super().onStart()
 		self._startASREngine()
+		self.updateDecodeLimit()
 
 
 	def onStop(self):
@@ -58,6 +66,31 @@ class ASRManager(Manager):
 	def restartEngine(self):
 		self._asr.onStop()
 		self._startASREngine()
+		self.updateDecodeLimit()
+
+
+	def updateDecodeLimit(self):
+		"""
+		Sets how many sessions are decoded at once, others are queued. Engines that share their recognizer between sessions get one slot only
+		:return:
+		"""
+		limit = max(1, int(self.ConfigManager.getAliceConfigByName('asrMaxConcurrentDecodes') or 1))
+		if not self._asr or not self._asr.supportsConcurrency:
+			limit = 1
+
+		# Running decodes release the semaphore they acquired
+		self._decodeLimit = limit
+		self._decodeSlots = threading.BoundedSemaphore(limit)
+
+
+	@property
+	def decodeStats(self) -> dict:
+		with self._decodeStatsLock:
+			return {
+				'limit'  : self._decodeLimit,
+				'active' : self._activeDecodes,
+				'queued' : self._queuedDecodes
+			}
 
 
 	def _startASREngine(self, forceAsr=None):
@@ -147,7 +180,23 @@ class ASRManager(Manager):
 
 	def onStartListening(self, session: DialogSession):
 		self._asr.onStartListening(session)
-		self.ThreadManager.newThread(name=f'streamdecode_{session.deviceUid}', target=self.decodeStream, args=[session])
+
+		# Record from now on, the decoding might have to wait for a free slot
+		if self._asr.usesRecorder:
+			context = self._asr.newContext(session)
+			self.addRecorder(session.deviceUid, context.recorder)
+			context.recorder.startRecording()
+
+		try:
+			self.ThreadManager.submit(func=self.decodeStream, pool='audio', priority=WorkerPool.PRIORITY_HIGH, args=[session])
+		except (WorkerPoolFull, RuntimeError) as e:
+			self.logError(f'Cannot decode session of device {session.deviceUid}: {e}')
+			self._asr.end(session.deviceUid)
+			self.removeRecorder(session.deviceUid)
+			self.MqttManager.endDialog(
+				sessionId=session.sessionId,
+				text=self.TalkManager.randomTalk(talk='error', skill='system')
+			)
 
 
 	def onStopListening(self, session: DialogSession):
@@ -158,24 +207,43 @@ class ASRManager(Manager):
 
 
 	def onPartialTextCaptured(self, session: DialogSession, text: str, likelihood: float, seconds: float):
-		self.logDebug(f'Capturing {text}')
+		self.logDebug('Capturing {}', text)
+
+
+	def _decode(self, session: DialogSession) -> Optional[ASRResult]:
+		slots = self._decodeSlots
+		with self._decodeStatsLock:
+			self._queuedDecodes += 1
+
+		with slots:
+			with self._decodeStatsLock:
+				self._queuedDecodes -= 1
+				self._activeDecodes += 1
+
+			try:
+				if session.hasEnded:
+					return None
+				return self._asr.decodeStream(session)
+			finally:
+				with self._decodeStatsLock:
+					self._activeDecodes -= 1
 
 
 	def decodeStream(self, session: DialogSession):
-		result: ASRResult = self._asr.decodeStream(session)
+		result = self._decode(session)
 
 		if result and result.text:
 			if session.hasEnded:
 				return
 
-			self.logDebug(f'Asr captured: {result.text}')
+			self.logDebug('Asr captured: {}', result.text)
 
 			text = result.text
 			if self.LanguageManager.overrideLanguage and not self.ConfigManager.getAliceConfigByName('stayCompletelyOffline') and not self.ConfigManager.getAliceConfigByName('keepASROffline'):
 				language = detect(text)
 				if language != 'en':
 					text = self._translator.translate(text=text, src=language, dest='en').text
-					self.logDebug(f'Asr translated to: {text}')
+					self.logDebug('Asr translated to: {}', text)
 
 			self.MqttManager.publish(topic=constants.TOPIC_TEXT_CAPTURED, payload={'sessionId': session.sessionId, 'text': text, 'device': session.deviceUid, 'likelihood': result.likelihood, 'seconds': result.processingTime})
 		else:
@@ -189,45 +257,46 @@ class ASRManager(Manager):
 			self.MqttManager.endSession(sessionId=session.sessionId, forceEnd=True)
 
 
-	def onAudioFrame(self, message: mqtt.MQTTMessage, deviceUid: str):
-		if deviceUid not in self._streams or not self._streams[deviceUid].isRecording:
-			return
-
-		self._streams[deviceUid].onAudioFrame(message, deviceUid)
-
-
 	def onSessionError(self, session: DialogSession):
 		if session.deviceUid not in self._streams or not self._streams[session.deviceUid].isRecording:
 			return
 
 		self._streams[session.deviceUid].onSessionError(session)
-		self._streams.pop(session.deviceUid, None)
+		self.removeRecorder(session.deviceUid)
 
 
 	def onSessionEnded(self, session: DialogSession):
 		if not self._asr or session.deviceUid not in self._streams or not self._streams[session.deviceUid].isRecording:
 			return
 
-		self._asr.end()
-		self._streams.pop(session.deviceUid, None)
+		self._asr.end(session.deviceUid)
+		self.removeRecorder(session.deviceUid)
 
 
 	def onVadUp(self, deviceUid: str):
 		if not self._asr or deviceUid not in self._streams or not self._streams[deviceUid].isRecording:
 			return
 
-		self._asr.onVadUp()
+		self._asr.onVadUp(deviceUid)
 
 
 	def onVadDown(self, deviceUid: str):
 		if not self._asr or deviceUid not in self._streams or not self._streams[deviceUid].isRecording:
 			return
 
-		self._asr.onVadDown()
+		self._asr.onVadDown(deviceUid)
 
 
 	def addRecorder(self, deviceUid: str, recorder: Recorder):
+		self.removeRecorder(deviceUid)
 		self._streams[deviceUid] = recorder
+		self.AudioServer.subscribeAudioFrames(callback=recorder.onAudioFrame, deviceUid=deviceUid)
+
+
+	def removeRecorder(self, deviceUid: str):
+		recorder = self._streams.pop(deviceUid, None)
+		if recorder:
+			self.AudioServer.unsubscribeAudioFrames(callback=recorder.onAudioFrame, deviceUid=deviceUid)
 
 
 	def updateASRCredentials(self, asr: str):
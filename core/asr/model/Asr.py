@@ -18,16 +18,14 @@
 #  Last modified: 2021.04.13 at 12:56:45 CEST
 
 import json
-import paho.mqtt.client as mqtt
-import threading
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 
+from core.asr.model.AsrContext import AsrContext
 from core.asr.model.Recorder import Recorder
 from core.base.model.ProjectAliceObject import ProjectAliceObject
 from core.commons import constants
 from core.dialog.model.DialogSession import DialogSession
-from core.util.model.AliceEvent import AliceEvent
 
 
 class Asr(ProjectAliceObject):
@@ -39,10 +37,9 @@ class Asr(ProjectAliceObject):
 		self._capableOfArbitraryCapture = False
 		self._isOnlineASR = False
 		self._isStreamAble = True
-		self._timeout: AliceEvent = self.ThreadManager.newEvent('asrTimeout')
-		self._timeoutTimer: Optional[threading.Timer] = None
-		self._recorder: Optional[Recorder] = None
-		self._previousPartialRecord = ''
+		self._supportsConcurrency = False
+		self._usesRecorder = True
+		self._contexts: Dict[str, AsrContext] = dict()
 		super().__init__()
 
 
@@ -61,26 +58,39 @@ class Asr(ProjectAliceObject):
 		return self._isStreamAble
 
 
+	@property
+	def supportsConcurrency(self) -> bool:
+		"""
+		Whether the engine can decode several sessions at once, sharing its model but not its recognizer state
+		"""
+		return self._supportsConcurrency
+
+
+	@property
+	def usesRecorder(self) -> bool:
+		"""
+		Whether the engine decodes the audio recorded by the ASRManager, rather than capturing it on its own
+		"""
+		return self._usesRecorder
+
+
 	def onStart(self):
 		self.logInfo(f'Starting {self.NAME}')
 
 
 	def onStop(self):
 		self.logInfo(f'Stopping {self.NAME}')
-		self._timeout.set()
+		for context in list(self._contexts.values()):
+			context.timeout.set()
 
 
-	def onAudioFrame(self, message: mqtt.MQTTMessage, deviceUid: str):
-		# Superseeded if needed
-		pass
-
-
-	def onVadUp(self, **kwargs):
-		# Superseeded if needed
-		pass
+	def onVadUp(self, deviceUid: str):
+		context = self.context(deviceUid)
+		if context:
+			context.triggered = True
 
 
-	def onVadDown(self, **kwargs):
+	def onVadDown(self, deviceUid: str):
 		# Superseeded if needed
 		pass
 
@@ -90,19 +100,59 @@ class Asr(ProjectAliceObject):
 		pass
 
 
+	def context(self, deviceUid: str) -> Optional[AsrContext]:
+		return self._contexts.get(deviceUid, None)
+
+
+	def newContext(self, session: DialogSession) -> AsrContext:
+		"""
+		Creates the recognition state of a listening session, ending any previous one of the same device
+		:param session:
+		:return:
+		"""
+		self.end(session.deviceUid)
+
+		timeout = self.ThreadManager.newEvent(f'asrTimeout_{session.deviceUid}')
+		context = AsrContext(session=session, recorder=Recorder(timeout, session.user, session.deviceUid), timeout=timeout)
+		self._contexts[session.deviceUid] = context
+		return context
+
+
+	def startDecoding(self, session: DialogSession) -> AsrContext:
+		"""
+		Returns the context of the session, created by the ASRManager when listening started, and arms its timeout
+		:param session:
+		:return:
+		"""
+		context = self.context(session.deviceUid)
+		if not context or context.session.sessionId != session.sessionId:
+			context = self.newContext(session)
+
+		context.timeout.clear()
+		context.timeoutTimer = self.ThreadManager.newTimer(interval=self.ConfigManager.getAliceConfigByName('asrTimeout'), func=self.timeout, args=[session.deviceUid])
+		return context
+
+
 	def decodeStream(self, session: DialogSession):
-		self._timeout.clear()
-		self._timeoutTimer = self.ThreadManager.newTimer(interval=int(self.ConfigManager.getAliceConfigByName('asrTimeout')), func=self.timeout)
+		self.startDecoding(session)
+
 
+	def end(self, deviceUid: str):
+		context = self._contexts.pop(deviceUid, None)
+		if not context:
+			return
+
+		context.recorder.stopRecording()
+		if context.timeoutTimer and context.timeoutTimer.is_alive():
+			context.timeoutTimer.cancel()
 
-	def end(self):
-		self._recorder.stopRecording()
-		if self._timeoutTimer and self._timeoutTimer.is_alive():
-			self._timeoutTimer.cancel()
 
+	def timeout(self, deviceUid: str):
+		context = self.context(deviceUid)
+		if not context:
+			return
 
-	def timeout(self):
-		self._timeout.set()
+		context.timeout.set()
 		self.logWarning('Asr timed out')
 
 
@@ -119,9 +169,10 @@ class Asr(ProjectAliceObject):
 
 
 	def partialTextCaptured(self, session: DialogSession, text: str, likelihood: float, seconds: float):
-		if not text or text.strip() == self._previousPartialRecord:
+		context = self.context(session.deviceUid)
+		if not text or not context or text.strip() == context.previousPartial:
 			return
-		self._previousPartialRecord = text.strip()
+		context.previousPartial = text.strip()
 		self.MqttManager.publish(constants.TOPIC_PARTIAL_TEXT_CAPTURED, json.dumps({
 			'text'      : text,
 			'likelihood': likelihood,
@@ -0,0 +1,39 @@
+#  Copyright (c) 2021
+#
+#  This file, AsrContext.py, is part of Project Alice.
+#
+#  Project Alice is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>
+#
+#  Last modified: 2026.10.18 at 20:33:46 CEST
+
+from dataclasses import dataclass
+from typing import Optional
+
+from core.asr.model.Recorder import Recorder
+from core.dialog.model.DialogSession import DialogSession
+from core.util.model.AliceEvent import AliceEvent
+from core.util.model.ThreadTimer import ThreadTimer
+
+
+@dataclass
+class AsrContext(object):
+	"""
+	The recognition state of one listening session, so that several devices can be decoded at once by the same engine
+	"""
+	session: DialogSession
+	recorder: Recorder
+	timeout: AliceEvent
+	timeoutTimer: Optional[ThreadTimer] = None
+	triggered: bool = False
+	previousPartial: str = ''
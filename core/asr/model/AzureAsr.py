@@ -24,7 +24,6 @@ from typing import Optional
 
 from core.asr.model.ASRResult import ASRResult
 from core.asr.model.Asr import Asr
-from core.asr.model.Recorder import Recorder
 from core.dialog.model.DialogSession import DialogSession
 from core.util.Stopwatch import Stopwatch
 
@@ -59,7 +58,6 @@ class AzureAsr(Asr):
 		self._apiUrl = ''
 		self._headers = dict()
 		self._wav: Optional[wave.Wave_write] = None
-		self._triggerFlag = self.ThreadManager.newEvent('asrTriggerFlag')
 
 
 	def onStart(self):
@@ -89,19 +87,16 @@ class AzureAsr(Asr):
 		self._wav.writeframes(frame)
 
 
-	def onVadUp(self):
-		self._triggerFlag.set()
-
-
-	def onVadDown(self):
-		if not self._triggerFlag.is_set():
+	def onVadDown(self, deviceUid: str):
+		context = self.context(deviceUid)
+		if not context or not context.triggered:
 			return
 
-		self._recorder.stopRecording()
+		context.recorder.stopRecording()
 
 
 	def decodeStream(self, session: DialogSession) -> Optional[ASRResult]:
-		super().decodeStream(session)
+		context = self.startDecoding(session)
 		result = None
 		previous = ''
 
@@ -112,9 +107,7 @@ class AzureAsr(Asr):
 			wav.setframerate(self.AudioServer.SAMPLERATE)
 			wav.setnchannels(1)
 
-			with Recorder(self._timeout, session.user, session.deviceUid) as recorder:
-				self.ASRManager.addRecorder(session.deviceUid, recorder)
-				self._recorder = recorder
+			with context.recorder as recorder:
 
 				for chunk in recorder:
 					print('chunk')
@@ -137,8 +130,7 @@ class AzureAsr(Asr):
 						previous = result['NBest'][0]['ITN']
 						self.partialTextCaptured(session=session, text=result, likelihood=result['NBest'][0]['Confidence'], seconds=processingTime.time)
 
-			self._triggerFlag.clear()
-			self.end()
+			self.end(session.deviceUid)
 
 		return ASRResult(
 			text=result['NBest'][0]['ITN'],
@@ -23,7 +23,6 @@ from typing import Generator, Optional
 
 from core.asr.model.ASRResult import ASRResult
 from core.asr.model.Asr import Asr
-from core.asr.model.Recorder import Recorder
 from core.dialog.model.DialogSession import DialogSession
 from core.util.Stopwatch import Stopwatch
 
@@ -48,11 +47,11 @@ class CoquiAsr(Asr):
 		super().__init__()
 		self._capableOfArbitraryCapture = True
 		self._isOnlineASR = False
+		self._supportsConcurrency = True
 
 		self._langPath = Path(self.Commons.rootDir(), f'trained/asr/coqui/{self.LanguageManager.activeLanguage}')
 
 		self._model: Optional[stt.Model] = None
-		self._triggerFlag = self.ThreadManager.newEvent('asrTriggerFlag')
 
 
 	def onStart(self):
@@ -126,25 +125,20 @@ class CoquiAsr(Asr):
 			return False
 
 
-	def onVadUp(self):
-		self._triggerFlag.set()
-
-
-	def onVadDown(self):
-		if not self._triggerFlag.is_set():
+	def onVadDown(self, deviceUid: str):
+		context = self.context(deviceUid)
+		if not context or not context.triggered:
 			return
 
-		self._recorder.stopRecording()
+		context.recorder.stopRecording()
 
 
 	def decodeStream(self, session: DialogSession) -> Optional[ASRResult]:
-		super().decodeStream(session)
+		context = self.startDecoding(session)
 		result = None
 
 		with Stopwatch() as processingTime:
-			with Recorder(self._timeout, session.user, session.deviceUid) as recorder:
-				self.ASRManager.addRecorder(session.deviceUid, recorder)
-				self._recorder = recorder
+			with context.recorder as recorder:
 				streamContext = self._model.createStream()
 				for chunk in recorder:
 					if not chunk:
@@ -156,8 +150,7 @@ class CoquiAsr(Asr):
 					self.partialTextCaptured(session=session, text=result, likelihood=1, seconds=0)
 
 			text = streamContext.finishStream()
-			self._triggerFlag.clear()
-			self.end()
+			self.end(session.deviceUid)
 
 		return ASRResult(
 			text=text,
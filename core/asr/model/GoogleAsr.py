@@ -24,7 +24,6 @@ from typing import Iterable, Optional
 
 from core.asr.model.ASRResult import ASRResult
 from core.asr.model.Asr import Asr
-from core.asr.model.Recorder import Recorder
 from core.dialog.model.DialogSession import DialogSession
 from core.util.Stopwatch import Stopwatch
 
@@ -52,6 +51,7 @@ class GoogleAsr(Asr):
 		self._credentialsFile = Path(self.Commons.rootDir(), 'credentials/googlecredentials.json')
 		self._capableOfArbitraryCapture = True
 		self._isOnlineASR = True
+		self._supportsConcurrency = True
 
 		self._client: Optional[SpeechClient] = None
 		self._streamingConfig: Optional[types.StreamingRecognitionConfig] = None
@@ -79,14 +79,10 @@ class GoogleAsr(Asr):
 
 
 	def decodeStream(self, session: DialogSession) -> Optional[ASRResult]:
-		super().decodeStream(session)
-
-		recorder = Recorder(self._timeout, session.user, session.deviceUid)
-		self.ASRManager.addRecorder(session.deviceUid, recorder)
-		self._recorder = recorder
+		context = self.startDecoding(session)
 		result = None
 		with Stopwatch() as processingTime:
-			with recorder as stream:
+			with context.recorder as stream:
 				audioStream = stream.audioStream()
 				# noinspection PyUnresolvedReferences
 				try:
@@ -97,7 +93,7 @@ class GoogleAsr(Asr):
 					self._internetLostFlag.clear()
 					self.logWarning(f'Failed ASR request: {e}')
 
-			self.end()
+			self.end(session.deviceUid)
 
 		return ASRResult(
 			text=result[0],
@@ -24,7 +24,6 @@ from typing import Optional
 
 from core.asr.model.ASRResult import ASRResult
 from core.asr.model.Asr import Asr
-from core.asr.model.Recorder import Recorder
 from core.commons import constants
 from core.dialog.model.DialogSession import DialogSession
 from core.util.Stopwatch import Stopwatch
@@ -94,8 +93,8 @@ class PocketSphinxAsr(Asr):
 		return True
 
 
-	def timeout(self):
-		super().timeout()
+	def timeout(self, deviceUid: str):
+		super().timeout(deviceUid)
 		try:
 			self._decoder.end_utt()
 		except:
@@ -140,18 +139,16 @@ class PocketSphinxAsr(Asr):
 
 
 	def decodeStream(self, session: DialogSession) -> Optional[ASRResult]:
-		super().decodeStream(session)
+		context = self.startDecoding(session)
 
 		result = None
 		counter = 0
 		with Stopwatch() as processingTime:
-			with Recorder(self._timeout, session.user, session.deviceUid) as recorder:
-				self.ASRManager.addRecorder(session.deviceUid, recorder)
-				self._recorder = recorder
+			with context.recorder as recorder:
 				self._decoder.start_utt()
 				inSpeech = False
 				for chunk in recorder:
-					if self._timeout.is_set():
+					if context.timeout.is_set():
 						break
 
 					self._decoder.process_raw(chunk, False, False)
@@ -168,7 +165,7 @@ class PocketSphinxAsr(Asr):
 							result = self._decoder.hyp() if self._decoder.hyp() else None
 							break
 
-				self.end()
+				self.end(session.deviceUid)
 
 		return ASRResult(
 			text=result.hypstr.strip(),
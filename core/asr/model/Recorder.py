@@ -17,10 +17,7 @@
 #
 #  Last modified: 2021.07.30 at 19:56:37 CEST
 
-import io
-import paho.mqtt.client as mqtt
 import queue
-import wave
 from typing import Generator
 
 from core.base.model.ProjectAliceObject import ProjectAliceObject
@@ -67,24 +64,23 @@ class Recorder(ProjectAliceObject):
 		self._buffer.put(None)
 
 
-	def onAudioFrame(self, message: mqtt.MQTTMessage, deviceUid: str):
-		with io.BytesIO(message.payload) as buffer:
-			try:
-				with wave.open(buffer, 'rb') as wav:
-					frame = wav.readframes(512)
-					while frame:
-						self._buffer.put(frame)
+	def onAudioFrame(self, frame: memoryview, deviceUid: str):
+		if not self._recording:
+			return
 
-						if self.ConfigManager.getAliceConfigByName('recordAudioAfterWakeword') or self.WakewordRecorder.state == WakewordRecorderState.RECORDING:
-							self.AudioServer.recordFrame(deviceUid, frame)
+		try:
+			# The frame is a view on the mqtt payload, the buffer outlives it
+			frame = frame.tobytes()
+			self._buffer.put(frame)
 
-						if not self.ASRManager.asr.isStreamAble:
-							self.ASRManager.asr.recordFrame(frame)
+			if self.ConfigManager.getAliceConfigByName('recordAudioAfterWakeword') or self.WakewordRecorder.state == WakewordRecorderState.RECORDING:
+				self.AudioServer.recordFrame(deviceUid, frame)
 
-						frame = wav.readframes(512)
+			if not self.ASRManager.asr.isStreamAble:
+				self.ASRManager.asr.recordFrame(frame)
 
-			except Exception as e:
-				self.logError(f'Error recording user speech: {e}')
+		except Exception as e:
+			self.logError(f'Error recording user speech: {e}')
 
 
 	def __iter__(self):
@@ -46,6 +46,7 @@ class SnipsAsr(Asr):
 		super().__init__()
 		self._capableOfArbitraryCapture = True
 		self._isOnlineASR = False
+		self._usesRecorder = False  # snips-asr listens to the audio frames itself
 		self._listening = False
 		self._thread: Optional[threading.Thread] = None
 		self._flag = threading.Event()
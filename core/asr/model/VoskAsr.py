@@ -23,7 +23,6 @@ from typing import Optional
 
 from core.asr.model.ASRResult import ASRResult
 from core.asr.model.Asr import Asr
-from core.asr.model.Recorder import Recorder
 from core.dialog.model.DialogSession import DialogSession
 from core.util.Stopwatch import Stopwatch
 
@@ -47,6 +46,7 @@ class VoskAsr(Asr):
 		super().__init__()
 		self._capableOfArbitraryCapture = True
 		self._isOnlineASR = False
+		self._supportsConcurrency = True
 		self._model: Optional[vosk.Model] = None
 		self._langPath = Path(self.Commons.rootDir(), f'trained/asr/vosk/{self.LanguageManager.activeLanguage}')
 
@@ -59,13 +59,11 @@ class VoskAsr(Asr):
 
 
 	def decodeStream(self, session: DialogSession) -> Optional[ASRResult]:
-		super().decodeStream(session)
+		context = self.startDecoding(session)
 		result = None
 
 		with Stopwatch() as processingTime:
-			with Recorder(self._timeout, session.user, session.deviceUid) as recorder:
-				self.ASRManager.addRecorder(session.deviceUid, recorder)
-				self._recorder = recorder
+			with context.recorder as recorder:
 				recognizer = vosk.KaldiRecognizer(self._model, 16000)
 				for chunk in recorder:
 					if not chunk:
@@ -80,7 +78,7 @@ class VoskAsr(Asr):
 						self.partialTextCaptured(session=session, text=result['partial'], likelihood=1, seconds=0)
 
 				result = json.loads(recognizer.FinalResult())['text']
-				self.end()
+				self.end(session.deviceUid)
 
 		return ASRResult(
 			text=result,
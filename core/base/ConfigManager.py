@@ -16,7 +16,6 @@
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>
 #
 #  Last modified: 2021.04.13 at 12:56:45 CEST
-import inspect
 import json
 import logging
 import re
@@ -26,7 +25,9 @@ from typing import Any, Dict, List, Optional, Tuple, Union
 
 from core.ProjectAliceExceptions import ConfigurationUpdateFailed, VitalConfigMissing
 from core.base.SuperManager import SuperManager
+from core.base.model.ConfigStore import ConfigStore
 from core.base.model.Manager import Manager
+from core.commons.CommonsManager import CommonsManager
 from core.webui.model.UINotificationType import UINotificationType
 
 
@@ -38,6 +39,9 @@ class ConfigManager(Manager):
 	# noinspection RegExpUnnecessaryNonCapturingGroup
 	CONFIG_FUNCTION_ARG_REGEX = re.compile(r'(?:\w+)')
 
+	TRUE_VALUES = {'on', 'yes', 'true', 'active'}
+	FALSE_VALUES = {'off', 'no', 'false', 'inactive'}
+
 
 	def __init__(self):
 		super().__init__()
@@ -50,11 +54,13 @@ class ConfigManager(Manager):
 
 		self._aliceTemplateConfigurations: Dict[str, dict] = self.loadJsonFromFile(self.TEMPLATE_FILE)
 		self._aliceConfigurations: Dict[str, Any] = dict()
-
-		self._loadCheckAndUpdateAliceConfigFile()
+		self._aliceConfigStore = ConfigStore(self.CONFIG_FILE)
 
 		self._skillsConfigurations = dict()
 		self._skillsTemplateConfigurations: Dict[str, dict] = dict()
+		self._skillsConfigStores: Dict[str, ConfigStore] = dict()
+
+		self._loadCheckAndUpdateAliceConfigFile()
 
 		self._pendingAliceConfUpdates = dict()
 
@@ -83,6 +89,23 @@ class ConfigManager(Manager):
 					self.logError(f'Configuration onStart method **{onStartFunction}** failed: {e}')
 
 
+	def onStop(self):
+		super().onStop()
+		self.flushConfigurations()
+
+
+	def flushConfigurations(self):
+		"""
+		Writes all the configuration saves that are still waiting
+		:return:
+		"""
+		for store in [self._aliceConfigStore, *self._skillsConfigStores.values()]:
+			try:
+				store.flush()
+			except ConfigurationUpdateFailed:
+				pass  # Already logged
+
+
 	# noinspection DuplicatedCode
 	def _loadCheckAndUpdateAliceConfigFile(self):
 		self.logInfo('Checking Alice configuration file')
@@ -96,7 +119,7 @@ class ConfigManager(Manager):
 		if not aliceConfigs:
 			self.logInfo('Creating config file from config template')
 			aliceConfigs = {configName: configData['defaultValue'] if 'defaultValue' in configData else configData for configName, configData in self._aliceTemplateConfigurations.items()}
-			self.CONFIG_FILE.write_text(json.dumps(aliceConfigs, indent='\t', ensure_ascii=False))
+			self._aliceConfigStore.write(aliceConfigs)
 
 		changes = False
 
@@ -221,7 +244,7 @@ class ConfigManager(Manager):
 		"""
 
 		rootSkills = [name.lower() for name in self.SkillManager.NEEDED_SKILLS]
-		callers = [inspect.getmodulename(frame[1]).lower() for frame in inspect.stack()]
+		callers = [str(caller).lower() for caller in CommonsManager.getFunctionCallers(depth=1)]
 		if 'aliceskill' in callers:
 			skillName = callers[callers.index('aliceskill') + 1]
 			if skillName not in rootSkills:
@@ -235,6 +258,8 @@ class ConfigManager(Manager):
 			self.logWarning(f"Was asked to update **{key}** but key doesn't exist")
 			raise ConfigurationUpdateFailed()
 
+		value = self.castAliceConfiguration(key, value)
+
 		pre = self.getAliceConfUpdatePreProcessing(key)
 		if doPreAndPostProcessing and pre and not self.ConfigManager.doConfigUpdatePreProcessing(pre, value):
 			return
@@ -252,6 +277,38 @@ class ConfigManager(Manager):
 			self.ConfigManager.doConfigUpdatePostProcessing(pp)
 
 
+	def castAliceConfiguration(self, key: str, value: Any) -> Any:
+		"""
+		Casts a value to the type defined by the configuration template, readers get it as is from memory
+		:param key:
+		:param value:
+		:return: the cast value
+		:raises ConfigurationUpdateFailed: If the value doesn't fit the setting
+		"""
+		definition = self._aliceTemplateConfigurations.get(key, dict())
+		dataType = definition.get('dataType', None)
+		try:
+			if dataType == 'boolean':
+				if isinstance(value, str) and value.lower() in self.TRUE_VALUES | self.FALSE_VALUES:
+					return value.lower() in self.TRUE_VALUES
+				elif isinstance(value, (bool, int)):
+					return bool(value)
+				raise ValueError(value)
+			elif dataType == 'integer':
+				return int(value)
+			elif dataType == 'range':
+				value = type(definition['defaultValue'])(float(value))
+				if not definition.get('min', value) <= value <= definition.get('max', value):
+					raise ValueError(value)
+				return value
+			elif dataType == 'string':
+				return str(value)
+			return value
+		except (ValueError, TypeError):
+			self.logWarning(f'Value **{value}** does not fit configuration **{key}** of type **{dataType}**')
+			raise ConfigurationUpdateFailed()
+
+
 	def bulkUpdateAliceConfigurations(self):
 		if not self._pendingAliceConfUpdates:
 			return
@@ -260,7 +317,11 @@ class ConfigManager(Manager):
 			if key not in self._aliceConfigurations:
 				self.logWarning(f"Was asked to update **{key}** but key doesn't exist")
 				continue
-			self.updateAliceConfiguration(key, value, False)
+
+			try:
+				self.updateAliceConfiguration(key, value, False)
+			except ConfigurationUpdateFailed:
+				continue
 
 		self.writeToAliceConfigurationFile()
 		self.deletePendingAliceConfigurationUpdates()
@@ -352,7 +413,7 @@ class ConfigManager(Manager):
 
 	def writeToAliceConfigurationFile(self, confs: dict = None):
 		"""
-		Saves the given configuration into config.json
+		Saves the given configuration into config.json. The write is delayed a bit so that close updates are written at once
 		:param confs: the dict to save
 		"""
 		confs = confs if confs else self._aliceConfigurations
@@ -360,26 +421,36 @@ class ConfigManager(Manager):
 		# noinspection PyTypeChecker
 		sort = dict(sorted(confs.items()))
 		self._aliceConfigurations = sort
-
-		try:
-			self.CONFIG_FILE.write_text(json.dumps(sort, indent='\t', sort_keys=True))
-		except Exception:
-			raise ConfigurationUpdateFailed()
+		self._aliceConfigStore.save(sort)
 
 
-	def _writeToSkillConfigurationFile(self, skillName: str, confs: dict):
+	def _writeToSkillConfigurationFile(self, skillName: str, confs: dict, delayed: bool = True):
 		"""
 		Saves the given configuration into config.json of the Skill
 		:param skillName: the targeted skill
 		:param confs: the dict to save
+		:param delayed: If set to False, the file is written right away instead of with the next updates
 		"""
 
 		# Don't store "active", "version", "author", "conditions" value in skill config file
 		misterProper = ['active', 'version', 'author', 'conditions']
 		confsCleaned = {key: value for key, value in confs.items() if key not in misterProper}
 
-		skillConfigFile = Path(self.Commons.rootDir(), 'skills', skillName, 'config.json')
-		skillConfigFile.write_text(json.dumps(confsCleaned, indent='\t', ensure_ascii=False, sort_keys=True))
+		store = self._skillsConfigStores.get(skillName, None)
+		if not store:
+			store = ConfigStore(Path(self.Commons.rootDir(), 'skills', skillName, 'config.json'), ensureAscii=False)
+			self._skillsConfigStores[skillName] = store
+
+		if delayed:
+			store.save(confsCleaned)
+		else:
+			store.write(confsCleaned)
+
+
+	def onSkillDeleted(self, skill: str):
+		store = self._skillsConfigStores.pop(skill, None)
+		if store:
+			store.discard()
 
 
 	def configAliceExists(self, configName: str) -> bool:
@@ -391,9 +462,9 @@ class ConfigManager(Manager):
 
 
 	def getAliceConfigByName(self, configName: str) -> Any:
-		if configName in self._aliceConfigurations:
+		try:
 			return self._aliceConfigurations[configName]
-		else:
+		except KeyError:
 			self.logDebug(f'Trying to get config **{configName}** but it does not exist')
 			return ''
 
@@ -427,13 +498,22 @@ class ConfigManager(Manager):
 	def loadCheckAndUpdateSkillConfigurations(self, skillToLoad: str = None):
 		skillsConfigurations = dict()
 
-		for skillName, skillInstance in self.SkillManager.activeSkills.items():
+		# Skills are initialized in parallel, iterate over a snapshot
+		for skillName, skillInstance in self.SkillManager.activeSkills.copy().items():
 
 			if skillToLoad and skillName != skillToLoad:
 				continue
 
 			self.logInfo(f'Checking configuration for skill **{skillName}**')
 
+			# Saves are delayed, make sure the file on disk is up to date before reading it
+			store = self._skillsConfigStores.get(skillName, None)
+			if store:
+				try:
+					store.flush()
+				except ConfigurationUpdateFailed:
+					pass  # Already logged
+
 			skillConfigFile = skillInstance.getResource(str(self.CONFIG_FILE))
 			skillConfigTemplate = skillInstance.getResource('config.json.template')
 			config = dict()
@@ -480,7 +560,7 @@ class ConfigManager(Manager):
 							del config[k]
 
 					if changes:
-						self._writeToSkillConfigurationFile(skillName, config)
+						self._writeToSkillConfigurationFile(skillName, config, delayed=False)
 				except Exception as e:
 					self.logWarning(f'- Failed updating existing skill config file for skill **{skillName}**: {e}')
 					skillConfigFile.unlink()
@@ -515,7 +595,7 @@ class ConfigManager(Manager):
 		confs = {configName: configData['defaultValue'] if 'defaultValue' in configData else configData for configName, configData in template.items()}
 		self._skillsTemplateConfigurations[skillName] = template
 		self._skillsConfigurations[skillName] = confs
-		self._writeToSkillConfigurationFile(skillName, confs)
+		self._writeToSkillConfigurationFile(skillName, confs, delayed=False)
 
 
 	def changeActiveLanguage(self, toLang: str):
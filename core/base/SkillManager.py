@@ -22,25 +22,30 @@ import importlib
 import json
 import requests
 import shutil
+import threading
+import time
 import traceback
 from AliceGit import Exceptions as GitErrors
 from AliceGit.Exceptions import NotGitRepository, PathNotFoundException
 from AliceGit.Git import Repository
 from contextlib import suppress
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 from core.ProjectAliceExceptions import AccessLevelTooLow, GithubNotFound, SkillInstanceFailed, SkillNotConditionCompliant, SkillStartDelayed, SkillStartingFailed
 from core.base.SuperManager import SuperManager
 from core.base.model import Intent
 from core.base.model.AliceSkill import AliceSkill
 from core.base.model.FailedAliceSkill import FailedAliceSkill
+from core.base.model.IntentRouter import IntentRouter
 from core.base.model.Manager import Manager
 from core.base.model.Version import Version
 from core.commons import constants
 from core.dialog.model.DialogSession import DialogSession
 from core.util.Decorators import IfSetting, Online, deprecated
 from core.util.model.AliceEvent import AliceEvent
+from core.util.model.TaskGraph import TaskGraph
+from core.util.model.WorkerPool import WorkerPool
 from core.webui.model.UINotificationType import UINotificationType
 
 
@@ -85,6 +90,17 @@ class SkillManager(Manager):
 		self._deactivatedSkills: Dict[str, AliceSkill] = dict()
 		self._failedSkills: Dict[str, Union[AliceSkill, FailedAliceSkill]] = dict()
 
+		# Event name: list of (skill name, bound handler, is the onEvent catch all), built on first use
+		self._skillEventHandlers: Dict[str, List[Tuple[str, Callable, bool]]] = dict()
+
+		# Intent topic to skills routing, built on first dispatch
+		self._intentRouter: Optional[IntentRouter] = None
+		self._intentRouterVersion = 0
+		self._intentRouterLock = threading.Lock()
+
+		# Boot timings, per phase and per skill, in seconds
+		self._startupReport: Dict[str, Any] = {'init': 0.0, 'start': 0.0, 'workers': 0, 'skills': dict()}
+
 
 	@property
 	def supportedIntents(self) -> List[Dict]:
@@ -527,11 +543,13 @@ class SkillManager(Manager):
 	def initSkills(self, onlyInit: str = '', reload: bool = False):
 		"""
 		Initializing skills by checking their condition compliance and instantiating them.
-		Does check if a skill fails and is required
+		Does check if a skill fails and is required. Skills are initialized in parallel, a skill
+		waiting for the skills it depends on
 		:param onlyInit: If specified, will only init the given skill name
 		:param reload: If the skill is already instantiated, performs a module reload, after an update per example.
 		:return:
 		"""
+		installFiles: Dict[str, dict] = dict()
 
 		for skillName in self._skillList:
 			if onlyInit and skillName != onlyInit:
@@ -540,10 +558,11 @@ class SkillManager(Manager):
 			self._activeSkills.pop(skillName, None)
 			self._failedSkills.pop(skillName, None)
 			self._deactivatedSkills.pop(skillName, None)
+			self.invalidateSkillEventRegistry()
 
 			try:
 				installFilePath = self.getSkillInstallFilePath(skillName=skillName)
-				installFile = json.loads(installFilePath.read_text())
+				installFiles[skillName] = json.loads(installFilePath.read_text())
 			except Exception as e:
 				if skillName in self.NEEDED_SKILLS:
 					self.logFatal(f'Cannot load skill install file for skill **{skillName}**. The skill is required to continue: {e}')
@@ -552,50 +571,144 @@ class SkillManager(Manager):
 					self.logWarning(f'Cannot load skill install file for skill **{skillName}**, skipping: {e}')
 					continue
 
-			try:
-				skillActiveState = self.isSkillActive(skillName=skillName)
-				if not skillActiveState:
-					if skillName in self.NEEDED_SKILLS:
-						self.logFatal(f"Skill {skillName} marked as disabled but it cannot be")
-						return
-					else:
-						self.logInfo(f'Skill {skillName} is disabled')
-				else:
-					self.checkSkillConditions(installFile)
+		if onlyInit:
+			for skillName, installFile in installFiles.items():
+				self.initSkill(skillName=skillName, installFile=installFile, reload=reload)
+			return
 
-				skillInstance = self.instantiateSkill(skillName=skillName, reload=reload)
-				if skillInstance:
-					if skillName in self.NEEDED_SKILLS:
-						skillInstance.required = True
+		pool = self._startupPool()
+		graph = TaskGraph(pool=pool)
 
-					if skillActiveState:
-						self._activeSkills[skillInstance.name] = skillInstance
-					else:
-						self._deactivatedSkills[skillName] = skillInstance
+		def init(skillName: str, installFile: dict):
+			with SuperManager.getInstance().bootProfiler.measure(name=f'{skillName}.init', category='skill'):
+				if not self.initSkill(skillName=skillName, installFile=installFile, reload=reload):
+					graph.abort()
+
+		for skillName, installFile in installFiles.items():
+			graph.add(name=skillName, func=init, args=[skillName, installFile], dependencies=self.skillDependencies(installFile))
+
+		startedAt = time.monotonic()
+		try:
+			timings = graph.run()
+		finally:
+			pool.shutdown(cancelPending=False)
+		self._recordStartupTimings(phase='init', timings=timings, duration=time.monotonic() - startedAt)
+		self._sortSkills()
 
-					self.ConfigManager.loadCheckAndUpdateSkillConfigurations(skillToLoad=skillName)
+
+	def initSkill(self, skillName: str, installFile: dict, reload: bool = False) -> bool:
+		"""
+		Checks the conditions of a single skill and instantiates it
+		:param skillName:
+		:param installFile: The parsed skill install file
+		:param reload: If the skill is already instantiated, performs a module reload
+		:return: False if a required skill failed and Alice cannot continue
+		"""
+		try:
+			skillActiveState = self.isSkillActive(skillName=skillName)
+			if not skillActiveState:
+				if skillName in self.NEEDED_SKILLS:
+					self.logFatal(f"Skill {skillName} marked as disabled but it cannot be")
+					return False
 				else:
-					if skillName in self.NEEDED_SKILLS:
-						self.logFatal('The skill is required to continue...')
-						return
-					else:
-						self._failedSkills[skillName] = FailedAliceSkill(installFile)
-			except SkillNotConditionCompliant as e:
-				if self.notCompliantSkill(skillName=skillName, exception=e):
-					self._failedSkills[skillName] = FailedAliceSkill(installFile)
-					self.changeSkillStateInDB(skillName=skillName, newState=False)
-					continue
+					self.logInfo(f'Skill {skillName} is disabled')
+			else:
+				self.checkSkillConditions(installFile)
+
+			skillInstance = self.instantiateSkill(skillName=skillName, reload=reload)
+			if skillInstance:
+				if skillName in self.NEEDED_SKILLS:
+					skillInstance.required = True
+
+				if skillActiveState:
+					self._activeSkills[skillInstance.name] = skillInstance
+					self.invalidateSkillEventRegistry()
 				else:
-					return
-			except Exception as e:
-				self.logError(f'Something went wrong loading skill {skillName}: {repr(e)}', printStack=True)
+					self._deactivatedSkills[skillName] = skillInstance
+
+				self.ConfigManager.loadCheckAndUpdateSkillConfigurations(skillToLoad=skillName)
+			else:
 				if skillName in self.NEEDED_SKILLS:
 					self.logFatal('The skill is required to continue...')
-					return
+					return False
 				else:
 					self._failedSkills[skillName] = FailedAliceSkill(installFile)
-					self.changeSkillStateInDB(skillName=skillName, newState=False)
-					continue
+		except SkillNotConditionCompliant as e:
+			if self.notCompliantSkill(skillName=skillName, exception=e):
+				self._failedSkills[skillName] = FailedAliceSkill(installFile)
+				self.changeSkillStateInDB(skillName=skillName, newState=False)
+			else:
+				return False
+		except Exception as e:
+			self.logError(f'Something went wrong loading skill {skillName}: {repr(e)}', printStack=True)
+			if skillName in self.NEEDED_SKILLS:
+				self.logFatal('The skill is required to continue...')
+				return False
+			else:
+				self._failedSkills[skillName] = FailedAliceSkill(installFile)
+				self.changeSkillStateInDB(skillName=skillName, newState=False)
+
+		return True
+
+
+	@staticmethod
+	def skillDependencies(installFile: dict) -> List[str]:
+		"""
+		Returns the names of the skills the given skill depends on, as declared in its install file conditions
+		:param installFile:
+		:return:
+		"""
+		return [skill.split('/')[-1] for skill in installFile.get('conditions', dict()).get('skill', list())]
+
+
+	@property
+	def startupReport(self) -> Dict[str, Any]:
+		"""
+		Returns how long each skill took to init and start during boot, in seconds
+		:return:
+		"""
+		return self._startupReport
+
+
+	def _startupPool(self) -> WorkerPool:
+		"""
+		A pool of its own for one init or start run, to be shut down once the run is over so its threads don't idle for the rest of the uptime
+		:return:
+		"""
+		workers = max(1, int(self.ConfigManager.getAliceConfigByName('skillStartupWorkers') or 1))
+		self._startupReport['workers'] = workers
+		return WorkerPool(name='skillStartup', maxWorkers=workers)
+
+
+	def _sortSkills(self):
+		"""
+		Parallel init fills the skill dicts in completion order, restore the skill list order
+		:return:
+		"""
+		for skills in (self._activeSkills, self._deactivatedSkills, self._failedSkills):
+			ordered = sorted(skills.items(), key=lambda item: self._skillList.index(item[0]) if item[0] in self._skillList else len(self._skillList))
+			skills.clear()
+			skills.update(ordered)
+
+		self.invalidateSkillEventRegistry()
+
+
+	def _recordStartupTimings(self, phase: str, timings: Dict[str, dict], duration: float):
+		self._startupReport[phase] = duration
+		for skillName, timing in timings.items():
+			report = self._startupReport['skills'].setdefault(skillName, dict())
+			report[phase] = timing['duration']
+			if timing['error']:
+				report['error'] = timing['error']
+
+
+	def _logStartupReport(self):
+		report = self._startupReport
+		self.logInfo(f'Skills took {report["init"]:.2f}s to init and {report["start"]:.2f}s to start, using {report["workers"]} workers')
+
+		skills = sorted(report['skills'].items(), key=lambda item: item[1].get('init', 0) + item[1].get('start', 0), reverse=True)
+		for skillName, timing in skills:
+			self.logInfo(f'- {skillName}: init {timing.get("init", 0) * 1000:.0f}ms, start {timing.get("start", 0) * 1000:.0f}ms')
 
 
 	def getSkillInstallFilePath(self, skillName: str) -> Path:
@@ -794,6 +907,7 @@ class SkillManager(Manager):
 		if skillName in self._activeSkills:
 			skill = self._activeSkills.pop(skillName, None)
 			self.deactivatedSkills[skillName] = skill
+			self.invalidateSkillEventRegistry()
 			skill.onStop()
 			self.broadcast(
 				method=constants.EVENT_SKILL_STOPPED,
@@ -842,23 +956,37 @@ class SkillManager(Manager):
 
 	def startAllSkills(self):
 		"""
-		Starts all the discovered skills
+		Starts all the discovered skills, in parallel, a skill waiting for the skills it depends on
 		:return:
 		"""
 		supportedIntents = list()
 
-		for skillName in self._activeSkills.copy():
+		def start(skillName: str):
 			try:
-				supportedIntents += self.startSkill(skillName)
+				with SuperManager.getInstance().bootProfiler.measure(name=f'{skillName}.onStart', category='skill'):
+					supportedIntents.extend(self.startSkill(skillName))
 			except SkillStartingFailed:
-				continue
+				pass
 			except SkillStartDelayed:
 				self.logInfo(f'Skill {skillName} start is delayed')
 
+		pool = self._startupPool()
+		graph = TaskGraph(pool=pool)
+		for skillName, skillInstance in self._activeSkills.copy().items():
+			graph.add(name=skillName, func=start, args=[skillName], dependencies=self.skillDependencies(skillInstance.installer))
+
+		startedAt = time.monotonic()
+		try:
+			timings = graph.run()
+		finally:
+			pool.shutdown(cancelPending=False)
+		self._recordStartupTimings(phase='start', timings=timings, duration=time.monotonic() - startedAt)
+
 		supportedIntents = list(set(supportedIntents))
 		self._supportedIntents = supportedIntents
 
 		self.logInfo(f'Skills started. {len(supportedIntents)} intents supported')
+		self._logStartupReport()
 
 
 	def startSkill(self, skillName: str) -> Dict:
@@ -884,6 +1012,7 @@ class SkillManager(Manager):
 
 			if skillInstance:
 				self.activeSkills[skillName] = skillInstance
+				self.invalidateSkillEventRegistry()
 			else:
 				return dict()
 		else:
@@ -895,6 +1024,9 @@ class SkillManager(Manager):
 			if self.ProjectAlice.isBooted:
 				skillInstance.onBooted()
 
+			# Its intents may have changed while starting
+			self.invalidateSkillEventRegistry()
+
 			self.broadcast(
 				method=constants.EVENT_SKILL_STARTED,
 				exceptions=[constants.DUMMY],
@@ -917,6 +1049,7 @@ class SkillManager(Manager):
 			except:
 				self._activeSkills.pop(skillName, None)
 				self._deactivatedSkills.pop(skillName, None)
+				self.invalidateSkillEventRegistry()
 
 			self._failedSkills[skillName] = FailedAliceSkill(skillInstance.installer)
 
@@ -1020,13 +1153,20 @@ class SkillManager(Manager):
 
 	def dispatchMessage(self, session: DialogSession) -> bool:
 		"""
-		Dispatches a MQTT message to skills until one accepts it and returns True. If the intent wasn't consumed, return False
+		Dispatches a MQTT message to the skills supporting its intent until one accepts it and returns True. If the intent wasn't consumed, return False
 		:param session:
 		:return:
 		"""
-		for skillName, skillInstance in self._activeSkills.items():
+		for skillName, intent in self.intentRouter.route(session.message.topic):
+			skillInstance = self._activeSkills.get(skillName, None)
+			if not skillInstance:
+				continue
+
 			try:
-				consumed = skillInstance.onMessageDispatch(session)
+				if intent:
+					consumed = skillInstance.dispatchIntent(session=session, intent=intent)
+				else:
+					consumed = skillInstance.onMessageDispatch(session)
 			except AccessLevelTooLow:
 				# The command was recognized but required higher access level
 				return True
@@ -1040,7 +1180,7 @@ class SkillManager(Manager):
 				return True
 
 			if consumed:
-				self.logDebug(f'The intent "{session.intentName.split("/")[-1]}" was consumed by {skillName}')
+				self.logDebug(lambda: f'The intent "{session.intentName.split("/")[-1]}" was consumed by {skillName}')
 
 				if self.MultiIntentManager.isProcessing(session.sessionId):
 					self.MultiIntentManager.processNextIntent(session=session)
@@ -1144,24 +1284,76 @@ class SkillManager(Manager):
 		if not method.startswith('on'):
 			method = f'on{method[0].capitalize() + method[1:]}'
 
-		for skillName, skillInstance in self._activeSkills.items():
-
+		for skillName, func, catchAll in self.getSkillEventHandlers(method):
 			if filterOut and skillName in filterOut:
 				continue
 
 			try:
-				func = getattr(skillInstance, method, None)
-				if func:
-					func(**kwargs)
-
-				func = getattr(skillInstance, 'onEvent', None)
-				if func:
+				if catchAll:
 					func(event=method, **kwargs)
-
+				else:
+					func(**kwargs)
 			except TypeError as e:
 				self.logWarning(f'Failed to broadcast event {method} to {skillName}: {e}')
 
 
+	def getSkillEventHandlers(self, method: str) -> List[Tuple[str, Callable, bool]]:
+		"""
+		Returns the handlers of the active skills for the given event, in skill order. A skill implementing
+		onEvent gets it right after its own handler, flagged as catch all
+		:param method: The full event method name, such as onAudioFrame
+		:return:
+		"""
+		registry = self._skillEventHandlers
+		handlers = registry.get(method, None)
+		if handlers is not None:
+			return handlers
+
+		handlers = list()
+		for skillName, skillInstance in self._activeSkills.copy().items():
+			names = skillInstance.eventHandlerNames()
+			if method in names:
+				handlers.append((skillName, getattr(skillInstance, method), False))
+
+			if 'onEvent' in names:
+				handlers.append((skillName, getattr(skillInstance, 'onEvent'), True))
+
+		# Stored in the registry we started with, if it was invalidated meanwhile this result is simply dropped
+		registry[method] = handlers
+		return handlers
+
+
+	def invalidateSkillEventRegistry(self):
+		"""
+		Drops the skill event dispatch table and the intent routes, they are rebuilt on next use. Call whenever active skills change
+		:return:
+		"""
+		self._skillEventHandlers = dict()
+		with self._intentRouterLock:
+			self._intentRouterVersion += 1
+			self._intentRouter = None
+
+
+	@property
+	def intentRouter(self) -> IntentRouter:
+		"""
+		Returns the intent routing table of the active skills, building it if needed
+		:return:
+		"""
+		with self._intentRouterLock:
+			router = self._intentRouter
+			version = self._intentRouterVersion
+
+		if router is None:
+			router = IntentRouter(self._activeSkills.copy())
+			# Built outside the lock. If skills changed meanwhile, use it for this dispatch only
+			with self._intentRouterLock:
+				if version == self._intentRouterVersion:
+					self._intentRouter = router
+
+		return router
+
+
 	def removeSkill(self, skillName: str):
 		"""
 		Deletes a skill completely
@@ -1183,6 +1375,7 @@ class SkillManager(Manager):
 		self._activeSkills.pop(skillName, None)
 		self._deactivatedSkills.pop(skillName, None)
 		self._failedSkills.pop(skillName, None)
+		self.invalidateSkillEventRegistry()
 
 		self.removeSkillFromDB(skillName=skillName)
 
@@ -1267,6 +1460,7 @@ class SkillManager(Manager):
 		self._deactivatedSkills = dict()
 		self._failedSkills = dict()
 		self._skillList = dict()
+		self.invalidateSkillEventRegistry()
 
 
 	def isSkillUserModified(self, skillName: str) -> bool:
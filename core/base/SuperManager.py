@@ -19,6 +19,8 @@
 
 from __future__ import annotations
 
+from typing import Callable, Dict, List, Optional, Tuple
+
 from core.device.model.DeviceAbility import DeviceAbility
 from core.util.model.Logger import Logger
 
@@ -38,6 +40,11 @@ class SuperManager(object):
 	def __init__(self, mainClass):
 		SuperManager._INSTANCE = self
 		self._managers = dict()
+		self._eventHandlers: Optional[Dict[str, List[Tuple[str, Callable]]]] = None
+		self._booted = False
+
+		from core.util.model.BootProfiler import BootProfiler
+		self.bootProfiler = BootProfiler()
 
 		self.projectAlice             = mainClass
 		self.AliceWatchManager        = None #NOSONAR
@@ -82,44 +89,44 @@ class SuperManager(object):
 	def onStart(self):
 		try:
 			bugReportManager = self._managers.pop('BugReportManager')
-			bugReportManager.onStart()
+			self._startManager(bugReportManager)
 			self._managers[bugReportManager.name] = bugReportManager
 
 			commons = self._managers.pop('CommonsManager')
-			commons.onStart()
+			self._startManager(commons)
 
 			stateManager = self._managers.pop('StateManager')
-			stateManager.onStart()
+			self._startManager(stateManager)
 
 			subprocessManager = self._managers.pop('SubprocessManager')
-			subprocessManager.onStart()
+			self._startManager(subprocessManager)
 
 			configManager = self._managers.pop('ConfigManager')
-			configManager.onStart()
+			self._startManager(configManager)
 
 			languageManager = self._managers.pop('LanguageManager')
-			languageManager.onStart()
+			self._startManager(languageManager)
 
 			webUINotificationManager = self._managers.pop('WebUINotificationManager')
-			webUINotificationManager.onStart()
+			self._startManager(webUINotificationManager)
 
 			locationManager = self._managers.pop('LocationManager')
-			locationManager.onStart()
+			self._startManager(locationManager)
 
 			audioServer = self._managers.pop('AudioManager')
-			audioServer.onStart()
+			self._startManager(audioServer)
 
 			internetManager = self._managers.pop('InternetManager')
-			internetManager.onStart()
+			self._startManager(internetManager)
 
 			databaseManager = self._managers.pop('DatabaseManager')
-			databaseManager.onStart()
+			self._startManager(databaseManager)
 
 			userManager = self._managers.pop('UserManager')
-			userManager.onStart()
+			self._startManager(userManager)
 
 			mqttManager = self._managers.pop('MqttManager')
-			mqttManager.onStart()
+			self._startManager(mqttManager)
 
 			talkManager = self._managers.pop('TalkManager')
 			skillManager = self._managers.pop('SkillManager')
@@ -132,16 +139,16 @@ class SuperManager(object):
 
 			for manager in self._managers.copy().values():
 				if manager and manager.name != self.BugReportManager.name:
-					manager.onStart()
+					self._startManager(manager)
 
-			talkManager.onStart()
-			nluManager.onStart()
-			skillManager.onStart()
-			deviceManager.onStart()
-			widgetManager.onStart()
-			dialogTemplateManager.onStart()
-			assistantManager.onStart()
-			nodeRedManager.onStart()
+			self._startManager(talkManager)
+			self._startManager(nluManager)
+			self._startManager(skillManager)
+			self._startManager(deviceManager)
+			self._startManager(widgetManager)
+			self._startManager(dialogTemplateManager)
+			self._startManager(assistantManager)
+			self._startManager(nodeRedManager)
 
 			self._managers[configManager.name] = configManager
 			self._managers[audioServer.name] = audioServer
@@ -163,6 +170,8 @@ class SuperManager(object):
 			self._managers[stateManager.name] = stateManager
 			self._managers[subprocessManager.name] = subprocessManager
 			self._managers[bugReportManager.name] = bugReportManager
+
+			self.buildEventRegistry()
 		except Exception as e:
 			import traceback
 
@@ -171,14 +180,22 @@ class SuperManager(object):
 
 
 	def onBooted(self):
+		from core.base.model.LazyManager import LazyManager
+		from core.util.model.WorkerPool import WorkerPool
+
 		manager = None
 		try:
 			for manager in self._managers.values():
 				if manager:
-					manager.onBooted()
+					with self.bootProfiler.measure(name=f'{manager.name}.onBooted', category='manager'):
+						manager.onBooted()
 		except Exception as e:
 			Logger().logError(f'Error while sending onBooted to manager **{manager.name}**: {e}')
 
+		self._booted = True
+		for manager in [manager for manager in self._managers.values() if isinstance(manager, LazyManager) and manager.warmUp]:
+			self.ThreadManager.submit(func=manager.load, priority=WorkerPool.PRIORITY_LOW)
+
 		deviceList = self.DeviceManager.getDevicesWithAbilities([DeviceAbility.IS_SATELITTE, DeviceAbility.IS_CORE], connectedOnly=False)
 		self.MqttManager.playSound(soundFilename='boot', deviceUid=deviceList)
 
@@ -189,83 +206,99 @@ class SuperManager(object):
 
 
 	def initManagers(self):
-		from core.commons.CommonsManager import CommonsManager
-		from core.base.ConfigManager import ConfigManager
-		from core.base.SkillManager import SkillManager
-		from core.webui.WidgetManager import WidgetManager
-		from core.device.DeviceManager import DeviceManager
-		from core.myHome.LocationManager import LocationManager
-		from core.dialog.MultiIntentManager import MultiIntentManager
-		from core.server.MqttManager import MqttManager
-		from core.user.UserManager import UserManager
-		from core.util.DatabaseManager import DatabaseManager
-		from core.util.InternetManager import InternetManager
-		from core.util.TelemetryManager import TelemetryManager
-		from core.util.ThreadManager import ThreadManager
-		from core.util.TimeManager import TimeManager
-		from core.asr.ASRManager import ASRManager
-		from core.voice.LanguageManager import LanguageManager
-		from core.voice.TalkManager import TalkManager
-		from core.voice.TTSManager import TTSManager
-		from core.voice.WakewordRecorder import WakewordRecorder
-		from core.webApi.ApiManager import ApiManager
-		from core.webui.NodeRedManager import NodeRedManager
-		from core.base.SkillStoreManager import SkillStoreManager
-		from core.dialog.DialogTemplateManager import DialogTemplateManager
-		from core.base.AssistantManager import AssistantManager
-		from core.nlu.NluManager import NluManager
-		from core.util.AliceWatchManager import AliceWatchManager
-		from core.server.AudioServer import AudioManager
-		from core.dialog.DialogManager import DialogManager
-		from core.voice.WakewordManager import WakewordManager
-		from core.webui.WebUIManager import WebUIManager
-		from core.base.StateManager import StateManager
-		from core.util.SubprocessManager import SubprocessManager
-		from core.webui.WebUINotificationManager import WebUINotificationManager
-		from core.util.BugReportManager import BugReportManager
-		from core.llm.LlmManager import LlmManager
-
-		self.BugReportManager = BugReportManager()
-		self.CommonsManager = CommonsManager()
+		with self.bootProfiler.measure(name='Import managers'):
+			from core.commons.CommonsManager import CommonsManager
+			from core.base.ConfigManager import ConfigManager
+			from core.base.SkillManager import SkillManager
+			from core.webui.WidgetManager import WidgetManager
+			from core.device.DeviceManager import DeviceManager
+			from core.myHome.LocationManager import LocationManager
+			from core.dialog.MultiIntentManager import MultiIntentManager
+			from core.server.MqttManager import MqttManager
+			from core.user.UserManager import UserManager
+			from core.util.DatabaseManager import DatabaseManager
+			from core.util.InternetManager import InternetManager
+			from core.util.TelemetryManager import TelemetryManager
+			from core.util.ThreadManager import ThreadManager
+			from core.util.TimeManager import TimeManager
+			from core.asr.ASRManager import ASRManager
+			from core.voice.LanguageManager import LanguageManager
+			from core.voice.TalkManager import TalkManager
+			from core.voice.TTSManager import TTSManager
+			from core.dialog.DialogTemplateManager import DialogTemplateManager
+			from core.base.AssistantManager import AssistantManager
+			from core.nlu.NluManager import NluManager
+			from core.util.AliceWatchManager import AliceWatchManager
+			from core.server.AudioServer import AudioManager
+			from core.dialog.DialogManager import DialogManager
+			from core.voice.WakewordManager import WakewordManager
+			from core.webui.WebUIManager import WebUIManager
+			from core.base.StateManager import StateManager
+			from core.util.SubprocessManager import SubprocessManager
+			from core.webui.WebUINotificationManager import WebUINotificationManager
+			from core.util.BugReportManager import BugReportManager
+			from core.llm.LlmManager import LlmManager
+			from core.voice.WakewordRecorder import WakewordRecorderState
+			from core.base.model.LazyManager import LazyManager
+
+		self.BugReportManager = self._newManager(BugReportManager)
+		self.CommonsManager = self._newManager(CommonsManager)
 		self.Commons = self.CommonsManager
-		self.StateManager = StateManager()
-		self.SubprocessManager = SubprocessManager()
-		self.ConfigManager = ConfigManager()
-		self.DatabaseManager = DatabaseManager()
-		self.SkillManager = SkillManager()
-		self.WidgetManager = WidgetManager()
-		self.DeviceManager = DeviceManager()
-		self.AudioManager = AudioManager()
-		self.LanguageManager = LanguageManager()
-		self.ASRManager = ASRManager()
-		self.TTSManager = TTSManager()
-		self.ThreadManager = ThreadManager()
-		self.MqttManager = MqttManager()
-		self.TimeManager = TimeManager()
-		self.UserManager = UserManager()
-		self.MultiIntentManager = MultiIntentManager()
-		self.TelemetryManager = TelemetryManager()
-		self.LocationManager = LocationManager()
-		self.InternetManager = InternetManager()
-		self.LlmManager = LlmManager()
-		self.WakewordRecorder = WakewordRecorder()
-		self.TalkManager = TalkManager()
-		self.WebUiManager = WebUIManager()
-		self.ApiManager = ApiManager()
-		self.NodeRedManager = NodeRedManager()
-		self.SkillStoreManager = SkillStoreManager()
-		self.DialogTemplateManager = DialogTemplateManager()
-		self.AssistantManager = AssistantManager()
-		self.NluManager = NluManager()
-		self.AliceWatchManager = AliceWatchManager()
-		self.DialogManager = DialogManager()
-		self.WakewordManager = WakewordManager()
-		self.WebUINotificationManager = WebUINotificationManager()
+		self.StateManager = self._newManager(StateManager)
+		self.SubprocessManager = self._newManager(SubprocessManager)
+		self.ConfigManager = self._newManager(ConfigManager)
+		self.DatabaseManager = self._newManager(DatabaseManager)
+		self.SkillManager = self._newManager(SkillManager)
+		self.WidgetManager = self._newManager(WidgetManager)
+		self.DeviceManager = self._newManager(DeviceManager)
+		self.AudioManager = self._newManager(AudioManager)
+		self.LanguageManager = self._newManager(LanguageManager)
+		self.ASRManager = self._newManager(ASRManager)
+		self.TTSManager = self._newManager(TTSManager)
+		self.ThreadManager = self._newManager(ThreadManager)
+		self.MqttManager = self._newManager(MqttManager)
+		self.TimeManager = self._newManager(TimeManager)
+		self.UserManager = self._newManager(UserManager)
+		self.MultiIntentManager = self._newManager(MultiIntentManager)
+		self.TelemetryManager = self._newManager(TelemetryManager)
+		self.LocationManager = self._newManager(LocationManager)
+		self.InternetManager = self._newManager(InternetManager)
+		self.LlmManager = self._newManager(LlmManager)
+		self.TalkManager = self._newManager(TalkManager)
+		self.WebUiManager = self._newManager(WebUIManager)
+		self.DialogTemplateManager = self._newManager(DialogTemplateManager)
+		self.AssistantManager = self._newManager(AssistantManager)
+		self.NluManager = self._newManager(NluManager)
+		self.AliceWatchManager = self._newManager(AliceWatchManager)
+		self.DialogManager = self._newManager(DialogManager)
+		self.WakewordManager = self._newManager(WakewordManager)
+		self.WebUINotificationManager = self._newManager(WebUINotificationManager)
+
+
+		# Rarely used, built and started on first use. Those serving clients outside of Alice are warmed up once booted
+		self.WakewordRecorder = LazyManager(name='WakewordRecorder', module='core.voice.WakewordRecorder', idle={'state': WakewordRecorderState.IDLE})
+		self.ApiManager = LazyManager(name='ApiManager', module='core.webApi.ApiManager', warmUp=True)
+		self.NodeRedManager = LazyManager(name='NodeRedManager', module='core.webui.NodeRedManager', events=['onSkillDeleted'], warmUp=True)
+		self.SkillStoreManager = LazyManager(name='SkillStoreManager', module='core.base.SkillStoreManager', events=['onQuarterHour'])
 
 		self._managers = {name: manager for name, manager in self.__dict__.items() if name.endswith('Manager')}
+		self._eventHandlers = None
+
+
+	def _newManager(self, klass: type):
+		with self.bootProfiler.measure(name=f'{klass.__name__}.__init__', category='manager'):
+			return klass()
+
+
+	def _startManager(self, manager):
+		with self.bootProfiler.measure(name=f'{manager.name}.onStart', category='manager'):
+			manager.onStart()
 
 
 	def onStop(self):
+		# Managers are popped while going down, resolve events against what's left from now on
+		self._eventHandlers = None
+
 		mqttManager = self._managers.pop('MqttManager', None) # Mqtt goes down last with bug reporter
 		bugReportManager = self._managers.pop('BugReportManager', None) # bug reporter goes down as last
 
@@ -296,6 +329,64 @@ class SuperManager(object):
 				Logger().logError(f'Error stopping BugReportManager: {e}')
 
 
+	def _sortedManagers(self) -> list:
+		"""
+		Returns the alive managers, DialogManager first as it has priority on every event
+		:return:
+		"""
+		return sorted((manager for manager in self._managers.values() if manager), key=lambda manager: manager.name != 'DialogManager')
+
+
+	def buildEventRegistry(self):
+		"""
+		Maps every event name to the handlers of the managers implementing it, so that a broadcast
+		only calls what exists. Built once all managers are started
+		:return:
+		"""
+		for name in [name for name, manager in self._managers.items() if not manager]:
+			del self._managers[name]
+
+		registry = dict()
+		for manager in self._sortedManagers():
+			for method in manager.eventHandlerNames():
+				registry.setdefault(method, list()).append((manager.name, getattr(manager, method)))
+
+		self._eventHandlers = registry
+
+
+	def getEventHandlers(self, method: str) -> List[Tuple[str, Callable]]:
+		"""
+		Returns the (manager name, bound handler) pairs for the given event
+		:param method: The full event method name, such as onAudioFrame
+		:return:
+		"""
+		if self._eventHandlers is not None:
+			return self._eventHandlers.get(method, list())
+
+		# Booting or shutting down, managers are moving around, resolve against their current state
+		return [(manager.name, getattr(manager, method)) for manager in self._sortedManagers() if method in manager.eventHandlerNames()]
+
+
+	def replaceManager(self, name: str, manager):
+		"""
+		Swaps a manager for another instance, used by lazy managers once loaded
+		:param name: The manager name
+		:param manager: The new instance
+		:return:
+		"""
+		setattr(self, name, manager)
+		if name in self._managers:
+			self._managers[name] = manager
+
+		if self._eventHandlers is not None:
+			self.buildEventRegistry()
+
+
+	@property
+	def isBooted(self) -> bool:
+		return self._booted
+
+
 	def getManager(self, managerName: str):
 		return self._managers.get(managerName, None)
 
@@ -544,6 +544,19 @@ class AliceSkill(ProjectAliceObject):
 		if not intent:
 			return False
 
+		return self.dispatchIntent(session=session, intent=intent)
+
+
+	def dispatchIntent(self, session: DialogSession, intent: Intent) -> bool:
+		"""
+		Runs the handler of an intent already matched against the session topic
+		:param session:
+		:param intent:
+		:return: True if the intent was consumed
+		"""
+		if not self.active:
+			return False
+
 		if intent.authLevel != AccessLevel.ZERO:
 			try:
 				self.authenticateIntent(session)
@@ -591,7 +604,7 @@ class AliceSkill(ProjectAliceObject):
 	def onBooted(self) -> bool:
 		if self.delayed:
 			self.logInfo('Delayed start')
-			self.ThreadManager.doLater(interval=5, func=self.onStart)
+			self.ThreadManager.doLater(interval=5, func=self.onStart, pool='io')
 
 		return True
 
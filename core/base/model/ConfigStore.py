@@ -0,0 +1,158 @@
+#  Copyright (c) 2021
+#
+#  This file, ConfigStore.py, is part of Project Alice.
+#
+#  Project Alice is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>
+#
+#  Last modified: 2026.10.18 at 20:41:55 CEST
+
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Optional
+
+from core.ProjectAliceExceptions import ConfigurationUpdateFailed
+from core.base.model.ProjectAliceObject import ProjectAliceObject
+
+
+class ConfigStore(ProjectAliceObject):
+	"""
+	Persists a configuration dict to its json file. Saves are delayed and merged, so that a burst of updates
+	ends in a single write, and files are replaced atomically so that a crash never leaves a half written config
+	"""
+
+	FLUSH_DELAY = 2.0
+
+
+	def __init__(self, path: Path, flushDelay: float = FLUSH_DELAY, ensureAscii: bool = True):
+		super().__init__()
+		self._path = path
+		self._flushDelay = flushDelay
+		self._ensureAscii = ensureAscii
+		self._lock = threading.RLock()
+		self._pending: Optional[dict] = None
+		self._timer: Optional[threading.Timer] = None
+		self._saves = 0
+		self._writes = 0
+
+
+	@property
+	def path(self) -> Path:
+		return self._path
+
+
+	@property
+	def pending(self) -> bool:
+		return self._pending is not None
+
+
+	@property
+	def stats(self) -> dict:
+		return {
+			'saves' : self._saves,
+			'writes': self._writes
+		}
+
+
+	def save(self, data: dict):
+		"""
+		Schedules the data to be written, replacing whatever was waiting to be
+		:param data:
+		:return:
+		"""
+		with self._lock:
+			self._pending = dict(data)
+			self._saves += 1
+			if self._timer:
+				return
+
+			# Not a ThreadManager timer, configs are saved before it exists. Not a daemon either, so pending saves make it to disk on exit
+			self._timer = threading.Timer(self._flushDelay, self._flushFromTimer)
+			self._timer.name = f'configStore_{self._path.name}'
+			self._timer.start()
+
+
+	def flush(self):
+		"""
+		Writes the pending data now, if any
+		:return:
+		"""
+		with self._lock:
+			if self._timer:
+				self._timer.cancel()
+				self._timer = None
+
+			if self._pending is not None:
+				self.write(self._pending)
+
+
+	def discard(self):
+		"""
+		Drops the pending data without writing it, for a file that is going away
+		:return:
+		"""
+		with self._lock:
+			if self._timer:
+				self._timer.cancel()
+				self._timer = None
+			self._pending = None
+
+
+	def write(self, data: dict):
+		"""
+		Writes the data now, dropping any pending save
+		:param data:
+		:return:
+		"""
+		with self._lock:
+			self._pending = None
+			try:
+				self.atomicWrite(self._path, json.dumps(data, indent='\t', ensure_ascii=self._ensureAscii, sort_keys=True))
+				self._writes += 1
+			except Exception as e:
+				self.logError(f'Failed writing **{self._path}**: {e}')
+				raise ConfigurationUpdateFailed()
+
+
+	def _flushFromTimer(self):
+		with self._lock:
+			self._timer = None
+
+		try:
+			self.flush()
+		except ConfigurationUpdateFailed:
+			pass  # Already logged
+
+
+	@staticmethod
+	def atomicWrite(path: Path, text: str):
+		"""
+		Writes to a temporary file next to the target, syncs it to disk and renames it over the target
+		:param path:
+		:param text:
+		:return:
+		"""
+		fd, tmp = tempfile.mkstemp(prefix=f'.{path.name}.', suffix='.tmp', dir=str(path.parent))
+		try:
+			os.chmod(tmp, path.stat().st_mode & 0o777 if path.exists() else 0o644)
+			with os.fdopen(fd, 'w', encoding='utf-8') as f:
+				f.write(text)
+				f.flush()
+				os.fsync(f.fileno())
+			os.replace(tmp, path)
+		except:
+			Path(tmp).unlink(missing_ok=True)
+			raise
@@ -0,0 +1,91 @@
+#  Copyright (c) 2021
+#
+#  This file, IntentRouter.py, is part of Project Alice.
+#
+#  Project Alice is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>
+#
+#  Last modified: 2026.10.18 at 20:55:25 CEST
+
+
+from paho.mqtt import client as MQTTClient
+from typing import Dict, List, Optional, Tuple
+
+from core.base.model.AliceSkill import AliceSkill
+from core.base.model.Intent import Intent
+
+
+class IntentRouter(object):
+	"""
+	Maps intent topics to the skills supporting them, in skill order, so that dispatching an intent doesn't
+	match the topic against every intent of every skill. Wildcard subscriptions are few and matched on dispatch,
+	skills overriding their own filtering or dispatching are always offered the message
+	"""
+
+
+	def __init__(self, skills: Dict[str, AliceSkill]):
+		# Entries are (skill index, intent index in the skill, skill name, intent name, intent)
+		self._exact: Dict[str, List[tuple]] = dict()
+		self._wildcards: List[tuple] = list()
+		self._custom: List[tuple] = list()
+
+		for skillIndex, (skillName, skill) in enumerate(skills.items()):
+			klass = type(skill)
+			if klass.onMessageDispatch is not AliceSkill.onMessageDispatch or klass.filterIntent is not AliceSkill.filterIntent:
+				self._custom.append((skillIndex, 0, skillName, None, None))
+				continue
+
+			for intentIndex, (intentName, intent) in enumerate(skill.supportedIntents.items()):
+				entry = (skillIndex, intentIndex, skillName, intentName, intent)
+				if '+' in intentName or '#' in intentName:
+					self._wildcards.append(entry)
+				else:
+					self._exact.setdefault(intentName, list()).append(entry)
+
+
+	@property
+	def stats(self) -> dict:
+		return {
+			'topics'   : len(self._exact),
+			'wildcards': len(self._wildcards),
+			'custom'   : len(self._custom)
+		}
+
+
+	def route(self, topic: str) -> List[Tuple[str, Optional[Intent]]]:
+		"""
+		Returns the skills to offer the message to, in skill order, with the intent each of them would pick
+		:param topic: The intent topic
+		:return: List of (skill name, intent). The intent is None for skills doing their own filtering
+		"""
+		entries = self._exact.get(topic, list())
+
+		if self._wildcards:
+			matching = [entry for entry in self._wildcards if MQTTClient.topic_matches_sub(entry[3], topic)]
+			if matching:
+				entries = sorted(entries + matching, key=lambda item: item[:2])
+
+		if self._custom:
+			entries = sorted(entries + self._custom, key=lambda item: item[:2])
+
+		# Several intents of a skill can match, keep the one AliceSkill.filterIntent would pick
+		routes = list()
+		for skillIndex, _, skillName, intentName, intent in entries:
+			if routes and routes[-1][0] == skillIndex:
+				if AliceSkill.intentNameMoreSpecific(intentName, routes[-1][2]):
+					routes[-1] = (skillIndex, skillName, intentName, intent)
+				continue
+
+			routes.append((skillIndex, skillName, intentName, intent))
+
+		return [(skillName, intent) for _, skillName, _, intent in routes]
@@ -0,0 +1,147 @@
+#  Copyright (c) 2021
+#
+#  This file, LazyManager.py, is part of Project Alice.
+#
+#  Project Alice is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>
+#
+#  Last modified: 2026.10.18 at 20:53:48 CEST
+
+
+import importlib
+import threading
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Optional
+
+import core.base.SuperManager as SM
+from core.ProjectAliceExceptions import WorkerPoolFull
+from core.util.model.Logger import Logger
+
+
+class LazyManager(object):
+	"""
+	Stands in for a rarely used manager. The manager is imported, built and started the first time
+	one of its attributes is accessed or one of the given events is broadcast, the proxy then swaps
+	itself for it in the SuperManager. Idle values are served without loading the manager. Loads
+	triggered by an event happen on the io pool, the event being delivered once the manager started
+	"""
+
+
+	def __init__(self, name: str, module: str, events: Iterable[str] = None, idle: Dict[str, Any] = None, warmUp: bool = False):
+		"""
+		:param name: Manager and class name
+		:param module: Module holding the manager class
+		:param events: Names of the event handlers that should load the manager
+		:param idle: Attribute values to serve as long as the manager is not loaded
+		:param warmUp: Whether to load the manager in the background once Alice booted
+		"""
+		self._name = name
+		self._module = module
+		self._events = frozenset(events or list())
+		self._idle = idle or dict()
+		self._warmUp = warmUp
+		self._lock = threading.RLock()
+		self._instance = None
+		self._logger = Logger(prepend='[LazyManager]')
+
+
+	@property
+	def name(self) -> str:
+		return self._name
+
+
+	@property
+	def loaded(self) -> bool:
+		return self._instance is not None
+
+
+	@property
+	def warmUp(self) -> bool:
+		return self._warmUp
+
+
+	@property
+	def isActive(self) -> bool:
+		return self._instance.isActive if self._instance else False
+
+
+	def eventHandlerNames(self) -> FrozenSet[str]:
+		return self._instance.eventHandlerNames() if self._instance else self._events
+
+
+	def onStart(self):
+		# Started on first use
+		pass
+
+
+	def onBooted(self):
+		# Booted on first use
+		pass
+
+
+	def onStop(self):
+		if self._instance:
+			self._instance.onStop()
+
+
+	def load(self):
+		"""
+		Imports, builds and starts the manager, once. Concurrent callers wait for it to be started
+		:return: The manager instance
+		"""
+		with self._lock:
+			if self._instance:
+				return self._instance
+
+			superManager = SM.SuperManager.getInstance()
+			with superManager.bootProfiler.measure(name=f'{self._name} (lazy)', category='manager'):
+				self._logger.logInfo(f'Loading **{self._name}** on first use')
+				klass = getattr(importlib.import_module(self._module), self._name)
+
+				# Set before starting, so that the manager reaching itself through the proxy doesn't load twice
+				self._instance = klass()
+				self._instance.onStart()
+				if superManager.isBooted:
+					self._instance.onBooted()
+
+			superManager.replaceManager(name=self._name, manager=self._instance)
+			return self._instance
+
+
+	def __getattr__(self, item: str) -> Any:
+		if item.startswith('_'):
+			raise AttributeError(item)
+
+		if not self._instance:
+			if item in self._idle:
+				return self._idle[item]
+
+			if item in self._events:
+				return self._eventHandler(item)
+
+		return getattr(self.load(), item)
+
+
+	def _eventHandler(self, method: str) -> Callable:
+		def handler(*args, **kwargs) -> Optional[Any]:
+			# Events are sent from timer and mqtt threads, which must not wait for the manager to start
+			try:
+				SM.SuperManager.getInstance().ThreadManager.submit(func=self._deliver, args=[method, args, kwargs])
+			except (WorkerPoolFull, RuntimeError) as e:
+				self._logger.logWarning(f'Cannot load **{self._name}**, dropped event {method}: {e}')
+			return None
+
+		return handler
+
+
+	def _deliver(self, method: str, args: tuple, kwargs: dict):
+		getattr(self.load(), method)(*args, **kwargs)
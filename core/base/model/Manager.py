@@ -110,5 +110,13 @@ class Manager(ProjectAliceObject):
 		return self.DatabaseManager.insert(tableName=tableName, query=query, values=values, callerName=self.name)
 
 
+	def databaseInsertMany(self, tableName: str, query: str, values: List[dict]) -> int:
+		return self.DatabaseManager.insertMany(tableName=tableName, query=query, values=values, callerName=self.name)
+
+
+	def databaseCreateIndex(self, tableName: str, indexName: str, columns: List[str]) -> bool:
+		return self.DatabaseManager.createIndex(tableName=tableName, indexName=indexName, columns=columns, callerName=self.name)
+
+
 	def pruneTable(self, tableName: str):
 		return self.DatabaseManager.prune(tableName=tableName, callerName=self.name)
@@ -24,7 +24,7 @@ import re
 from copy import copy
 from importlib_metadata import PackageNotFoundError, version as packageVersion
 from pathlib import Path
-from typing import TYPE_CHECKING, Union
+from typing import Any, Callable, Dict, FrozenSet, TYPE_CHECKING, Union
 
 import core.base.SuperManager as SM
 from core.base.model.Version import Version
@@ -76,6 +76,8 @@ class ProjectAliceObject(object):
 		'pip'     : []
 	}
 
+	_EVENT_HANDLER_NAMES: Dict[type, FrozenSet[str]] = dict()
+
 
 	def __init__(self, *args, **kwargs):
 		self._logger = Logger(*args, **kwargs)
@@ -106,44 +108,22 @@ class ProjectAliceObject(object):
 		if 'ProjectAlice' not in exceptions:
 			exceptions.append('ProjectAlice')
 
-		if 'DialogManager' not in exceptions:
-			exceptions.append('DialogManager')
-
 		if not method.startswith('on'):
 			method = f'on{method[0].capitalize() + method[1:]}'
 
-		# Give absolute priority to DialogManager
-		try:
-			func = getattr(SM.SuperManager.getInstance().getManager('DialogManager'), method, None)
-			if func:
-				func(**kwargs)
-
-		except TypeError as e:
-			self.logWarning(f'Failed to broadcast event **{method}** to **DialogManager**: {e}')
-
-		deadManagers = list()
-		for name, man in SM.SuperManager.getInstance().managers.copy().items():
-			if not man:
-				deadManagers.append(name)
-				continue
-
-			if (manager and man.name != manager.name) or man.name in exceptions:
+		# The registry only holds managers implementing the event. DialogManager always comes first and is never filtered out, it has absolute priority
+		for name, func in SM.SuperManager.getInstance().getEventHandlers(method):
+			if name != 'DialogManager' and ((manager and name != manager.name) or name in exceptions):
 				continue
 
 			try:
-				func = getattr(man, method, None)
-				if func:
-					func(**kwargs)
-
+				func(**kwargs)
 			except TypeError as e:
-				self.logWarning(f'Failed to broadcast event **{method}** to **{man.name}**: {e}')
+				self.logWarning(f'Failed to broadcast event **{method}** to **{name}**: {e}')
 
 		if propagateToSkills:
 			self.SkillManager.skillBroadcast(method=method, **kwargs)
 
-		for name in deadManagers:
-			del SM.SuperManager.getInstance().managers[name]
-
 		if method == 'onAudioFrame':
 			return
 
@@ -162,6 +142,24 @@ class ProjectAliceObject(object):
 		)
 
 
+	@classmethod
+	def eventHandlerNames(cls) -> FrozenSet[str]:
+		"""
+		Returns the names of the event handlers this class really implements, leaving out
+		the empty defaults declared here. The result is cached per class
+		:return:
+		"""
+		names = ProjectAliceObject._EVENT_HANDLER_NAMES.get(cls, None)
+		if names is None:
+			names = frozenset(
+				name for name in dir(cls)
+				if name.startswith('on') and name[2:3].isupper() and callable(getattr(cls, name, None)) and getattr(cls, name) is not getattr(ProjectAliceObject, name, None)
+			)
+			ProjectAliceObject._EVENT_HANDLER_NAMES[cls] = names
+
+		return names
+
+
 	def checkDependencies(self) -> bool:
 		self.logInfo('Checking dependencies')
 
@@ -260,32 +258,44 @@ class ProjectAliceObject(object):
 			return False
 
 
-	def logInfo(self, msg: str, plural: Union[list, str] = None):
-		self._logger.doLog(function='info', msg=self.decorateLogs(msg), printStack=False, plural=plural)
+	def isLogEnabledFor(self, function: str) -> bool:
+		return self._logger.isEnabledFor(function)
+
+
+	def logInfo(self, msg: Union[str, Callable[[], str]], *args: Any, plural: Union[list, str] = None):
+		"""
+		Logs at info level. Messages are only built if the level is enabled: pass a str.format string with its arguments or a callable returning the message
+		"""
+		if self._logger.isEnabledFor('info'):
+			self._logger.doLog(function='info', msg=self.decorateLogs(Logger.formatMessage(msg, args)), printStack=False, plural=plural)
 
 
-	def logError(self, msg: str, plural: Union[list, str] = None, printStack: bool = True):
-		self._logger.doLog(function='error', msg=self.decorateLogs(msg), plural=plural, printStack=printStack)
+	def logError(self, msg: Union[str, Callable[[], str]], *args: Any, plural: Union[list, str] = None, printStack: bool = True):
+		if self._logger.isEnabledFor('error'):
+			self._logger.doLog(function='error', msg=self.decorateLogs(Logger.formatMessage(msg, args)), plural=plural, printStack=printStack)
 
 
-	def logDebug(self, msg: str, plural: Union[list, str] = None):
-		self._logger.doLog(function='debug', msg=self.decorateLogs(msg), printStack=False, plural=plural)
+	def logDebug(self, msg: Union[str, Callable[[], str]], *args: Any, plural: Union[list, str] = None):
+		if self._logger.isEnabledFor('debug'):
+			self._logger.doLog(function='debug', msg=self.decorateLogs(Logger.formatMessage(msg, args)), printStack=False, plural=plural)
 
 
-	def logFatal(self, msg: str, plural: Union[list, str] = None):
-		self._logger.doLog(function='fatal', msg=self.decorateLogs(msg), plural=plural)
+	def logFatal(self, msg: Union[str, Callable[[], str]], *args: Any, plural: Union[list, str] = None):
+		self._logger.doLog(function='fatal', msg=self.decorateLogs(Logger.formatMessage(msg, args)), plural=plural)
 		try:
 			self.ProjectAlice.onStop()
 		except:
 			exit()
 
 
-	def logWarning(self, msg: str, printStack: bool = False, plural: Union[list, str] = None):
-		self._logger.doLog(function='warning', msg=self.decorateLogs(msg), printStack=printStack, plural=plural)
+	def logWarning(self, msg: Union[str, Callable[[], str]], *args: Any, printStack: bool = False, plural: Union[list, str] = None):
+		if self._logger.isEnabledFor('warning'):
+			self._logger.doLog(function='warning', msg=self.decorateLogs(Logger.formatMessage(msg, args)), printStack=printStack, plural=plural)
 
 
-	def logCritical(self, msg: str, plural: Union[list, str] = None):
-		self._logger.doLog(function='critical', msg=self.decorateLogs(msg), plural=plural)
+	def logCritical(self, msg: Union[str, Callable[[], str]], *args: Any, plural: Union[list, str] = None):
+		if self._logger.isEnabledFor('critical'):
+			self._logger.doLog(function='critical', msg=self.decorateLogs(Logger.formatMessage(msg, args)), plural=plural)
 
 
 	def decorateLogs(self, text: str) -> str:
@@ -30,6 +30,7 @@ import socket
 import sqlite3
 import string
 import subprocess
+import sys
 import tempfile
 import time
 import uuid
@@ -38,7 +39,7 @@ from datetime import datetime
 from googletrans import Translator
 from paho.mqtt.client import MQTTMessage
 from pathlib import Path
-from typing import Any, Optional, Union
+from typing import Any, Dict, List, Optional, Union
 from uuid import UUID
 
 import core.base.SuperManager as SuperManager
@@ -53,6 +54,9 @@ from core.webui.model.UINotificationType import UINotificationType
 class CommonsManager(Manager):
 	ERROR_HANDLER_FUNC = CFUNCTYPE(None, c_char_p, c_int, c_char_p, c_int, c_char_p)
 
+	# Module names of the source files seen in caller lookups
+	_moduleNames: Dict[str, Optional[str]] = dict()
+
 
 	def __init__(self):
 		super().__init__(name='Commons')
@@ -68,8 +72,49 @@ class CommonsManager(Manager):
 
 
 	@staticmethod
-	def getFunctionCaller(depth: int = 3) -> str:
-		return inspect.getmodulename(inspect.stack()[depth][1])
+	def _moduleName(filename: str) -> Optional[str]:
+		try:
+			return CommonsManager._moduleNames[filename]
+		except KeyError:
+			name = inspect.getmodulename(filename)
+			CommonsManager._moduleNames[filename] = name
+			return name
+
+
+	@staticmethod
+	def getFunctionCaller(depth: int = 3) -> Optional[str]:
+		"""
+		Returns the module name of the function found at the given depth of the call stack, 0 being this very function
+		:param depth:
+		:return:
+		"""
+		try:
+			frame = sys._getframe(depth)  # NOSONAR
+		except ValueError:
+			raise IndexError(f'Call stack is not {depth} frames deep')
+
+		return CommonsManager._moduleName(frame.f_code.co_filename)
+
+
+	@staticmethod
+	def getFunctionCallers(depth: int = 3, count: int = 0) -> List[Optional[str]]:
+		"""
+		Returns the module names of the callers, starting at the given depth and walking up the call stack
+		:param depth: Depth of the first caller, 0 being this very function
+		:param count: How many callers to return, 0 for the whole stack
+		:return:
+		"""
+		try:
+			frame = sys._getframe(depth)  # NOSONAR
+		except ValueError:
+			return list()
+
+		callers = list()
+		while frame and (not count or len(callers) < count):
+			callers.append(CommonsManager._moduleName(frame.f_code.co_filename))
+			frame = frame.f_back
+
+		return callers
 
 
 	def getMethodCaller(self, **methodParam):
@@ -81,6 +81,7 @@ TOPIC_VAD_UP                           = 'hermes/voiceActivity/{}/vadUp'
 TOPIC_WAKEWORD_DETECTED                = 'hermes/hotword/{}/detected'
 
 # Alice
+TOPIC_AUDIO_FRAME_FORMAT               = 'projectalice/audioServer/{}/audioFrameFormat'
 TOPIC_CORE_DISCONNECTION               = 'projectalice/devices/coreDisconnection'
 TOPIC_CORE_HEARTBEAT                   = 'projectalice/devices/coreHeartbeat'
 TOPIC_CORE_RECONNECTION                = 'projectalice/devices/coreReconnection'
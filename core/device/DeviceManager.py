@@ -31,13 +31,18 @@ from core.commons import constants
 from core.device.model.Device import Device
 from core.device.model.DeviceAbility import DeviceAbility
 from core.device.model.DeviceException import DeviceTypeUndefined, MaxDeviceOfTypeReached, MaxDevicePerLocationReached
+from core.device.model.DeviceIndex import DeviceIndex
 from core.device.model.DeviceLink import DeviceLink
 from core.device.model.DeviceType import DeviceType
 from core.device.model.Heartbeat import Heartbeat
+from core.device.model.HeartbeatTracker import HeartbeatTracker
 from core.dialog.model.DialogSession import DialogSession
 
 
 class DeviceManager(Manager):
+	# Seconds during which device changes are gathered before being saved and published at once
+	SAVE_DELAY = 1
+
 	DB_DEVICE = 'myDevices'
 	DB_LINKS = 'deviceLinks'
 	DATABASE = {
@@ -67,11 +72,15 @@ class DeviceManager(Manager):
 		self._loopCounter = 0
 
 		self._devices: Dict[int, Device] = dict()
+		self._deviceIndex = DeviceIndex()
+
+		self._dirtyDevices: Dict[int, Device] = dict()
+		self._dirtyDevicesLock = threading.Lock()
+		self._saveTimer: Optional[threading.Timer] = None
 		self._deviceLinks: Dict[int, DeviceLink] = dict()
 		self._deviceTypes: Dict[str, Dict[str, DeviceType]] = dict()
 
-		self._heartbeats = dict()
-		self._heartbeatsCheckTimer = None
+		self._heartbeats = HeartbeatTracker(onTimeout=self.onHeartbeatTimeout)
 		self._heartbeat: Optional[Heartbeat] = None
 
 		self._broadcastFlag = threading.Event()
@@ -124,8 +133,8 @@ class DeviceManager(Manager):
 		self.MqttManager.publish(topic=constants.TOPIC_CORE_RECONNECTION)
 		self.getMainDevice().connected = True
 
-		if self._devices:
-			self.ThreadManager.newThread(name='checkHeartbeats', target=self.checkHeartbeats)
+		self._heartbeats.start()
+		self.ThreadManager.newThread(name='checkHeartbeats', target=self._heartbeats.run)
 
 		for device in self._devices.values():
 			device.onBooted()
@@ -139,6 +148,9 @@ class DeviceManager(Manager):
 		self._stopBroadcasting()
 		self._broadcastSocket.close()
 
+		self._heartbeats.stop()
+		self.flushDevices()
+
 		for device in self._devices.values():
 			device.onStop()
 
@@ -160,10 +172,9 @@ class DeviceManager(Manager):
 
 	def onSkillDeactivated(self, skill: str):
 		self.removeDeviceTypesForSkill(skillName=skill)
-		tmp = self._devices.copy()
-		for deviceUid, device in tmp.items():
-			if device.skillName == skill:
-				self._devices.pop(deviceUid, None)
+		for device in self._deviceIndex.bySkill(skill):
+			self._devices.pop(device.id, None)
+			self._deviceIndex.remove(device)
 
 
 	def loadDevices(self):
@@ -181,6 +192,7 @@ class DeviceManager(Manager):
 				klass = getattr(skillImport, data.get('typeName'))
 				device = klass(data)
 				self._devices[device.id] = device
+				self._deviceIndex.add(device)
 			except Exception:
 				self.logError("Couldn't create device instance")
 
@@ -200,22 +212,18 @@ class DeviceManager(Manager):
 				self._deviceLinks[row['id']] = link
 
 
-	def checkHeartbeats(self):
+	def onHeartbeatTimeout(self, uid: str):
 		"""
-		Routine that checks all heartbeats and disconnects devices that haven't signaled their presence for hearbeatRate time
+		Called by the heartbeat tracker when a device hasn't signaled its presence for twice its heartbeat rate
+		:param uid:
 		:return: None
 		"""
-		now = round(time.time())
-		for uid, lastTime in self._heartbeats.copy().items():
-			device = self.getDevice(uid=uid)
-			if not device:
-				self._heartbeats.pop(uid, None)
-			else:
-				if lastTime < now - (device.heartbeatRate * 2):
-					self.logWarning(f'Device **{device.displayName}** has not given a signal since {device.deviceType.heartbeatRate} seconds or more')
-					self.deviceDisconnecting(device.uid)
+		device = self.getDevice(uid=uid)
+		if not device:
+			return
 
-		self._heartbeatsCheckTimer = self.ThreadManager.newTimer(interval=2, func=self.checkHeartbeats)
+		self.logWarning(f'Device **{device.displayName}** has not given a signal since {device.heartbeatRate * 2} seconds or more')
+		self.deviceDisconnecting(device.uid)
 
 
 	def getDevice(self, deviceId: int = None, uid: [str, uuid.UUID] = None) -> Optional[Device]:
@@ -225,15 +233,12 @@ class DeviceManager(Manager):
 		:param uid: The device uid
 		:return: Device instance if any or None
 		"""
-		ret = None
 		if deviceId:
 			ret = self._devices.get(deviceId, None)
 		elif uid:
 			if not isinstance(uid, str):
 				uid = str(uid)
-			for device in self._devices.values():
-				if device.uid == uid:
-					ret = device
+			ret = self._deviceIndex.getByUid(uid)
 		else:
 			raise Exception('Cannot get a device without id or uid')
 
@@ -289,15 +294,7 @@ class DeviceManager(Manager):
 		:param connectedOnly: Whether to return non-connected devices
 		:return: A list of Device instances
 		"""
-		ret = list()
-		for device in self._devices.values():
-			if connectedOnly and not device.connected:
-				continue
-
-			if device.hasAbilities(abilities):
-				ret.append(device)
-
-		return ret
+		return [device for device in self._deviceIndex.withAbilities(abilities) if not connectedOnly or device.connected]
 
 
 	def getDevicesByType(self, deviceType: DeviceType, connectedOnly: bool = True) -> List[Device]:
@@ -308,15 +305,7 @@ class DeviceManager(Manager):
 		:return: list of Device instances
 		"""
 
-		ret = list()
-		for device in self._devices.values():
-			if connectedOnly and not device.connected:
-				continue
-
-			if device.deviceType == deviceType:
-				ret.append(device)
-
-		return ret
+		return [device for device in self._deviceIndex.bySkill(deviceType.skillName) if device.deviceType == deviceType and (not connectedOnly or device.connected)]
 
 
 	def getDevicesByLocation(self, locationId: int, deviceType: DeviceType = None, abilities: List[DeviceAbility] = None, connectedOnly: bool = True) -> List[Device]:
@@ -354,8 +343,17 @@ class DeviceManager(Manager):
 		:return: list of Device instances
 		"""
 
+		if locationId:
+			devices = self._deviceIndex.byLocation(locationId)
+		elif skillName:
+			devices = self._deviceIndex.bySkill(skillName)
+		elif abilities:
+			devices = self._deviceIndex.withAbilities(abilities)
+		else:
+			devices = list(self._devices.values())
+
 		ret = list()
-		for device in self._devices.values():
+		for device in devices:
 			if (locationId and device.parentLocation != locationId) \
 					or (skillName and device.skillName != skillName) \
 					or (deviceType and device.deviceType != deviceType) \
@@ -383,11 +381,7 @@ class DeviceManager(Manager):
 		Returns the main device, the only one having the IS_CORE ability
 		:return: Device instance
 		"""
-		try:
-			devices = self.getDevicesWithAbilities(abilities=[DeviceAbility.IS_CORE], connectedOnly=False)
-			return devices[0]
-		except:
-			return None
+		return self._deviceIndex.mainDevice
 
 
 	def addNewDeviceFromWebUI(self, data: Dict) -> Optional[Device]:
@@ -457,6 +451,7 @@ class DeviceManager(Manager):
 		klass = getattr(skillImport, deviceType)
 		device = klass(data)
 		self._devices[device.id] = device
+		self._deviceIndex.add(device)
 
 		if device.deviceType.allowLocationLinks:
 			self.addDeviceLink(targetLocation=locationId, deviceId=device.id)
@@ -470,6 +465,61 @@ class DeviceManager(Manager):
 		return self._devices
 
 
+	def scheduleDeviceSave(self, device: Device):
+		"""
+		Queues a changed device for the next batched save
+		:param device:
+		:return:
+		"""
+		with self._dirtyDevicesLock:
+			self._dirtyDevices[device.id] = device
+			if not self._saveTimer:
+				self._saveTimer = self.ThreadManager.newTimer(interval=self.SAVE_DELAY, func=self.flushDevices)
+
+
+	# noinspection SqlResolve
+	def flushDevices(self):
+		"""
+		Saves every changed device in one transaction and publishes each of them once
+		:return:
+		"""
+		with self._dirtyDevicesLock:
+			devices = [device for device in self._dirtyDevices.values() if device.dirty]
+			self._dirtyDevices = dict()
+			if self._saveTimer:
+				self._saveTimer.cancel()
+				self._saveTimer = None
+
+		if not devices:
+			return
+
+		# Cleared before writing so that changes made during the write get saved by the next flush
+		for device in devices:
+			device.dirty = False
+
+		try:
+			self.databaseInsertMany(tableName=self.DB_DEVICE, query=Device.REPLACE_QUERY, values=[device.toDBValues() for device in devices])
+		except Exception as e:
+			self.logError(f'Failed saving {len(devices)} devices, retrying later: {e}')
+			for device in devices:
+				if device.id in self._devices:
+					device.dirty = True
+					self.scheduleDeviceSave(device)
+			return
+
+		for device in devices:
+			device.publishDevice()
+
+
+	def reindexDevice(self, device: Device):
+		"""
+		Refreshes the lookup tables after a device changed its uid, abilities or location
+		:param device:
+		:return:
+		"""
+		self._deviceIndex.update(device)
+
+
 	def updateDeviceSettings(self, deviceId: int, data: dict) -> Optional[Device]:
 		"""
 		Updates the UI part of a device
@@ -545,7 +595,13 @@ class DeviceManager(Manager):
 		else:
 			device.onStop()
 			self.deleteDeviceLinks(deviceId=device.id)
+
+			with self._dirtyDevicesLock:
+				self._dirtyDevices.pop(device.id, None)
+				device.dirty = False
+
 			self._devices.pop(device.id, None)
+			self._deviceIndex.remove(device)
 			self.DatabaseManager.delete(tableName=self.DB_DEVICE, callerName=self.name, values={'id': device.id})
 
 		self.MqttManager.publish(constants.TOPIC_DEVICE_DELETED, payload={'uid': device.uid, 'id': device.id})
@@ -616,11 +672,9 @@ class DeviceManager(Manager):
 			device.connected = True
 			self.broadcast(method=constants.EVENT_DEVICE_CONNECTING, exceptions=[self.name], propagateToSkills=True)
 			self.MqttManager.publish(constants.TOPIC_DEVICE_UPDATED, payload={'device': device.toDict()})
-			self.logInfo(f'Device named **{device.displayName}** ({device.uid}) in {self.LocationManager.getLocation(locId=device.parentLocation).name} connected')
+			self.logInfo(lambda: f'Device named **{device.displayName}** ({device.uid}) in {self.LocationManager.getLocation(locId=device.parentLocation).name} connected')
 
-		self._heartbeats[uid] = round(time.time())
-		if not self._heartbeatsCheckTimer:
-			self._heartbeatsCheckTimer = self.ThreadManager.newTimer(interval=2, func=self.checkHeartbeats)
+		self._heartbeats.beat(uid=uid, timeout=device.heartbeatRate * 2)
 
 		return device
 
@@ -631,7 +685,7 @@ class DeviceManager(Manager):
 		:param uid:
 		:return:
 		"""
-		self._heartbeats.pop(uid, None)
+		self._heartbeats.remove(uid)
 
 		device = self.getDevice(uid=uid)
 
@@ -639,7 +693,7 @@ class DeviceManager(Manager):
 			return
 
 		if device.connected:
-			self.logInfo(f'Device named **{device.displayName}** ({device.uid}) in {self.LocationManager.getLocation(locId=device.parentLocation).name} disconnected')
+			self.logInfo(lambda: f'Device named **{device.displayName}** ({device.uid}) in {self.LocationManager.getLocation(locId=device.parentLocation).name} disconnected')
 			device.connected = False
 			self.broadcast(method=constants.EVENT_DEVICE_DISCONNECTING, exceptions=[self.name], propagateToSkills=True)
 			self.MqttManager.publish(constants.TOPIC_DEVICE_UPDATED, payload={'device': device.toDict()})
@@ -802,7 +856,7 @@ class DeviceManager(Manager):
 				if replyOnDeviceUid:
 					self.MqttManager.say(text=self.TalkManager.randomTalk('newDeviceAdditionSuccess', skill='system'), deviceUid=replyOnDeviceUid)
 
-				self.ThreadManager.doLater(interval=5, func=self.WakewordRecorder.uploadToNewDevice, args=[uid])
+				self.ThreadManager.doLater(interval=5, func=self.WakewordRecorder.uploadToNewDevice, args=[uid], pool='io')
 
 				self._broadcastSocket.sendto(bytes('ok', encoding='utf8'), (deviceIp, self._broadcastPort))
 				self._stopBroadcasting()
@@ -832,7 +886,7 @@ class DeviceManager(Manager):
 			return
 
 		device.connected = True
-		self._heartbeats[uid] = round(time.time())
+		self._heartbeats.beat(uid=uid, timeout=device.heartbeatRate * 2)
 
 
 	def onDeviceStatus(self, session: DialogSession):
@@ -34,6 +34,8 @@ from core.webui.model.OnDeviceClickReaction import OnDeviceClickReaction
 
 
 class Device(ProjectAliceObject):
+	REPLACE_QUERY = 'REPLACE INTO :__table__ (id, uid, parentLocation, typeName, skillName, settings, deviceParams, deviceConfigs) VALUES (:id, :uid, :parentLocation, :typeName, :skillName, :settings, :deviceParams, :deviceConfigs)'
+
 
 	def __init__(self, data: Union[sqlite3.Row, Dict]):
 
@@ -56,6 +58,7 @@ class Device(ProjectAliceObject):
 		self._iconEtag: str = str(uuid.uuid4())
 
 		self._secret = ''  # Used to verify devices reply from UI
+		self._dirty = False  # Changes waiting for the DeviceManager to save them
 
 		if not self._deviceType:
 			self.logError(f'Failed retrieving device type for device {self._typeName}')
@@ -64,7 +67,9 @@ class Device(ProjectAliceObject):
 		if not self._typeName:
 			self._typeName = self._deviceType.deviceTypeName
 
-		self._abilities: int = -1 if not data.get('abilities', None) else self.setAbilities(data['abilities'])
+		self._abilities: int = -1
+		if data.get('abilities', None):
+			self.setAbilities(data['abilities'])
 
 		self._deviceParams: Dict = self.loadJson(data.get('deviceParams'))
 		self._connected: bool = False
@@ -259,6 +264,49 @@ class Device(ProjectAliceObject):
 		for ability in abilities:
 			self._abilities |= ability.value
 
+		self.DeviceManager.reindexDevice(self)
+
+
+	def markDirty(self):
+		"""
+		Flags this device as changed. The DeviceManager saves and publishes it shortly after,
+		once for all the changes made in the meantime. Use saveToDB for an immediate write
+		:return:
+		"""
+		if self._id == -1:
+			self.saveToDB()
+			return
+
+		self._dirty = True
+		self.DeviceManager.scheduleDeviceSave(self)
+
+
+	@property
+	def dirty(self) -> bool:
+		return self._dirty
+
+
+	@dirty.setter
+	def dirty(self, value: bool):
+		self._dirty = value
+
+
+	def toDBValues(self) -> dict:
+		"""
+		Returns the row of this device, as saved by REPLACE_QUERY
+		:return:
+		"""
+		return {
+			'id'            : self._id,
+			'uid'           : self._uid,
+			'parentLocation': self._parentLocation,
+			'typeName'      : self._typeName,
+			'skillName'     : self._skillName,
+			'settings'      : json.dumps(self._settings),
+			'deviceParams'  : json.dumps(self._deviceParams),
+			'deviceConfigs' : json.dumps(self._deviceConfigs)
+		}
+
 
 	# noinspection SqlResolve
 	def saveToDB(self):
@@ -266,21 +314,13 @@ class Device(ProjectAliceObject):
 		Updates or inserts this device in DB
 		:return:
 		"""
+		self._dirty = False
 		if self._id != -1:
 			self.DatabaseManager.replace(
 				tableName=self.DeviceManager.DB_DEVICE,
-				query='REPLACE INTO :__table__ (id, uid, parentLocation, typeName, skillName, settings, deviceParams, deviceConfigs) VALUES (:id, :uid, :parentLocation, :typeName, :skillName, :settings, :deviceParams, :deviceConfigs)',
+				query=self.REPLACE_QUERY,
 				callerName=self.DeviceManager.name,
-				values={
-					'id'            : self._id,
-					'uid'           : self._uid,
-					'parentLocation': self._parentLocation,
-					'typeName'      : self._typeName,
-					'skillName'     : self._skillName,
-					'settings'      : json.dumps(self._settings),
-					'deviceParams'  : json.dumps(self._deviceParams),
-					'deviceConfigs' : json.dumps(self._deviceConfigs)
-				}
+				values=self.toDBValues()
 			)
 		else:
 			deviceId = self.DatabaseManager.insert(
@@ -326,6 +366,7 @@ class Device(ProjectAliceObject):
 		:return:
 		"""
 		self._uid = uid
+		self.DeviceManager.reindexDevice(self)
 		self.saveToDB()
 		self.broadcastUpdated()
 
@@ -399,6 +440,7 @@ class Device(ProjectAliceObject):
 	@parentLocation.setter
 	def parentLocation(self, value: int):
 		self._parentLocation = value
+		self.DeviceManager.reindexDevice(self)
 
 
 	@property
@@ -466,7 +508,7 @@ class Device(ProjectAliceObject):
 
 	def updateSettings(self, settings: dict):
 		self._settings = {**self._settings, **settings}
-		self.saveToDB()
+		self.markDirty()
 
 
 	def getConfig(self, key: str, default: Any = False) -> Any:
@@ -475,12 +517,12 @@ class Device(ProjectAliceObject):
 
 	def updateConfigs(self, configs: dict):
 		self._deviceConfigs = {**self._deviceConfigs, **configs}
-		self.saveToDB()
+		self.markDirty()
 
 
 	def updateConfig(self, key: str, value: Any):
 		self._deviceConfigs[key] = value
-		self.saveToDB()
+		self.markDirty()
 
 
 	def getParam(self, key: str, default: Any = False) -> Any:
@@ -489,12 +531,12 @@ class Device(ProjectAliceObject):
 
 	def updateParams(self, params: dict):
 		self._deviceParams = {**self._deviceParams, **params}
-		self.saveToDB()
+		self.markDirty()
 
 
 	def updateParam(self, key: str, value: Any):
 		self._deviceParams[key] = value
-		self.saveToDB()
+		self.markDirty()
 
 
 	def onUIClick(self) -> dict:
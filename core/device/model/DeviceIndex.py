@@ -0,0 +1,146 @@
+#  Copyright (c) 2021
+#
+#  This file, DeviceIndex.py, is part of Project Alice.
+#
+#  Project Alice is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>
+#
+#  Last modified: 2026.10.18 at 20:22:08 CEST
+
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from core.device.model.Device import Device
+from core.device.model.DeviceAbility import DeviceAbility
+
+
+class DeviceIndex(object):
+	"""
+	Lookup tables over the known devices, by uid, ability bitmask, location and skill.
+	Devices must be reindexed whenever one of those changes. Reads do not lock, writes replace entries under a lock
+	"""
+
+	def __init__(self):
+		self._lock = threading.Lock()
+		self._keys: Dict[int, Tuple[str, int, int, str]] = dict()
+		self._byUid: Dict[str, Device] = dict()
+		self._byAbilities: Dict[int, Dict[int, Device]] = dict()
+		self._byLocation: Dict[int, Dict[int, Device]] = dict()
+		self._bySkill: Dict[str, Dict[int, Device]] = dict()
+		self._mainDevice: Optional[Device] = None
+
+
+	def __len__(self) -> int:
+		return len(self._keys)
+
+
+	@staticmethod
+	def abilityMask(abilities: List[DeviceAbility]) -> int:
+		mask = 0
+		for ability in abilities:
+			mask |= ability.value
+		return mask
+
+
+	def clear(self):
+		with self._lock:
+			self._keys = dict()
+			self._byUid = dict()
+			self._byAbilities = dict()
+			self._byLocation = dict()
+			self._bySkill = dict()
+			self._mainDevice = None
+
+
+	def add(self, device: Device):
+		"""
+		Indexes a device, or reindexes it if it already is
+		:param device:
+		:return:
+		"""
+		with self._lock:
+			self._remove(device.id)
+
+			key = (str(device.uid), device.getAbilities() or 0, device.parentLocation, device.skillName)
+			self._keys[device.id] = key
+			self._byUid[key[0]] = device
+			self._byAbilities.setdefault(key[1], dict())[device.id] = device
+			self._byLocation.setdefault(key[2], dict())[device.id] = device
+			self._bySkill.setdefault(key[3], dict())[device.id] = device
+
+			if key[1] & DeviceAbility.IS_CORE.value and not self._mainDevice:
+				self._mainDevice = device
+
+
+	def update(self, device: Device):
+		"""
+		Reindexes a device that is already known, unknown devices are ignored
+		:param device:
+		:return:
+		"""
+		if device.id in self._keys:
+			self.add(device)
+
+
+	def remove(self, device: Device):
+		with self._lock:
+			self._remove(device.id)
+
+
+	def _remove(self, deviceId: int):
+		key = self._keys.pop(deviceId, None)
+		if not key:
+			return
+
+		device = self._byAbilities[key[1]].pop(deviceId)
+		if self._byUid.get(key[0]) is device:
+			self._byUid.pop(key[0])
+
+		for index, value in ((self._byAbilities, key[1]), (self._byLocation, key[2]), (self._bySkill, key[3])):
+			index[value].pop(deviceId, None)
+			if not index[value]:
+				index.pop(value)
+
+		if self._mainDevice is device:
+			self._mainDevice = next((candidate for mask, devices in list(self._byAbilities.items()) if mask & DeviceAbility.IS_CORE.value for candidate in list(devices.values())), None)
+
+
+	@property
+	def mainDevice(self) -> Optional[Device]:
+		return self._mainDevice
+
+
+	def getByUid(self, uid: str) -> Optional[Device]:
+		return self._byUid.get(uid, None)
+
+
+	def withAbilities(self, abilities: List[DeviceAbility]) -> List[Device]:
+		"""
+		Returns the devices having AT LEAST the given abilities. There are only a few distinct ability masks, one per device type at most
+		:param abilities:
+		:return:
+		"""
+		check = self.abilityMask(abilities)
+		ret = list()
+		for mask, devices in list(self._byAbilities.items()):
+			if mask & check == check:
+				ret.extend(list(devices.values()))
+		return ret
+
+
+	def byLocation(self, locationId: int) -> List[Device]:
+		return list(self._byLocation.get(locationId, dict()).values())
+
+
+	def bySkill(self, skillName: str) -> List[Device]:
+		return list(self._bySkill.get(skillName, dict()).values())
@@ -0,0 +1,139 @@
+#  Copyright (c) 2021
+#
+#  This file, HeartbeatTracker.py, is part of Project Alice.
+#
+#  Project Alice is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>
+#
+#  Last modified: 2026.10.18 at 20:24:12 CEST
+
+import heapq
+import threading
+import time
+from typing import Callable, Dict, List, Tuple
+
+
+class HeartbeatTracker(object):
+	"""
+	Tracks the heartbeat deadline of every connected device in a priority queue, run by one long-lived thread
+	that only wakes up when the earliest deadline passes. A heartbeat only moves the device deadline, the queue
+	entry is pushed back when it comes up, so the queue holds one entry per device
+	"""
+
+	def __init__(self, onTimeout: Callable[[str], None]):
+		self._onTimeout = onTimeout
+		self._condition = threading.Condition()
+		self._heap: List[Tuple[float, str, int]] = list()
+		self._deadlines: Dict[str, List] = dict()
+		self._generation = 0
+		self._stopped = False
+		self._run = 0
+
+
+	def __len__(self) -> int:
+		return len(self._deadlines)
+
+
+	def beat(self, uid: str, timeout: float):
+		"""
+		Records a sign of life, the device times out if it does not give another one within timeout seconds
+		:param uid:
+		:param timeout:
+		:return:
+		"""
+		deadline = time.monotonic() + timeout
+		with self._condition:
+			entry = self._deadlines.get(uid, None)
+			if entry:
+				# Deadlines only move forward here, the entry is pushed back when it comes up
+				entry[0] = deadline
+				return
+
+			self._generation += 1
+			self._deadlines[uid] = [deadline, self._generation]
+			heapq.heappush(self._heap, (deadline, uid, self._generation))
+			if self._heap[0][1] == uid:
+				self._condition.notify()
+
+
+	def remove(self, uid: str):
+		"""
+		Stops tracking a device, its queue entry is dropped when it comes up
+		:param uid:
+		:return:
+		"""
+		with self._condition:
+			self._deadlines.pop(uid, None)
+
+
+	def start(self):
+		"""
+		Arms the tracker for a new run loop, after a stop. A loop still winding down from a previous run exits
+		:return:
+		"""
+		with self._condition:
+			self._stopped = False
+			self._run += 1
+			self._condition.notify_all()
+
+
+	def stop(self):
+		with self._condition:
+			self._stopped = True
+			self._condition.notify()
+
+
+	def expired(self, now: float = None) -> List[str]:
+		"""
+		Pops the devices whose deadline passed, pushing back the ones that gave a heartbeat since they were queued
+		:param now:
+		:return: The uids of the timed out devices
+		"""
+		now = now or time.monotonic()
+		ret = list()
+		with self._condition:
+			while self._heap and self._heap[0][0] <= now:
+				_, uid, generation = heapq.heappop(self._heap)
+				entry = self._deadlines.get(uid, None)
+				if not entry or entry[1] != generation:
+					continue
+
+				if entry[0] > now:
+					heapq.heappush(self._heap, (entry[0], uid, generation))
+					continue
+
+				self._deadlines.pop(uid)
+				ret.append(uid)
+		return ret
+
+
+	def run(self):
+		"""
+		The scheduler loop, to be run in its own thread until stop is called
+		:return:
+		"""
+		with self._condition:
+			run = self._run
+
+		while True:
+			for uid in self.expired():
+				self._onTimeout(uid)
+
+			with self._condition:
+				if self._stopped or self._run != run:
+					return
+
+				timeout = max(0.0, self._heap[0][0] - time.monotonic()) if self._heap else None
+				self._condition.wait(timeout)
+				if self._stopped or self._run != run:
+					return
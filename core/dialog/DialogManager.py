@@ -81,7 +81,7 @@ class DialogManager(Manager):
 		if self.WakewordRecorder.state != WakewordRecorderState.IDLE:
 			return
 
-		self.logDebug(f'Wakeword detected by **{self.DeviceManager.getDevice(uid=deviceUid).displayName}**')
+		self.logDebug(lambda: f'Wakeword detected by **{self.DeviceManager.getDevice(uid=deviceUid).displayName}**')
 
 		self._endedSessions[deviceUid] = self._sessionsById.pop(deviceUid, None)
 
@@ -136,7 +136,7 @@ class DialogManager(Manager):
 		if not session or session.hasEnded:
 			return
 
-		if session.isEnding and 0 < session.notUnderstood < int(self.ConfigManager.getAliceConfigByName('notUnderstoodRetries')):
+		if session.isEnding and 0 < session.notUnderstood < self.ConfigManager.getAliceConfigByName('notUnderstoodRetries'):
 			session.isEnding = False
 			self.SkillManager.getSkillInstance('AliceCore').askUpdateUtterance(session=session)
 			return
@@ -243,7 +243,7 @@ class DialogTemplateManager(Manager):
 
 		skill.addUtterance(text=text, intent=intent)
 		self.DialogManager.cleanNotRecognizedIntent(text=text)
-		self.ThreadManager.doLater(interval=2, func=self.AssistantManager.checkAssistant)
+		self.ThreadManager.doLater(interval=2, func=self.AssistantManager.checkAssistant, pool='io')
 
 
 	@classmethod
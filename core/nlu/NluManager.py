@@ -153,7 +153,7 @@ class NluManager(Manager):
 
 
 	def buildTrainingData(self):
-		self.clearCache()
+		self.clearTrainingData()
 		self._nluEngine.convertDialogTemplate(self.DialogTemplateManager.pathToData)
 
 
@@ -166,11 +166,21 @@ class NluManager(Manager):
 		self._nluEngine.train(forceLocalTraining=forceLocalTraining)
 
 
-	def clearCache(self):
+	def clearTrainingData(self):
 		shutil.rmtree(self._pathToCache)
 		self._pathToCache.mkdir()
 
 
+	def clearCache(self):
+		"""
+		Clears the training data along with the converted skill templates the engine keeps between trainings
+		:return:
+		"""
+		self.clearTrainingData()
+		if self._nluEngine:
+			self._nluEngine.clearFragments()
+
+
 	@property
 	def training(self) -> bool:
 		return self._training
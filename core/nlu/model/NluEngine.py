@@ -66,6 +66,10 @@ class NluEngine(ProjectAliceObject):
 		self.logFatal(f'NLU Engine {self.NAME} is missing implementation of "convertDialogTemplate"')
 
 
+	def clearFragments(self):
+		pass  # Superseeded by engines caching converted skill templates
+
+
 	def trainingFailed(self, reason: str = ''):
 		self.logError(f'{self.NAME} training failed: {reason}', printStack=False)
 		self._timer.cancel()
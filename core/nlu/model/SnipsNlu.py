@@ -17,6 +17,7 @@
 #
 #  Last modified: 2021.05.19 at 12:56:47 CEST
 
+import hashlib
 import json
 import re
 import shutil
@@ -24,6 +25,7 @@ from pathlib import Path
 from subprocess import CompletedProcess
 
 from core.nlu.model.NluEngine import NluEngine
+from core.util.model.WorkerPool import WorkerPool
 
 
 class SnipsNlu(NluEngine):
@@ -34,6 +36,7 @@ class SnipsNlu(NluEngine):
 	def __init__(self):
 		super().__init__()
 		self._cachePath = Path(self.Commons.rootDir(), 'var/cache/nlu/trainingData')
+		self._fragmentsPath = Path(self.Commons.rootDir(), 'var/cache/nlu/fragments')
 
 
 	def start(self):
@@ -57,69 +60,131 @@ class SnipsNlu(NluEngine):
 
 
 	def convertDialogTemplate(self, file: Path):
+		"""
+		Builds the training dataset from the dialog templates dump. Each skill is converted into a fragment that is cached
+		along with the checksum of its template, so that only the skills that changed since last time get converted again
+		:param file: The dialog templates dump
+		:return:
+		"""
 		self.logInfo('Preparing NLU training file')
 		dialogTemplate = json.loads(file.read_text())
 
+		fragmentsPath = self._fragmentsPath / self.getLanguage()
+		fragmentsPath.mkdir(parents=True, exist_ok=True)
+		indexFile = fragmentsPath / 'index.json'
+		try:
+			index = json.loads(indexFile.read_text())
+		except (OSError, ValueError):
+			index = dict()
+
 		nluTrainingSample = dict()
 		nluTrainingSample['language'] = self.getLanguage()
 		nluTrainingSample['entities'] = dict()
 		nluTrainingSample['intents'] = dict()
 
+		checksums = dict()
+		converted = 0
 		for skill in dialogTemplate:
-			for entity in skill['slotTypes']:
-				nluTrainingSampleEntity = nluTrainingSample['entities'].setdefault(entity['name'], dict())
-
-				nluTrainingSampleEntity['automatically_extensible'] = entity['automaticallyExtensible']
-				nluTrainingSampleEntity['matching_strictness'] = entity['matchingStrictness'] or 1.0
-				nluTrainingSampleEntity['use_synonyms'] = entity['useSynonyms']
+			skillName = skill['skill']
+			checksum = hashlib.blake2b(json.dumps(skill, ensure_ascii=False, sort_keys=True).encode()).hexdigest()
+			fragmentFile = fragmentsPath / f'{skillName}.json'
+
+			fragment = None
+			if index.get(skillName, None) == checksum:
+				try:
+					fragment = json.loads(fragmentFile.read_text())
+				except (OSError, ValueError):
+					fragment = None
+
+			if fragment is None:
+				fragment = self.convertSkillTemplate(skill)
+				fragmentFile.write_text(json.dumps(fragment, ensure_ascii=False))
+				converted += 1
+
+			checksums[skillName] = checksum
+
+			# Merged in template order, later skills override what earlier ones define, as a full conversion would
+			nluTrainingSample['entities'].update(fragment['entities'])
+			nluTrainingSample['intents'].update(fragment['intents'])
+
+		for fragmentFile in fragmentsPath.glob('*.json'):
+			if fragmentFile != indexFile and fragmentFile.stem not in checksums:
+				fragmentFile.unlink()
+
+		indexFile.write_text(json.dumps(checksums, indent='\t', sort_keys=True))
+		self.logInfo(f'Converted {converted} out of {len(dialogTemplate)} skill templates, others were up to date')
+
+		# json.dumps uses the C encoder, json.dump would encode chunk by chunk in python
+		Path(self._cachePath / f'{self.getLanguage()}.json').write_text(json.dumps(nluTrainingSample, ensure_ascii=False))
+
+
+	def convertSkillTemplate(self, skill: dict) -> dict:
+		"""
+		Converts the dialog template of one skill into its share of the training dataset
+		:param skill: The dumped dialog template of the skill
+		:return: The entities and intents of the skill
+		"""
+		fragment = {
+			'entities': dict(),
+			'intents' : dict()
+		}
 
-				nluTrainingSampleEntity['data'] = [{
+		for entity in skill['slotTypes']:
+			fragment['entities'][entity['name']] = {
+				'automatically_extensible': entity['automaticallyExtensible'],
+				'matching_strictness'     : entity['matchingStrictness'] or 1.0,
+				'use_synonyms'            : entity['useSynonyms'],
+				'data'                    : [{
 					'value'   : value['value'],
 					'synonyms': value.get('synonyms', list())
 				} for value in entity['values'] if value is not None
 				]
+			}
 
-			for intent in skill['intents']:
-				intentName = intent['name']
-				slots = self.loadSlots(intent)
-				nluTrainingSample['intents'][intentName] = {'utterances': list()}
+		for intent in skill['intents']:
+			intentName = intent['name']
+			slots = self.loadSlots(intent)
+			fragment['intents'][intentName] = {'utterances': list()}
+
+			for utterance in intent['utterances']:
+				data = list()
+				result = self.UTTERANCE_REGEX.split(utterance)
+				if not result:
+					data.append({
+						'text': utterance
+					})
+				else:
+					for match in result:
+						if ':=>' not in match:
+							data.append({
+								'text': match
+							})
+							continue
 
-				for utterance in intent['utterances']:
-					data = list()
-					result = self.UTTERANCE_REGEX.split(utterance)
-					if not result:
-						data.append({
-							'text': utterance
-						})
-					else:
-						for match in result:
-							if ':=>' not in match:
-								data.append({
-									'text': match
-								})
-								continue
+						text, slotName = match.split(':=>')
+						entity = slots.get(slotName, None)
 
-							text, slotName = match.split(':=>')
-							entity = slots.get(slotName, None)
+						if not entity:
+							self.logWarning(f'Slot named "{slotName}" with text "{text}" in utterance "{utterance}" doesn\'t have any matching slot definition, skipping to avoid NLU training failure')
+							continue
 
-							if not entity:
-								self.logWarning(f'Slot named "{slotName}" with text "{text}" in utterance "{utterance}" doesn\'t have any matching slot definition, skipping to avoid NLU training failure')
-								continue
+						if entity.startswith('snips/'):
+							fragment['entities'][entity] = dict()
 
-							if entity.startswith('snips/'):
-								nluTrainingSample['entities'][entity] = dict()
+						data.append({
+							'entity'   : entity,
+							'slot_name': slotName,
+							'text'     : text
+						})
 
-							data.append({
-								'entity'   : entity,
-								'slot_name': slotName,
-								'text'     : text
-							})
+				# noinspection PyTypeChecker,PyUnresolvedReferences
+				fragment['intents'][intentName]['utterances'].append({'data': data})
+
+		return fragment
 
-					# noinspection PyTypeChecker,PyUnresolvedReferences
-					nluTrainingSample['intents'][intentName]['utterances'].append({'data': data})
 
-		with Path(self._cachePath / f'{self.getLanguage()}.json').open('w') as fp:
-			json.dump(nluTrainingSample, fp, ensure_ascii=False)
+	def clearFragments(self):
+		shutil.rmtree(self._fragmentsPath, ignore_errors=True)
 
 
 	def train(self, forceLocalTraining: bool = False):
@@ -148,7 +213,7 @@ class SnipsNlu(NluEngine):
 					json.dump(dataset, fp, ensure_ascii=False, indent='\t')
 
 				if self.ProjectAlice.isBooted:
-					self.ThreadManager.newThread(name='NLUTraining', target=self.nluTrainingThread, args=[datasetFile])
+					self.ThreadManager.submit(func=self.nluTrainingThread, pool='cpu', priority=WorkerPool.PRIORITY_LOW, args=[datasetFile])
 				else:
 					self.nluTrainingThread(datasetFile)
 		except Exception as e:
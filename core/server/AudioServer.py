@@ -19,19 +19,21 @@
 
 import io
 import sounddevice as sd
+import threading
 import time
 import uuid
 import wave
 from pathlib import Path
 # noinspection PyUnresolvedReferences,PyProtectedMember
 from scipy._lib._ccallback import CData
-from typing import Dict, Optional
+from typing import Callable, Dict, Optional, Tuple
 from webrtcvad import Vad
 
 from core.ProjectAliceExceptions import PlayBytesStopped
 from core.base.model.Manager import Manager
 from core.commons import constants
 from core.dialog.model.DialogSession import DialogSession
+from core.server.model.AudioFrame import AudioFormat, AudioFrame
 from core.util.model.AliceEvent import AliceEvent
 from core.voice.WakewordRecorder import WakewordRecorderState
 
@@ -40,6 +42,9 @@ class AudioManager(Manager):
 	SAMPLERATE = 16000
 	FRAMES_PER_BUFFER = 320
 
+	# Our own raw frames, also assumed for devices sending raw frames before their format announcement came in
+	DEFAULT_FRAME_FORMAT = AudioFormat(rate=SAMPLERATE, width=2, channels=1)
+
 	LAST_USER_SPEECH = 'var/cache/lastUserpeech_{}_{}.wav'
 	SECOND_LAST_USER_SPEECH = 'var/cache/secondLastUserSpeech_{}_{}.wav'
 
@@ -52,6 +57,18 @@ class AudioManager(Manager):
 		self._waves: Dict[str, wave.Wave_write] = dict()
 		self._audioInputStream = None
 
+		# Device uid or constants.ALL: subscribed callbacks. Tuples are replaced, never mutated, so frames can be dispatched without locking
+		self._audioFrameSubscribers: Dict[str, Tuple[Callable[[memoryview, str], None], ...]] = dict()
+		self._audioFrameSubscribersLock = threading.Lock()
+
+		# Formats announced by devices publishing raw PCM frames
+		self._audioFrameFormats: Dict[str, AudioFormat] = dict()
+		self._rawAudioFrames = False
+
+		# Device uid: frames read with the default format, frames dropped as unreadable
+		self._assumedFormatFrames: Dict[str, int] = dict()
+		self._droppedAudioFrames: Dict[str, int] = dict()
+
 		if not self.ConfigManager.getAliceConfigByName('disableCapture'):
 			self._vad = Vad(2)
 
@@ -91,6 +108,7 @@ class AudioManager(Manager):
 
 
 	def onBooted(self):
+		self.updateAudioFrameFormat()
 		if not self.ConfigManager.getAliceConfigByName('disableCapture'):
 			self.ThreadManager.newThread(name='audioPublisher', target=self.publishAudio)
 
@@ -140,6 +158,115 @@ class AudioManager(Manager):
 		self._waves[deviceUid].writeframes(frame)
 
 
+	def subscribeAudioFrames(self, callback: Callable[[memoryview, str], None], deviceUid: str = constants.ALL):
+		"""
+		Registers a consumer for the audio frames of the given device, or of every device
+		:param callback: Called with the frame PCM, as a memoryview, and the device uid
+		:param deviceUid:
+		:return:
+		"""
+		with self._audioFrameSubscribersLock:
+			subscribers = self._audioFrameSubscribers.get(deviceUid, tuple())
+			if callback not in subscribers:
+				self._audioFrameSubscribers[deviceUid] = subscribers + (callback,)
+
+
+	def unsubscribeAudioFrames(self, callback: Callable[[memoryview, str], None], deviceUid: str = constants.ALL):
+		"""
+		Removes a consumer previously registered with subscribeAudioFrames
+		:param callback:
+		:param deviceUid:
+		:return:
+		"""
+		with self._audioFrameSubscribersLock:
+			subscribers = tuple(subscriber for subscriber in self._audioFrameSubscribers.get(deviceUid, tuple()) if subscriber != callback)
+			if subscribers:
+				self._audioFrameSubscribers[deviceUid] = subscribers
+			else:
+				self._audioFrameSubscribers.pop(deviceUid, None)
+
+
+	def updateAudioFrameFormat(self):
+		"""
+		Announces, or withdraws, the raw PCM format of our published audio frames on the retained format topic
+		:return:
+		"""
+		self._rawAudioFrames = bool(self.ConfigManager.getAliceConfigByName('rawAudioFrames'))
+		topic = constants.TOPIC_AUDIO_FRAME_FORMAT.format(self.DeviceManager.getMainDevice().uid)
+
+		if self._rawAudioFrames:
+			self.MqttManager.publish(topic=topic, stringPayload=AudioFrame.encodeFormat(self.DEFAULT_FRAME_FORMAT), qos=1, retain=True)
+		else:
+			# An empty retained message clears the format, consumers fall back to wav frames
+			self.MqttManager.publish(topic=topic, qos=1, retain=True)
+
+
+	def onAudioFrameFormat(self, deviceUid: str, payload: bytes):
+		"""
+		Remembers the stream format a device announced for its raw audio frames
+		:param deviceUid:
+		:param payload: The mqtt payload of the retained format topic
+		:return:
+		"""
+		audioFormat = AudioFrame.decodeFormat(payload)
+		if audioFormat:
+			self._audioFrameFormats[deviceUid] = audioFormat
+			self.logDebug('Device **{}** publishes raw audio frames (rate: {}, width: {}, channels: {})', deviceUid, audioFormat.rate, audioFormat.width, audioFormat.channels)
+		elif self._audioFrameFormats.pop(deviceUid, None):
+			self.logDebug('Device **{}** publishes wav audio frames', deviceUid)
+
+
+	def getAudioFrameFormat(self, deviceUid: str) -> Optional[AudioFormat]:
+		return self._audioFrameFormats.get(deviceUid, None)
+
+
+	@property
+	def audioFrameStats(self) -> Dict[str, Dict[str, int]]:
+		"""
+		Per device, how many frames were read with the default format and how many were dropped as unreadable
+		:return:
+		"""
+		return {
+			'assumedFormat': dict(self._assumedFormatFrames),
+			'dropped'      : dict(self._droppedAudioFrames)
+		}
+
+
+	def dispatchAudioFrame(self, deviceUid: str, payload: bytes):
+		"""
+		Decodes an incoming audio frame once and hands it to the consumers registered for its device
+		:param deviceUid:
+		:param payload: The mqtt payload
+		:return:
+		"""
+		subscribers = self._audioFrameSubscribers.get(deviceUid, tuple()) + self._audioFrameSubscribers.get(constants.ALL, tuple())
+		if not subscribers:
+			return
+
+		audioFormat = self._audioFrameFormats.get(deviceUid, None)
+		if not audioFormat and not AudioFrame.isWav(payload):
+			# Raw frames can come in before the retained format of a reconnecting device
+			audioFormat = self.DEFAULT_FRAME_FORMAT
+			assumed = self._assumedFormatFrames.get(deviceUid, 0) + 1
+			self._assumedFormatFrames[deviceUid] = assumed
+			if assumed == 1:
+				self.logInfo(f'Device **{deviceUid}** sends raw audio frames before announcing their format, assuming {audioFormat.rate}Hz {audioFormat.width * 8}bit mono')
+
+		frame = AudioFrame.decode(payload, rawFormat=audioFormat)
+		if frame is None:
+			dropped = self._droppedAudioFrames.get(deviceUid, 0) + 1
+			self._droppedAudioFrames[deviceUid] = dropped
+			if dropped == 1:
+				self.logWarning(f'Dropping unreadable audio frames from device **{deviceUid}**')
+			return
+
+		for callback in subscribers:
+			try:
+				callback(frame, deviceUid)
+			except Exception as e:
+				self.logError(f'Error dispatching audio frame: {e}')
+
+
 	def publishAudio(self) -> None:
 		"""
 		captures the audio and broadcasts it via publishAudioFrames to the topic 'hermes/audioServer/{}/audioFrame'
@@ -197,7 +324,7 @@ class AudioManager(Manager):
 
 				self.publishAudioFrames(frames)
 			except Exception as e:
-				self.logDebug(f'Error publishing frame: {e}')
+				self.logDebug('Error publishing frame: {}', e)
 
 
 	def publishAudioFrames(self, frames: bytes) -> None:
@@ -206,6 +333,10 @@ class AudioManager(Manager):
 		:param frames:
 		:return:
 		"""
+		if self._rawAudioFrames:
+			self.MqttManager.publish(topic=constants.TOPIC_AUDIO_FRAME.format(self.DeviceManager.getMainDevice().uid), payload=bytearray(frames))
+			return
+
 		with io.BytesIO() as buffer:
 			with wave.open(buffer, 'wb') as wav:
 				wav.setnchannels(1)
@@ -262,7 +393,7 @@ class AudioManager(Manager):
 						callback=streamCallback
 					)
 
-					self.logDebug(f'Playing wav stream using **{self._audioOutput}** audio output from device **{self.DeviceManager.getDevice(uid=deviceUid).displayName}** (channels: {channels}, rate: {framerate})')
+					self.logDebug(lambda: f'Playing wav stream using **{self._audioOutput}** audio output from device **{self.DeviceManager.getDevice(uid=deviceUid).displayName}** (channels: {channels}, rate: {framerate})')
 					stream.start()
 					while stream.active:
 						if self._stopPlayingFlag.is_set():
@@ -27,6 +27,7 @@ import uuid
 from pathlib import Path
 from typing import List, Union
 
+from core.base.SuperManager import SuperManager
 from core.base.model.Intent import Intent
 from core.base.model.Manager import Manager
 from core.commons import constants
@@ -37,6 +38,7 @@ from core.device.model.DeviceAbility import DeviceAbility
 class MqttManager(Manager):
 	DEFAULT_CLIENT_EXTENSION = '@mqtt'
 	TOPIC_AUDIO_FRAME = constants.TOPIC_AUDIO_FRAME.replace('{}', '+')
+	TOPIC_AUDIO_FRAME_FORMAT = constants.TOPIC_AUDIO_FRAME_FORMAT.replace('{}', '+')
 
 
 	def __init__(self):
@@ -47,6 +49,7 @@ class MqttManager(Manager):
 		self._deactivatedIntents = list()
 
 		self._audioFrameRegex = re.compile(self.TOPIC_AUDIO_FRAME.replace('+', '(.*)'))
+		self._audioFrameFormatRegex = re.compile(self.TOPIC_AUDIO_FRAME_FORMAT.replace('+', '(.*)'))
 		self._wakewordDetectedRegex = re.compile(constants.TOPIC_WAKEWORD_DETECTED.replace('{}', '(.*)'))
 		self._vadUpRegex = re.compile(constants.TOPIC_VAD_UP.replace('{}', '(.*)'))
 		self._vadDownRegex = re.compile(constants.TOPIC_VAD_DOWN.replace('{}', '(.*)'))
@@ -151,7 +154,8 @@ class MqttManager(Manager):
 			(constants.TOPIC_NLU_TRAINER_STOPPED, 0),
 			(constants.TOPIC_NLU_TRAINER_REFUSE_FAILED, 0),
 			(constants.TOPIC_NLU_TRAINER_TRAINING, 0),
-			(self.TOPIC_AUDIO_FRAME, 0)
+			(self.TOPIC_AUDIO_FRAME, 0),
+			(self.TOPIC_AUDIO_FRAME_FORMAT, 1)
 		]
 
 		for username in self.UserManager.getAllUserNames():
@@ -212,14 +216,25 @@ class MqttManager(Manager):
 
 	def onMqttMessage(self, _client, _userdata, message: mqtt.MQTTMessage):
 		try:
-			if self._audioFrameRegex.match(message.topic):
-				self.broadcast(
-					method=constants.EVENT_AUDIO_FRAME,
-					exceptions=[self.name],
-					propagateToSkills=True,
-					message=message,
-					deviceUid=message.topic.replace('hermes/audioServer/', '').replace('/audioFrame', '')
-				)
+			match = self._audioFrameRegex.match(message.topic)
+			if match:
+				deviceUid = match.group(1)
+				self.AudioServer.dispatchAudioFrame(deviceUid=deviceUid, payload=message.payload)
+
+				# Frames only go through the generic event if something, skills mostly, still listens to it
+				if self.hasAudioFrameListeners():
+					self.broadcast(
+						method=constants.EVENT_AUDIO_FRAME,
+						exceptions=[self.name],
+						propagateToSkills=True,
+						message=message,
+						deviceUid=deviceUid
+					)
+				return
+
+			match = self._audioFrameFormatRegex.match(message.topic)
+			if match:
+				self.AudioServer.onAudioFrameFormat(deviceUid=match.group(1), payload=message.payload)
 				return
 
 			if message.topic == constants.TOPIC_INTENT_PARSED:
@@ -243,12 +258,12 @@ class MqttManager(Manager):
 				self.SkillManager.dispatchMessage(session=session)
 				return
 
-			self.logDebug(f'Using probability threshold of {session.probabilityThreshold}')
+			self.logDebug('Using probability threshold of {}', session.probabilityThreshold)
 
 			self.broadcast(method=constants.EVENT_INTENT, exceptions=[self.name], propagateToSkills=True, session=session)
 
 			if 'intent' in payload and float(payload['intent']['confidenceScore']) < session.probabilityThreshold:
-				self.logDebug(f'Intent **{message.topic}** detected but confidence score too low ({payload["intent"]["confidenceScore"]})')
+				self.logDebug('Intent **{}** detected but confidence score too low ({})', message.topic, payload['intent']['confidenceScore'])
 
 				# if the session has ended but was kept open for further prompts, don't use "not understood" logic
 				if session.keptOpen:
@@ -306,6 +321,15 @@ class MqttManager(Manager):
 			traceback.print_exc()
 
 
+	def hasAudioFrameListeners(self) -> bool:
+		"""
+		Whether any manager or skill still implements onAudioFrame instead of using AudioServer.subscribeAudioFrames
+		:return:
+		"""
+		return any(name != self.name for name, _ in SuperManager.getInstance().getEventHandlers('onAudioFrame')) \
+			or bool(self.SkillManager.getSkillEventHandlers('onAudioFrame'))
+
+
 	def onHotwordDetected(self, _client, _data, msg):
 		deviceUid = self.Commons.parseDeviceUid(msg)
 		payload = self.Commons.payload(msg)
@@ -0,0 +1,104 @@
+#  Copyright (c) 2021
+#
+#  This file, AudioFrame.py, is part of Project Alice.
+#
+#  Project Alice is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>
+#
+#  Last modified: 2026.10.18 at 20:13:18 CEST
+
+import json
+import struct
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class AudioFormat(object):
+	rate: int
+	width: int
+	channels: int
+
+
+class AudioFrame(object):
+	"""
+	Audio frames travel on hermes/audioServer/<deviceUid>/audioFrame, either as WAV wrapped PCM or, for devices
+	announcing their stream format on projectalice/audioServer/<deviceUid>/audioFrameFormat, as raw little endian PCM.
+	Decoding hands out a memoryview over the PCM part of the mqtt payload, nothing is copied
+	"""
+
+	@staticmethod
+	def isWav(payload: bytes) -> bool:
+		return len(payload) >= 12 and payload[0:4] == b'RIFF' and payload[8:12] == b'WAVE'
+
+
+	@staticmethod
+	def decode(payload: bytes, rawFormat: Optional[AudioFormat] = None) -> Optional[memoryview]:
+		"""
+		Walks the RIFF chunks of the given payload and returns a view of its data chunk.
+		Payloads that are no wav container are taken as raw PCM if the device announced its format
+		:param payload: The raw mqtt payload
+		:param rawFormat: The format announced by the sending device, if any
+		:return: The PCM data or None if the payload cannot be read
+		"""
+		view = memoryview(payload)
+		if not AudioFrame.isWav(view):
+			if rawFormat and view and len(view) % (rawFormat.width * rawFormat.channels) == 0:
+				return view
+			return None
+
+		offset = 12
+		while offset + 8 <= len(view):
+			chunkId = view[offset:offset + 4]
+			size = struct.unpack_from('<I', view, offset + 4)[0]
+			offset += 8
+
+			if chunkId == b'data':
+				return view[offset:offset + size]
+
+			# Chunks are word aligned
+			offset += size + (size & 1)
+
+		return None
+
+
+	@staticmethod
+	def encodeFormat(audioFormat: AudioFormat) -> str:
+		"""
+		Serializes a stream format for the retained format topic
+		:param audioFormat:
+		:return:
+		"""
+		return json.dumps(asdict(audioFormat))
+
+
+	@staticmethod
+	def decodeFormat(payload: bytes) -> Optional[AudioFormat]:
+		"""
+		Reads a stream format published on the format topic
+		:param payload: The raw mqtt payload, empty when a device stops publishing raw frames
+		:return: The format or None if the payload is empty or invalid
+		"""
+		if not payload:
+			return None
+
+		try:
+			data = json.loads(payload)
+			audioFormat = AudioFormat(rate=int(data['rate']), width=int(data['width']), channels=int(data['channels']))
+		except (ValueError, TypeError, KeyError):
+			return None
+
+		if audioFormat.rate <= 0 or audioFormat.width <= 0 or audioFormat.channels <= 0:
+			return None
+
+		return audioFormat
@@ -26,6 +26,7 @@ from pathlib import Path
 
 from core.base.model.Manager import Manager
 from core.commons import constants
+from core.util.model.Logger import Logger
 
 
 class BugReportManager(Manager):
@@ -42,6 +43,7 @@ class BugReportManager(Manager):
 		self._flagFile = Path('alice.bugreport')
 		if self._flagFile.exists():
 			self._recording = True
+			Logger.recordHistory = True
 			self.logInfo('Flag file detected, recording errors for this run')
 			version = subprocess.run('git rev-parse HEAD', capture_output=True, text=True, shell=True).stdout.strip()
 			self.logInfo('Project Alice logs')
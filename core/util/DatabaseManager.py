@@ -26,6 +26,7 @@ from core.ProjectAliceExceptions import DbConnectionError, InvalidQuery
 from core.base.model.Manager import Manager
 from core.commons import constants
 from core.commons.CommonsManager import CommonsManager
+from core.util.model.DatabasePool import DatabasePool
 
 
 # noinspection SqlResolve
@@ -36,6 +37,7 @@ class DatabaseManager(Manager):
 	def __init__(self):
 		super().__init__()
 		self._tables = list()
+		self._pool = DatabasePool(database=constants.DATABASE_FILE, timeout=10)
 
 
 	def onStart(self):
@@ -43,169 +45,224 @@ class DatabaseManager(Manager):
 		self.fetchTables()
 
 
+	def onStop(self):
+		super().onStop()
+		self._pool.close()
+
+
 	def fetchTables(self):
-		database = self.getConnection()
+		database = self.getConnection(write=False)
 		cursor = database.cursor()
 		try:
 			cursor.execute("SELECT name FROM main.sqlite_master WHERE type = 'table' and name NOT LIKE 'sqlite_%'")
 			self._tables = cursor.fetchall()
 			cursor.close()
-			database.close()
 		except sqlite3.Error as e:
 			self.logError(f'Something went wrong fetching database tables: {e}')
 			try:
 				cursor.close()
-				database.close()
 			except:
 				pass  # what else is there to do?
 			return False
 
 
 	def clearDB(self):
+		self._pool.close()
 		Path(self.Commons.rootDir(), 'system/database/data.db').unlink()
 
 
-	def getConnection(self) -> sqlite3.Connection:
+	def getConnection(self, write: Optional[bool] = None) -> sqlite3.Connection:
+		"""
+		Returns a database connection
+		:param write: None for a new connection the caller has to close, False for the pooled read connection of the calling thread,
+		True for the pooled writer connection, that can only be used while holding the pool write lock
+		:return:
+		"""
 		try:
-			if self.ConfigManager.getAliceConfigByName('databaseProfiling'):
-				self.logDebug(f'DB lock acquired by {CommonsManager.getFunctionCaller(depth=5)}->{CommonsManager.getFunctionCaller(depth=4)}->{CommonsManager.getFunctionCaller(depth=3)}')
-			con = sqlite3.connect(constants.DATABASE_FILE, timeout=10)
+			if self.ConfigManager.getAliceConfigByName('databaseProfiling') and self.isLogEnabledFor('debug'):
+				# Not a lazy message, the caller depths are relative to this very frame
+				self.logDebug('DB lock acquired by {}', '->'.join(str(caller) for caller in reversed(CommonsManager.getFunctionCallers(depth=3, count=3))))
+
+			if write is None:
+				con = self._pool.connect()
+			elif write:
+				con = self._pool.writer()
+			else:
+				con = self._pool.reader()
 		except sqlite3.Error as e:
 			self.logError(f'Failed to connect to DB ({constants.DATABASE_FILE}): {e}')
 			raise DbConnectionError()
-		con.row_factory = sqlite3.Row
 		return con
 
 
+	@staticmethod
+	def _release(database: sqlite3.Connection, cursor: sqlite3.Cursor = None):
+		"""
+		Closes the cursor and rolls back whatever a failed write left pending on a pooled connection
+		:param database:
+		:param cursor:
+		:return:
+		"""
+		try:
+			if cursor:
+				cursor.close()
+			if database.in_transaction:
+				database.rollback()
+		except:
+			pass  # Well, what's to do here....
+
+
 	def initDB(self, schema: dict, callerName: str) -> bool:
-		database = self.getConnection()
-		cursor = database.cursor()
-		ret = True
+		with self._pool.writeLock:
+			database = self.getConnection(write=True)
+			cursor = database.cursor()
+			ret = True
 
-		try:
-			# First check for new tables and columns addition/deprecation/type changes
-			for tableName, queries in schema.items():
+			try:
+				# First check for new tables and columns addition/deprecation/type changes
+				for tableName, queries in schema.items():
 
-				fullTableName = f'{callerName}_{tableName}'
-				colsQuery = ', '.join(queries)
+					fullTableName = f'{callerName}_{tableName}'
+					colsQuery = ', '.join(queries)
 
-				if colsQuery.count(' UNIQUE') > 1:
-					colsQuery = colsQuery.replace(' UNIQUE', '')
-					uniqueList = [query.split(' ')[0] for query in queries if 'UNIQUE' in query]
-					unique = f", UNIQUE({', '.join(uniqueList)})"
-				else:
-					unique = ''
+					if colsQuery.count(' UNIQUE') > 1:
+						colsQuery = colsQuery.replace(' UNIQUE', '')
+						uniqueList = [query.split(' ')[0] for query in queries if 'UNIQUE' in query]
+						unique = f", UNIQUE({', '.join(uniqueList)})"
+					else:
+						unique = ''
 
-				query = ''
-				try:
-					query = f"SELECT COUNT(name) FROM sqlite_master WHERE type = 'table' and name='{fullTableName}'"
-					cursor.execute(query)
-					if cursor.fetchone()[0] < 1:
-						self.logInfo(f'Missing data table **{fullTableName}**, creating it...')
-						try:
-							cursor.execute(f'CREATE TABLE {fullTableName} ({colsQuery}{unique})')
+					query = ''
+					try:
+						query = f"SELECT COUNT(name) FROM sqlite_master WHERE type = 'table' and name='{fullTableName}'"
+						cursor.execute(query)
+						if cursor.fetchone()[0] < 1:
+							self.logInfo(f'Missing data table **{fullTableName}**, creating it...')
+							try:
+								cursor.execute(f'CREATE TABLE {fullTableName} ({colsQuery}{unique})')
+								database.commit()
+								continue
+							except sqlite3.Error:
+								database.rollback()
+								raise
+					except sqlite3.Error as e:
+						self.logError(f'Something went wrong creating database table **{fullTableName}** for component **{callerName}**. The query was "{query}": {e}.')
+						continue
+
+					try:
+						cursor.execute(f'PRAGMA table_info({fullTableName})')
+						rows = cursor.fetchall()
+						installedColumns = {x[1]: x[2] for x in rows}
+
+						cols = dict()
+						for column in schema[tableName]:
+							colName: str = column.split(' ')[0]
+							if colName.lower().startswith('unique'):
+								continue
+
+							colType = column.split(' ')[1]
+							cols[colName] = colType
+							if colName not in installedColumns:
+								oldColName = [val for val in installedColumns if colName.casefold() == val.casefold()]
+								if oldColName:
+									self.logWarning(f'Found a case-changed column from **{oldColName[0]}** to **{colName}** for table **{fullTableName}** in component **{callerName}**')
+									cursor.execute(f'ALTER TABLE {fullTableName} RENAME COLUMN {oldColName[0]} TO {colName}')
+								else:
+									self.logWarning(f'Found a missing column **{colName}** for table **{fullTableName}** in component **{callerName}**')
+									cursor.execute(f'ALTER TABLE {fullTableName} ADD COLUMN {colName} {colType}')
+
+						database.commit()
+					except sqlite3.Error as e:
+						self.logError(f'Failed altering table **{fullTableName}** for component **{callerName}**: {e}')
+						database.rollback()
+						raise Exception
+
+					try:
+						cursor.execute(f'PRAGMA table_info({fullTableName})')
+						rows = cursor.fetchall()
+						installedColumns = {x[1]: x[2] for x in rows}
+
+						doUpdate = False
+						for column in installedColumns:
+							if column not in cols:
+								self.logInfo(f'Found a deprecated column **{column}** for table **{fullTableName}** in component **{callerName}**')
+								doUpdate = True
+							elif installedColumns[column].lower() != cols[column].lower():
+								self.logInfo(f'Column **{column}** has changed data type for component **{callerName}**')
+								doUpdate = True
+
+						if doUpdate:
+							cursor.execute(f"ALTER TABLE {fullTableName} RENAME TO {'bak_' + fullTableName}")
+							cursor.execute(f'CREATE TABLE {fullTableName} ({colsQuery})')
+							cursor.execute(f"INSERT INTO {fullTableName} SELECT {', '.join(cols)} FROM {'bak_' + fullTableName}")
+							cursor.execute(f"DROP TABLE {'bak_' + fullTableName}")
 							database.commit()
-							continue
-						except sqlite3.Error:
-							database.rollback()
-							raise
-				except sqlite3.Error as e:
-					self.logError(f'Something went wrong creating database table **{fullTableName}** for component **{callerName}**. The query was "{query}": {e}.')
-					continue
 
-				try:
-					cursor.execute(f'PRAGMA table_info({fullTableName})')
-					rows = cursor.fetchall()
-					installedColumns = {x[1]: x[2] for x in rows}
-
-					cols = dict()
-					for column in schema[tableName]:
-						colName: str = column.split(' ')[0]
-						if colName.lower().startswith('unique'):
-							continue
+					except sqlite3.Error as e:
+						self.logError(f'Something went wrong initializing database for skill {callerName}: {e}')
+						database.rollback()
+						raise Exception
 
-						colType = column.split(' ')[1]
-						cols[colName] = colType
-						if colName not in installedColumns:
-							oldColName = [val for val in installedColumns if colName.casefold() == val.casefold()]
-							if oldColName:
-								self.logWarning(f'Found a case-changed column from **{oldColName[0]}** to **{colName}** for table **{fullTableName}** in component **{callerName}**')
-								cursor.execute(f'ALTER TABLE {fullTableName} RENAME COLUMN {oldColName[0]} TO {colName}')
-							else:
-								self.logWarning(f'Found a missing column **{colName}** for table **{fullTableName}** in component **{callerName}**')
-								cursor.execute(f'ALTER TABLE {fullTableName} ADD COLUMN {colName} {colType}')
+				self.fetchTables()
 
-					database.commit()
-				except sqlite3.Error as e:
-					self.logError(f'Failed altering table **{fullTableName}** for component **{callerName}**: {e}')
-					database.rollback()
-					raise Exception
+				# Let's check if we did not drop a table since an older version
+				for tableName in self._tables:
+					tableName = tableName['name']
+					if not tableName.startswith('sqlite_') and tableName.startswith(callerName + '_') and tableName.split('_')[1] not in schema:
+						self.logWarning(f'Found a deprecated table **{tableName}** for component **{callerName}**')
 
-				try:
-					cursor.execute(f'PRAGMA table_info({fullTableName})')
-					rows = cursor.fetchall()
-					installedColumns = {x[1]: x[2] for x in rows}
-
-					doUpdate = False
-					for column in installedColumns:
-						if column not in cols:
-							self.logInfo(f'Found a deprecated column **{column}** for table **{fullTableName}** in component **{callerName}**')
-							doUpdate = True
-						elif installedColumns[column].lower() != cols[column].lower():
-							self.logInfo(f'Column **{column}** has changed data type for component **{callerName}**')
-							doUpdate = True
-
-					if doUpdate:
-						cursor.execute(f"ALTER TABLE {fullTableName} RENAME TO {'bak_' + fullTableName}")
-						cursor.execute(f'CREATE TABLE {fullTableName} ({colsQuery})')
-						cursor.execute(f"INSERT INTO {fullTableName} SELECT {', '.join(cols)} FROM {'bak_' + fullTableName}")
-						cursor.execute(f"DROP TABLE {'bak_' + fullTableName}")
-						database.commit()
+						try:
+							cursor.execute(f'DROP TABLE {tableName}')
+							database.commit()
+						except sqlite3.Error as e:
+							self.logError(f'Failed dropping deprecated table **{tableName}** for component **{callerName}**: {e}')
+							continue
+			except:
+				ret = False
+			finally:
+				self._release(database, cursor)
+			return ret
 
-				except sqlite3.Error as e:
-					self.logError(f'Something went wrong initializing database for skill {callerName}: {e}')
-					database.rollback()
-					raise Exception
 
-			self.fetchTables()
+	def createIndex(self, tableName: str, indexName: str, columns: List[str], callerName: str) -> bool:
+		"""
+		Creates an index on the given table, if it does not exist yet
+		:param tableName:
+		:param indexName: Unique per table
+		:param columns: The indexed columns, in order
+		:param callerName:
+		:return:
+		"""
+		with self._pool.writeLock:
+			database = self.getConnection(write=True)
+			ret = True
 
-			# Let's check if we did not drop a table since an older version
-			for tableName in self._tables:
-				tableName = tableName['name']
-				if not tableName.startswith('sqlite_') and tableName.startswith(callerName + '_') and tableName.split('_')[1] not in schema:
-					self.logWarning(f'Found a deprecated table **{tableName}** for component **{callerName}**')
+			try:
+				database.execute(f'CREATE INDEX IF NOT EXISTS {callerName}_{tableName}_{indexName} ON {callerName}_{tableName} ({", ".join(columns)})')
+				database.commit()
+			except sqlite3.Error as e:
+				self.logError(f'Failed creating index **{indexName}** on table **{tableName}** for component **{callerName}**: {e}')
+				ret = False
+			finally:
+				self._release(database)
 
-					try:
-						cursor.execute(f'DROP TABLE {tableName}')
-						database.commit()
-					except sqlite3.Error as e:
-						self.logError(f'Failed dropping deprecated table **{tableName}** for component **{callerName}**: {e}')
-						continue
-		except:
-			ret = False
-		finally:
-			cursor.close()
-			database.close()
 		return ret
 
 
 	def dropTable(self, tableName: str, callerName: str) -> bool:
-		database = self.getConnection()
-		cursor = database.cursor()
-		ret = True
+		with self._pool.writeLock:
+			database = self.getConnection(write=True)
+			cursor = database.cursor()
+			ret = True
 
-		try:
-			cursor.execute(f'DROP TABLE {callerName}_{tableName}')
-			database.commit()
-		except sqlite3.Error as e:
-			self.logError(f'Failed dropping table **{tableName}** for component **{callerName}**: {e}')
-			ret = False
-		finally:
 			try:
-				cursor.close()
-				database.close()
-			except:
-				pass  # Well, what's to do here....
+				cursor.execute(f'DROP TABLE {callerName}_{tableName}')
+				database.commit()
+			except sqlite3.Error as e:
+				self.logError(f'Failed dropping table **{tableName}** for component **{callerName}**: {e}')
+				ret = False
+			finally:
+				self._release(database, cursor)
 
 		return ret
 
@@ -244,38 +301,36 @@ class DatabaseManager(Manager):
 		if not query:
 			raise InvalidQuery
 
-		database = self.getConnection()
-		cursor = database.cursor()
-		exception = None
-		insertId = None
+		with self._pool.writeLock:
+			database = self.getConnection(write=True)
+			cursor = database.cursor()
+			exception = None
+			insertId = None
 
-		try:
 			try:
-				startTime = time.time()
-				cursor.execute(query, values)
-				insertId = cursor.lastrowid
-			except DbConnectionError as e:
-				self.logWarning(f'Error inserting data for component **{callerName}** in table **{tableName}**: {e}')
-				raise
-			except sqlite3.Error as e:
-				self.logWarning(f'Error inserting data for component **{callerName}** in table **{tableName}**: {e}')
-				database.rollback()
-				raise
-			else:
-				database.commit()
-				if self.ConfigManager.getAliceConfigByName('databaseProfiling'):
-					self.logDebug(f'It took {time.time() - startTime} seconds to INSERT {tableName} DB ')
-		except Exception as e:
-			exception = e
+				try:
+					startTime = time.time()
+					cursor.execute(query, values)
+					insertId = cursor.lastrowid
+				except DbConnectionError as e:
+					self.logWarning(f'Error inserting data for component **{callerName}** in table **{tableName}**: {e}')
+					raise
+				except sqlite3.Error as e:
+					self.logWarning(f'Error inserting data for component **{callerName}** in table **{tableName}**: {e}')
+					database.rollback()
+					raise
+				else:
+					database.commit()
+					if self.ConfigManager.getAliceConfigByName('databaseProfiling'):
+						self.logDebug('It took {} seconds to INSERT {} DB ', time.time() - startTime, tableName)
+			except Exception as e:
+				exception = e
 
-		try:
-			cursor.close()
-		except Exception as e:
-			self.logError(f'FATAL ERROR: {e}')
-		try:
-			database.close()
-		except Exception as e:
-			self.logError(f'FATAL ERROR: {e}')
+			try:
+				cursor.close()
+			except Exception as e:
+				self.logError(f'FATAL ERROR: {e}')
+			self._release(database)
 
 		if insertId is not None and not exception:
 			return insertId
@@ -285,6 +340,44 @@ class DatabaseManager(Manager):
 			raise exception
 
 
+	def insertMany(self, tableName: str, query: str, callerName: str = None, values: List[dict] = None) -> int:
+		"""
+		Insert many rows in one transaction
+		:param tableName:
+		:param query: The insert query, with named parameters
+		:param callerName:
+		:param values: One dict of values per row
+		:return: The number of inserted rows
+		"""
+		if not values:
+			return 0
+
+		if not callerName:
+			callerName = self.Commons.getFunctionCaller()
+
+		query = self.basicChecks(tableName, query, callerName, values[0])
+		if not query:
+			raise InvalidQuery
+
+		with self._pool.writeLock:
+			database = self.getConnection(write=True)
+			cursor = database.cursor()
+
+			try:
+				startTime = time.time()
+				cursor.executemany(query, values)
+				database.commit()
+				if self.ConfigManager.getAliceConfigByName('databaseProfiling'):
+					self.logDebug('It took {} seconds to INSERT {} rows in {} DB ', time.time() - startTime, len(values), tableName)
+			except (DbConnectionError, sqlite3.Error) as e:
+				self.logWarning(f'Error inserting data for component **{callerName}** in table **{tableName}**: {e}')
+				raise
+			finally:
+				self._release(database, cursor)
+
+		return len(values)
+
+
 	def update(self, tableName: str, callerName: str, values: dict = None, query: str = None, row: tuple = None) -> bool:
 		if not query and not values:
 			self.logWarning('Cannot update database with neither query or values set')
@@ -298,29 +391,26 @@ class DatabaseManager(Manager):
 		if not query:
 			raise InvalidQuery
 
-		database = self.getConnection()
-		cursor = database.cursor()
-		ret = True
+		with self._pool.writeLock:
+			database = self.getConnection(write=True)
+			cursor = database.cursor()
+			ret = True
 
-		try:
 			try:
-				startTime = time.time()
-				cursor.execute(query, values)
-			except (DbConnectionError, sqlite3.Error) as e:
-				self.logWarning(f'Error updating data for component **{callerName}** in table **{tableName}**: {e}')
-				raise
-			else:
-				database.commit()
-				if self.ConfigManager.getAliceConfigByName('databaseProfiling'):
-					self.logDebug(f'It took {time.time() - startTime} seconds to UPDATE to {tableName} DB ')
-		except:
-			ret = False
-		finally:
-			try:
-				cursor.close()
-				database.close()
+				try:
+					startTime = time.time()
+					cursor.execute(query, values)
+				except (DbConnectionError, sqlite3.Error) as e:
+					self.logWarning(f'Error updating data for component **{callerName}** in table **{tableName}**: {e}')
+					raise
+				else:
+					database.commit()
+					if self.ConfigManager.getAliceConfigByName('databaseProfiling'):
+						self.logDebug('It took {} seconds to UPDATE to {} DB ', time.time() - startTime, tableName)
 			except:
-				pass  # what else is there to do??
+				ret = False
+			finally:
+				self._release(database, cursor)
 
 		return ret
 
@@ -342,7 +432,7 @@ class DatabaseManager(Manager):
 		if not query:
 			return rows
 
-		database = self.getConnection()
+		database = self.getConnection(write=False)
 		cursor = database.cursor()
 
 		try:
@@ -352,15 +442,11 @@ class DatabaseManager(Manager):
 				rows.append(self.Commons.dictFromRow(row))
 
 			if self.ConfigManager.getAliceConfigByName('databaseProfiling'):
-				self.logDebug(f'It took {time.time() - startTime} seconds to FETCH from {tableName} DB ')
+				self.logDebug('It took {} seconds to FETCH from {} DB ', time.time() - startTime, tableName)
 		except (DbConnectionError, sqlite3.Error) as e:
 			self.logWarning(f'Error fetching data for component **{callerName}** in table **{tableName}**: {e}')
 		finally:
-			try:
-				cursor.close()
-				database.close()
-			except:
-				pass  # Well, what's to do here....
+			self._release(database, cursor)
 
 		return rows
 
@@ -383,23 +469,21 @@ class DatabaseManager(Manager):
 		if not query:
 			return
 
-		database = self.getConnection()
-		try:
-			startTime = time.time()
-			database.execute(query, values)
-			database.commit()
-			if self.ConfigManager.getAliceConfigByName('databaseProfiling'):
-				self.logDebug(f'It took {time.time() - startTime} seconds to DELETE in {tableName} DB ')
-		except DbConnectionError as e:
-			self.logWarning(f'Error deleting from table **{tableName}** for component **{callerName}**: {e}')
-		except sqlite3.Error as e:
-			self.logWarning(f'Error deleting from table **{tableName}** for component **{callerName}**: {e}')
-			database.rollback()
-
-		try:
-			database.close()
-		except:
-			pass  # Well, what's to do here....
+		with self._pool.writeLock:
+			database = self.getConnection(write=True)
+			try:
+				startTime = time.time()
+				database.execute(query, values)
+				database.commit()
+				if self.ConfigManager.getAliceConfigByName('databaseProfiling'):
+					self.logDebug('It took {} seconds to DELETE in {} DB ', time.time() - startTime, tableName)
+			except DbConnectionError as e:
+				self.logWarning(f'Error deleting from table **{tableName}** for component **{callerName}**: {e}')
+			except sqlite3.Error as e:
+				self.logWarning(f'Error deleting from table **{tableName}** for component **{callerName}**: {e}')
+				database.rollback()
+			finally:
+				self._release(database)
 
 
 	# noinspection SqlResolve
@@ -416,20 +500,21 @@ class DatabaseManager(Manager):
 		if not query:
 			return
 
-		database = self.getConnection()
-		try:
-			startTime = time.time()
-			database.execute(query)
-			database.commit()
-			if self.ConfigManager.getAliceConfigByName('databaseProfiling'):
-				self.logDebug(f'It took {time.time() - startTime} seconds to PRUNE {tableName} DB ')
-		except DbConnectionError as e:
-			self.logWarning(f'Error pruning table **{tableName}** for component **{callerName}**: {e}')
-		except sqlite3.Error as e:
-			self.logWarning(f'Error pruning table **{tableName}** for component **{callerName}**: {e}')
-			database.rollback()
-		finally:
-			database.close()
+		with self._pool.writeLock:
+			database = self.getConnection(write=True)
+			try:
+				startTime = time.time()
+				database.execute(query)
+				database.commit()
+				if self.ConfigManager.getAliceConfigByName('databaseProfiling'):
+					self.logDebug('It took {} seconds to PRUNE {} DB ', time.time() - startTime, tableName)
+			except DbConnectionError as e:
+				self.logWarning(f'Error pruning table **{tableName}** for component **{callerName}**: {e}')
+			except sqlite3.Error as e:
+				self.logWarning(f'Error pruning table **{tableName}** for component **{callerName}**: {e}')
+				database.rollback()
+			finally:
+				self._release(database)
 
 
 	def basicChecks(self, tableName: str, query: str, callerName: str, values: dict = None) -> Optional[str]:
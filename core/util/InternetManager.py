@@ -56,7 +56,7 @@ class InternetManager(Manager):
 
 	def checkInternet(self):
 		self.checkOnlineState()
-		self.ThreadManager.doLater(interval=self._checkFrequency, func=self.checkInternet)
+		self.ThreadManager.doLater(interval=self._checkFrequency, func=self.checkInternet, pool='io')
 
 
 	def checkOnlineState(self, addr: str = 'https://api.projectalice.io/generate_204', silent: bool = False) -> bool:
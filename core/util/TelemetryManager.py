@@ -17,17 +17,65 @@
 #
 #  Last modified: 2021.04.13 at 12:56:48 CEST
 
+import threading
 import time
-from typing import List
+from typing import Dict, List, Optional, Union
 
 from core.base.model.Manager import Manager
+from core.util.model.WorkerPool import WorkerPool
 from core.util.model.TelemetryData import TelemetryData
+from core.util.model.TelemetryStore import TelemetryStore
 from core.util.model.TelemetryType import TelemetryType
 
 
 class TelemetryManager(Manager):
+	# Stored samples are written in batches, when this many are waiting or after FLUSH_INTERVAL seconds
+	FLUSH_SIZE = 250
+	FLUSH_INTERVAL = 5
+	# Samples that failed to store are retried on the next flush, the oldest being dropped past this many waiting
+	MAX_BUFFER = 5000
+
+	INSERT_QUERY = 'INSERT INTO :__table__ (type, value, service, deviceId, timestamp, locationId) VALUES (:type, :value, :service, :deviceId, :timestamp, :locationId)'
+
+	# Numeric samples are also aggregated per minute, hour and day. Rollup table: bucket size in seconds
+	ROLLUPS = {
+		'telemetryMinute': 60,
+		'telemetryHour'  : 3600,
+		'telemetryDay'   : 86400
+	}
+
+	# Rollup table: how long its buckets are kept, in seconds
+	ROLLUP_RETENTION = {
+		'telemetryMinute': 86400 * 14,
+		'telemetryHour'  : 86400 * 365,
+		'telemetryDay'   : 86400 * 3650
+	}
+
+	ROLLUP_QUERY = 'INSERT INTO :__table__ (type, service, deviceId, locationId, bucket, minimum, maximum, total, count) ' \
+	               'VALUES (:type, :service, :deviceId, :locationId, :bucket, :minimum, :maximum, :total, :count) ' \
+	               'ON CONFLICT (type, service, deviceId, locationId, bucket) DO UPDATE SET ' \
+	               'minimum = min(minimum, excluded.minimum), maximum = max(maximum, excluded.maximum), total = total + excluded.total, count = count + excluded.count'
+
+	# Charts get at most this many points per series unless asked otherwise
+	DEFAULT_POINTS = 500
+	# Used to guess how many raw samples a time window holds
+	ESTIMATED_SAMPLE_INTERVAL = 10
+
+	ROLLUP_SCHEMA = [
+		'id integer PRIMARY KEY',
+		'type TEXT NOT NULL UNIQUE',
+		'service TEXT NOT NULL UNIQUE',
+		'deviceId INTEGER NOT NULL UNIQUE',
+		'locationId INTEGER NOT NULL UNIQUE',
+		'bucket INTEGER NOT NULL UNIQUE',
+		'minimum REAL NOT NULL',
+		'maximum REAL NOT NULL',
+		'total REAL NOT NULL',
+		'count INTEGER NOT NULL'
+	]
+
 	DATABASE = {
-		'telemetry': [
+		'telemetry'      : [
 			'id integer PRIMARY KEY',
 			'type TEXT NOT NULL',
 			'value TEXT NOT NULL',
@@ -35,7 +83,10 @@ class TelemetryManager(Manager):
 			'deviceId INTEGER NOT NULL',
 			'locationId INTEGER NOT NULL',
 			'timestamp INTEGER NOT NULL'
-		]
+		],
+		'telemetryMinute': ROLLUP_SCHEMA,
+		'telemetryHour'  : ROLLUP_SCHEMA,
+		'telemetryDay'   : ROLLUP_SCHEMA
 	}
 
 	TELEMETRY_MAPPINGS = {
@@ -79,7 +130,21 @@ class TelemetryManager(Manager):
 	def __init__(self):
 		super().__init__(databaseSchema=self.DATABASE)
 		self._data = list()
-		self._currentValues: List[TelemetryData] = list()
+		self._currentValues = TelemetryStore()
+
+		self._buffer: List[dict] = list()
+		self._bufferLock = threading.Lock()
+		self._flushLock = threading.Lock()
+		self._flushTimer: Optional[threading.Timer] = None
+		self._flushStats = {
+			'flushes'         : 0,
+			'flushedRows'     : 0,
+			'failedRows'      : 0,
+			'droppedRows'     : 0,
+			'lastFlushSize'   : 0,
+			'lastFlushLatency': 0.0,
+			'maxFlushLatency' : 0.0
+		}
 
 
 	def onStart(self):
@@ -88,19 +153,169 @@ class TelemetryManager(Manager):
 			self._isActive = False
 			self.logInfo('Data storing is disabled')
 		else:
+			self.createIndexes()
 			self.loadData()
+			self.backfillRollups()
+
+
+	def onStop(self):
+		super().onStop()
+		self.flush()
 
 
 	def onQuarterHour(self):
-		if self.ConfigManager.getAliceConfigByName('autoPruneStoredData') > 0 and self._isActive:
+		if not self._isActive:
+			return
+
+		if self.ConfigManager.getAliceConfigByName('autoPruneStoredData') > 0:
+			self.flush()
 			self.pruneTable('telemetry')
 
+		self.pruneRollups()
+
+
+	# noinspection SqlResolve
+	def pruneRollups(self):
+		"""
+		Removes the rollup buckets older than the retention of their resolution
+		:return:
+		"""
+		now = time.time()
+		for tableName, retention in self.ROLLUP_RETENTION.items():
+			self.DatabaseManager.delete(
+				tableName=tableName,
+				callerName=self.name,
+				query='DELETE FROM :__table__ WHERE bucket < :oldest',
+				values={'oldest': int(now - retention)}
+			)
+
+
+	def createIndexes(self):
+		# Covers the history and current value lookups
+		self.databaseCreateIndex(tableName='telemetry', indexName='history', columns=['type', 'deviceId', 'locationId', 'timestamp'])
+		self.databaseCreateIndex(tableName='telemetry', indexName='current', columns=['service', 'deviceId', 'locationId', 'type'])
+		for tableName in self.ROLLUPS:
+			self.databaseCreateIndex(tableName=tableName, indexName='history', columns=['type', 'deviceId', 'locationId', 'bucket', 'minimum', 'maximum', 'total', 'count'])
+
+
+	# noinspection SqlResolve
+	def backfillRollups(self):
+		"""
+		Builds the rollups from the raw samples in the background if they are empty, as they are after upgrading
+		:return:
+		"""
+		if any(self.databaseFetch(tableName=tableName, query='SELECT id FROM :__table__ LIMIT 1') for tableName in self.ROLLUPS):
+			return
+
+		# Samples stored from now on are rolled up when flushed, the backfill must stop before them
+		rows = self.databaseFetch(tableName='telemetry', query='SELECT max(id) AS maxId FROM :__table__')
+		maxId = rows[0]['maxId'] if rows else None
+		if not maxId:
+			return
+
+		self.ThreadManager.submit(func=self._backfillRollups, pool='io', priority=WorkerPool.PRIORITY_LOW, args=[maxId])
+
+
+	def _backfillRollups(self, maxId: int, chunkSize: int = 10000):
+		"""
+		Rolls up the raw samples up to the given id, chunk by chunk
+		:param maxId: The last sample to roll up
+		:param chunkSize: How many raw samples are read at once
+		:return:
+		"""
+		lastId = 0
+		total = 0
+		while True:
+			# noinspection SqlResolve
+			rows = self.databaseFetch(
+				tableName='telemetry',
+				query='SELECT * FROM :__table__ WHERE id > :lastId AND id <= :maxId ORDER BY id LIMIT :limit',
+				values={'lastId': lastId, 'maxId': maxId, 'limit': chunkSize}
+			)
+			if not rows:
+				break
+
+			lastId = rows[-1]['id']
+			total += len(rows)
+			self.storeRollups(rows)
+
+		if total:
+			self.logInfo(f'Built telemetry rollups from {total} stored samples')
+
+
+	@classmethod
+	def aggregate(cls, rows: List[dict]) -> Dict[str, List[dict]]:
+		"""
+		Aggregates the numeric samples of the given rows per rollup bucket
+		:param rows: Raw telemetry rows
+		:return: Rollup table name: rows to merge into it
+		"""
+		buckets = {tableName: dict() for tableName in cls.ROLLUPS}
+		for row in rows:
+			try:
+				value = float(row['value'])
+			except (TypeError, ValueError):
+				continue
+
+			for tableName, seconds in cls.ROLLUPS.items():
+				bucket = int(row['timestamp']) // seconds * seconds
+				key = (row['type'], row['service'], row['deviceId'], row['locationId'], bucket)
+				aggregate = buckets[tableName].get(key, None)
+				if not aggregate:
+					buckets[tableName][key] = {
+						'type'      : row['type'],
+						'service'   : row['service'],
+						'deviceId'  : row['deviceId'],
+						'locationId': row['locationId'],
+						'bucket'    : bucket,
+						'minimum'   : value,
+						'maximum'   : value,
+						'total'     : value,
+						'count'     : 1
+					}
+				else:
+					aggregate['minimum'] = min(aggregate['minimum'], value)
+					aggregate['maximum'] = max(aggregate['maximum'], value)
+					aggregate['total'] += value
+					aggregate['count'] += 1
+
+		return {tableName: list(aggregates.values()) for tableName, aggregates in buckets.items()}
+
+
+	def storeRollups(self, rows: List[dict]):
+		for tableName, aggregates in self.aggregate(rows).items():
+			self.databaseInsertMany(tableName=tableName, query=self.ROLLUP_QUERY, values=aggregates)
+
+
+	@classmethod
+	def selectResolution(cls, historyFrom: int, historyTo: int = None, points: int = None) -> Optional[str]:
+		"""
+		Picks the finest resolution that fits the time window in the given amount of points
+		:param historyFrom:
+		:param historyTo: Defaults to now
+		:param points:
+		:return: The rollup table name or None for raw samples
+		"""
+		points = points or cls.DEFAULT_POINTS
+		window = (historyTo or time.time()) - historyFrom
+
+		if window / cls.ESTIMATED_SAMPLE_INTERVAL <= points:
+			return None
+
+		for tableName, seconds in cls.ROLLUPS.items():
+			if window / seconds <= points:
+				return tableName
+
+		return list(cls.ROLLUPS)[-1]
+
 
 	def loadData(self):
 		if not self._isActive:
 			return
 
-		self._currentValues = [TelemetryData(val) for val in self.getDistinct()]
+		self._currentValues.clear()
+		for row in self.getDistinct():
+			self._currentValues.add(TelemetryData(row))
 
 
 	def currentValue(self, ttype: TelemetryType, value: str, service: str, deviceId: int, timestamp=None, locationId: int = None) -> bool:
@@ -114,26 +329,7 @@ class TelemetryManager(Manager):
 		:param locationId:
 		:return:
 		"""
-		match = None
-		for current in self._currentValues:
-			if current.type == ttype and current.service == service and current.deviceId == deviceId and current.locationId == locationId:
-				match = current
-		if match:
-			if match.timestamp == timestamp and match.value == value:
-				# skip exact duplicates
-				return False
-			else:
-				match.timestamp = timestamp
-				match.value = value
-				return True
-		else:
-			self._currentValues.append(TelemetryData({'type'      : ttype,
-			                                          'value'     : value,
-			                                          'service'   : service,
-			                                          'deviceId'  : deviceId,
-			                                          'timestamp' : timestamp,
-			                                          'locationId': locationId}))
-			return True
+		return self._currentValues.update(ttype=ttype, value=value, service=service, deviceId=deviceId, timestamp=timestamp, locationId=locationId)
 
 
 	# noinspection SqlResolve
@@ -158,11 +354,7 @@ class TelemetryManager(Manager):
 		if not self.currentValue(ttype, value, service, deviceId, timestamp, locationId):
 			return False
 
-		self.databaseInsert(
-			tableName='telemetry',
-			query='INSERT INTO :__table__ (type, value, service, deviceId, timestamp, locationId) VALUES (:type, :value, :service, :deviceId, :timestamp, :locationId)',
-			values={'type': ttype.value, 'value': value, 'service': service, 'deviceId': deviceId, 'timestamp': round(timestamp), 'locationId': locationId}
-		)
+		self.queueData({'type': ttype.value, 'value': value, 'service': service, 'deviceId': deviceId, 'timestamp': round(timestamp), 'locationId': locationId})
 
 		telemetrySkill = self.SkillManager.getSkillInstance('Telemetry')
 		messages = self.TELEMETRY_MAPPINGS.get(ttype, dict())
@@ -187,7 +379,120 @@ class TelemetryManager(Manager):
 		return True
 
 
-	def getData(self, ttype: TelemetryType = None, deviceId: str = None, service: str = None, locationId: int = None, historyFrom: int = None, historyTo: int = None, everything: bool = False) -> List:
+	def queueData(self, values: dict):
+		"""
+		Adds a sample to the write behind buffer, flushing it if full or arming the flush timer if it was empty
+		:param values: The row to insert
+		:return:
+		"""
+		with self._bufferLock:
+			self._buffer.append(values)
+			depth = len(self._buffer)
+			if depth == 1 and not self._flushTimer:
+				self._flushTimer = self.ThreadManager.newTimer(interval=self.FLUSH_INTERVAL, func=self.flush)
+
+		if depth >= self.FLUSH_SIZE:
+			self.flush()
+
+
+	def flush(self):
+		"""
+		Writes the buffered samples to the database in one transaction
+		:return:
+		"""
+		with self._flushLock:
+			with self._bufferLock:
+				rows = self._buffer
+				self._buffer = list()
+				if self._flushTimer:
+					self._flushTimer.cancel()
+					self._flushTimer = None
+
+			if not rows:
+				return
+
+			startTime = time.time()
+			try:
+				self.databaseInsertMany(tableName='telemetry', query=self.INSERT_QUERY, values=rows)
+			except Exception as e:
+				self._flushStats['failedRows'] += len(rows)
+				self.logError(f'Failed storing {len(rows)} telemetry samples, retrying later: {e}')
+				self._requeue(rows)
+				return
+
+			try:
+				self.storeRollups(rows)
+			except Exception as e:
+				self.logError(f'Failed updating telemetry rollups: {e}')
+
+			latency = time.time() - startTime
+			self._flushStats['flushes'] += 1
+			self._flushStats['flushedRows'] += len(rows)
+			self._flushStats['lastFlushSize'] = len(rows)
+			self._flushStats['lastFlushLatency'] = latency
+			self._flushStats['maxFlushLatency'] = max(latency, self._flushStats['maxFlushLatency'])
+
+
+	def _requeue(self, rows: List[dict]):
+		"""
+		Puts samples that failed to store back at the head of the buffer and arms the flush timer to retry them
+		:param rows:
+		:return:
+		"""
+		with self._bufferLock:
+			self._buffer = rows + self._buffer
+			overflow = len(self._buffer) - self.MAX_BUFFER
+			if overflow > 0:
+				self._buffer = self._buffer[overflow:]
+				self._flushStats['droppedRows'] += overflow
+				self.logWarning(f'Telemetry buffer full, dropped {overflow} samples')
+
+			if not self._flushTimer:
+				self._flushTimer = self.ThreadManager.newTimer(interval=self.FLUSH_INTERVAL, func=self.flush)
+
+
+	@property
+	def bufferStats(self) -> Dict[str, Union[int, float]]:
+		"""
+		Write behind buffer figures: the number of samples waiting and how long the flushes take, in seconds
+		:return:
+		"""
+		return {
+			'queueDepth': len(self._buffer),
+			**self._flushStats
+		}
+
+
+	def getData(self, ttype: TelemetryType = None, deviceId: str = None, service: str = None, locationId: int = None, historyFrom: int = None, historyTo: int = None, everything: bool = False, points: int = None, resolution: str = None) -> List:
+		"""
+		Returns the stored telemetry. History queries are served from the rollups when the window holds more samples than the point budget
+		:param ttype:
+		:param deviceId:
+		:param service:
+		:param locationId:
+		:param historyFrom:
+		:param historyTo:
+		:param everything: If no history window is given, return every sample instead of the last one
+		:param points: Point budget per series for history queries
+		:param resolution: Force 'raw', 'minute', 'hour' or 'day' instead of choosing from the point budget
+		:return:
+		"""
+		self.flush()
+
+		if historyFrom:
+			if resolution:
+				tableName = None if resolution == 'raw' else f'telemetry{resolution.title()}'
+				if tableName is not None and tableName not in self.ROLLUPS:
+					raise ValueError(f'Unknown telemetry resolution {resolution}')
+			else:
+				tableName = self.selectResolution(historyFrom=int(historyFrom), historyTo=int(historyTo) if historyTo else None, points=points)
+
+			if tableName:
+				rows = self.getRollup(tableName=tableName, ttype=ttype, deviceId=deviceId, service=service, locationId=locationId, historyFrom=historyFrom, historyTo=historyTo)
+				# Non numeric telemetry has no rollups
+				if rows:
+					return rows
+
 		values = dict()
 		if ttype:
 			values['type'] = ttype.value
@@ -217,7 +522,41 @@ class TelemetryManager(Manager):
 		)
 
 
+	def getRollup(self, tableName: str, ttype: TelemetryType = None, deviceId: str = None, service: str = None, locationId: int = None, historyFrom: int = None, historyTo: int = None) -> List:
+		values = dict()
+		if ttype:
+			values['type'] = ttype.value
+		if locationId:
+			values['locationId'] = locationId
+		if deviceId:
+			values['deviceId'] = deviceId
+		if service:
+			values['service'] = service
+
+		dynWhere = [f'{col} = :{col}' for col in values.keys()]
+
+		if historyTo:
+			values['historyTo'] = int(historyTo)
+			dynWhere.append('bucket <= :historyTo')
+		if historyFrom:
+			values['historyFrom'] = int(historyFrom) // self.ROLLUPS[tableName] * self.ROLLUPS[tableName]
+			dynWhere.append('bucket >= :historyFrom')
+
+		where = f' WHERE {" and ".join(dynWhere)}' if dynWhere else ''
+
+		# noinspection SqlResolve
+		query = f'SELECT type, service, deviceId, locationId, bucket AS timestamp, total / count AS value, minimum AS min, maximum AS max, count FROM :__table__{where} ORDER BY `bucket` DESC'
+
+		return self.databaseFetch(
+			tableName=tableName,
+			query=query,
+			values=values
+		)
+
+
 	def getDistinct(self, ttype: TelemetryType = None, deviceId: str = None, service: str = None, locationId: int = None) -> List:
+		self.flush()
+
 		values = dict()
 		if ttype:
 			values['type'] = ttype.value
@@ -247,7 +586,7 @@ class TelemetryManager(Manager):
 		)
 
 
-	def getAllCombinationsForAPI(self):
-		llist = [val.forApi() for val in self._currentValues]
+	def getAllCombinationsForAPI(self, ttype: TelemetryType = None, locationId: int = None) -> List[dict]:
+		llist = [val.forApi() for val in self._currentValues.find(ttype=ttype, locationId=locationId)]
 		llist = [l for l in llist if l is not None]  # workaround until obsolete telemetry is purged
 		return llist
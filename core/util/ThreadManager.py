@@ -17,32 +17,56 @@
 #
 #  Last modified: 2021.04.13 at 12:56:48 CEST
 
+import os
 import threading
-from typing import Callable, Union
+from concurrent.futures import Future
+from typing import Callable, Dict, Optional, Union
 
 from core.base.model.Manager import Manager
 from core.util.Decorators import IfSetting
 from core.util.model.AliceEvent import AliceEvent
 from core.util.model.MemoryProfiler import MemoryProfiler
 from core.util.model.ThreadTimer import ThreadTimer
+from core.util.model.TimerScheduler import TimerScheduler
+from core.util.model.WorkerPool import WorkerPool
 
 
 class ThreadManager(Manager):
 
+	# name: (max workers, queue size)
+	POOLS = {
+		'cpu'  : (os.cpu_count() or 1, 64),
+		'io'   : (16, 256),
+		'audio': (8, 64)
+	}
+
+
 	def __init__(self):
 		super().__init__()
 
-		self._timers = list()
+		self._scheduler = TimerScheduler()
+		self._pools: Dict[str, WorkerPool] = {name: WorkerPool(name=name, maxWorkers=workers, queueSize=queueSize) for name, (workers, queueSize) in self.POOLS.items()}
 		self._threads = dict()
 		self._events = dict()
 		self._memProfiler = MemoryProfiler()
 
 
+	def onStart(self):
+		super().onStart()
+		self._scheduler.start()
+
+		# Pools are shut down for good when stopping, replace them on restart
+		for name, pool in self._pools.copy().items():
+			if pool.isShutdown:
+				self._pools[name] = WorkerPool(name=name, maxWorkers=pool.maxWorkers, queueSize=pool.queueSize)
+
+
 	def onStop(self):
 		super().onStop()
-		for timer in self._timers:
-			if timer.timer.isAlive():
-				timer.timer.cancel()
+		self._scheduler.stop()
+
+		for pool in self._pools.values():
+			pool.shutdown()
 
 		for thread in self._threads.values():
 			if thread.isAlive():
@@ -65,36 +89,37 @@ class ThreadManager(Manager):
 
 
 	def onQuarterHour(self):
-		deadTimers = 0
 		deadThreads = 0
-		timers = self._timers.copy()
-		for threadTimer in timers:
-			if not threadTimer.timer.isAlive():
-				self._timers.remove(threadTimer)
-				deadTimers += 1
-
 		threads = self._threads.copy()
 		for threadName, thread in threads.items():
 			if not thread.is_alive():
 				self._threads.pop(threadName, None)
 				deadThreads += 1
 
-		if deadTimers > 0:
-			self.logInfo(f'Cleaned {deadTimers} dead timer', 'timer')
-
 		if deadThreads > 0:
-			self.logInfo(f'Cleaned {deadThreads} dead thread', 'thread')
-
-
-	def newTimer(self, interval: float, func: Callable, autoStart: bool = True, args: list = None, kwargs: dict = None) -> threading.Timer:
-		args = args or list()
-		kwargs = kwargs or dict()
-
-		threadTimer = ThreadTimer(callback=func, args=args, kwargs=kwargs)
-		timer = threading.Timer(interval=interval, function=self.onTimerEnd, args=[threadTimer])
-		timer.daemon = True
-		threadTimer.timer = timer
-		self._timers.append(threadTimer)
+			self.logInfo(f'Cleaned {deadThreads} dead thread', plural='thread')
+
+
+	@property
+	def timerStats(self) -> dict:
+		return self._scheduler.stats
+
+
+	def newTimer(self, interval: float, func: Callable, autoStart: bool = True, args: list = None, kwargs: dict = None, pool: str = '') -> ThreadTimer:
+		"""
+		Calls a function once the interval elapsed
+		:param interval: In seconds
+		:param func:
+		:param autoStart:
+		:param args:
+		:param kwargs:
+		:param pool: If set, the timer only queues the call on this worker pool. Use it for callbacks that block, so they don't hold the timer workers
+		:return: The timer handle, that can be cancelled
+		"""
+		if pool:
+			timer = ThreadTimer(scheduler=self._scheduler, interval=interval, callback=self.submit, args=[func, pool], kwargs={'args': args, 'kwargs': kwargs})
+		else:
+			timer = ThreadTimer(scheduler=self._scheduler, interval=interval, callback=func, args=args, kwargs=kwargs)
 
 		if autoStart:
 			timer.start()
@@ -102,27 +127,48 @@ class ThreadManager(Manager):
 		return timer
 
 
-	def doLater(self, interval: float, func: Callable, args: list = None, kwargs: dict = None):
-		self.newTimer(interval=interval, func=func, args=args, kwargs=kwargs)
+	def doLater(self, interval: float, func: Callable, args: list = None, kwargs: dict = None, pool: str = ''):
+		self.newTimer(interval=interval, func=func, args=args, kwargs=kwargs, pool=pool)
 
 
-	def onTimerEnd(self, timer: ThreadTimer):
-		if not timer or not timer.callback:
+	def removeTimer(self, timer: ThreadTimer):
+		if not timer:
 			return
 
-		timer.callback(*timer.args, **timer.kwargs)
-		self.removeTimer(timer)
+		timer.cancel()
 
 
-	def removeTimer(self, timer: ThreadTimer):
-		if not timer or not timer.callback:
-			return
+	@property
+	def poolStats(self) -> Dict[str, dict]:
+		return {name: pool.stats for name, pool in self._pools.copy().items()}
+
+
+	def newPool(self, name: str, maxWorkers: int, queueSize: int = 0) -> WorkerPool:
+		if name in self._pools:
+			return self._pools[name]
+
+		self._pools[name] = WorkerPool(name=name, maxWorkers=maxWorkers, queueSize=queueSize)
+		return self._pools[name]
+
+
+	def getPool(self, name: str) -> Optional[WorkerPool]:
+		return self._pools.get(name, None)
+
 
-		if timer.timer.is_alive():
-			timer.timer.cancel()
+	def submit(self, func: Callable, pool: str = 'io', priority: int = WorkerPool.PRIORITY_NORMAL, args: list = None, kwargs: dict = None) -> Future:
+		"""
+		Runs a job on one of the bounded worker pools rather than on a thread of its own
+		:param func: The callable to run
+		:param pool: The pool name, cpu, io, audio or one created with newPool
+		:param priority: Jobs with a lower priority are picked first
+		:param args:
+		:param kwargs:
+		:return: A future resolving to the job result. Raises WorkerPoolFull if the pool queue is full
+		"""
+		if pool not in self._pools:
+			raise KeyError(f'Unknown worker pool {pool}')
 
-		if timer in self._timers:
-			self._timers.remove(timer)
+		return self._pools[pool].submit(func=func, args=args, kwargs=kwargs, priority=priority)
 
 
 	def newThread(self, name: str, target: Callable, autostart: bool = True, args: list = None, kwargs: dict = None) -> threading.Thread:
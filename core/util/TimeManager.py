@@ -19,6 +19,7 @@
 
 from datetime import datetime
 
+from core.ProjectAliceExceptions import WorkerPoolFull
 from core.base.model.Manager import Manager
 from core.commons import constants
 
@@ -38,7 +39,11 @@ class TimeManager(Manager):
 
 	def timerSignal(self, minutes: int, signal: str, running: bool = False):
 		if running:
-			self.broadcast(signal, exceptions=[self.name], propagateToSkills=True)
+			# Every manager and skill handles these, keep them off the timer workers
+			try:
+				self.ThreadManager.submit(func=self.broadcast, kwargs={'method': signal, 'exceptions': [self.name], 'propagateToSkills': True})
+			except (WorkerPoolFull, RuntimeError) as e:
+				self.logWarning(f'Skipped broadcasting {signal}: {e}')
 
 		minute = datetime.now().minute
 		second = datetime.now().second
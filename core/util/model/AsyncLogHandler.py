@@ -0,0 +1,111 @@
+#  Copyright (c) 2021
+#
+#  This file, AsyncLogHandler.py, is part of Project Alice.
+#
+#  Project Alice is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>
+#
+#  Last modified: 2026.10.18 at 20:43:34 CEST
+
+import logging
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+
+class _Listener(QueueListener):
+
+	def enqueue_sentinel(self):
+		# Wait for room rather than failing to stop when the queue is full
+		self.queue.put(self._sentinel)
+
+
+class AsyncLogHandler(QueueHandler):
+	"""
+	Queues log records for a background thread that hands them to the real handlers, so that logging
+	never waits on disk or network. When the queue is full, the oldest records are dropped
+	"""
+
+	CAPACITY = 10000
+
+
+	def __init__(self, *handlers: logging.Handler, capacity: int = CAPACITY):
+		super().__init__(queue.Queue(maxsize=capacity))
+		self._listener = _Listener(self.queue, *handlers, respect_handler_level=True)
+		self._running = False
+		self._dropLock = threading.Lock()
+		self._dropped = 0
+		self._unreported = 0
+
+
+	@property
+	def dropped(self) -> int:
+		return self._dropped
+
+
+	def addHandler(self, handler: logging.Handler):
+		self._listener.handlers = self._listener.handlers + (handler,)
+
+
+	def start(self):
+		if not self._running:
+			self._running = True
+			self._listener.start()
+
+
+	def stop(self):
+		"""
+		Stops the background thread once every queued record is handled
+		:return:
+		"""
+		if self._running:
+			self._running = False
+			self._reportDrops()
+			self._listener.stop()
+
+
+	def enqueue(self, record: logging.LogRecord):
+		try:
+			self.queue.put_nowait(record)
+		except queue.Full:
+			self._drop(record)
+			return
+
+		if self._unreported:
+			self._reportDrops()
+
+
+	def _reportDrops(self):
+		with self._dropLock:
+			dropped, self._unreported = self._unreported, 0
+
+		if not dropped:
+			return
+
+		warning = logging.makeLogRecord({'name': 'ProjectAlice', 'levelno': logging.WARNING, 'levelname': 'WARNING', 'msg': f'{"[Logger]":<35} Log queue overflowed, dropped {dropped} records'})
+		try:
+			self.queue.put_nowait(warning)
+		except queue.Full:
+			self._drop(warning)
+
+
+	def _drop(self, record: logging.LogRecord):
+		# Make room by dropping the oldest record, the newest ones tell more about what's going on now
+		with self._dropLock:
+			self._dropped += 1
+			self._unreported += 1
+			try:
+				self.queue.get_nowait()
+				self.queue.put_nowait(record)
+			except (queue.Empty, queue.Full):
+				pass
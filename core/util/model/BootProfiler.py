@@ -0,0 +1,127 @@
+#  Copyright (c) 2021
+#
+#  This file, BootProfiler.py, is part of Project Alice.
+#
+#  Project Alice is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>
+#
+#  Last modified: 2026.10.18 at 20:51:48 CEST
+
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import ContextManager, Dict, List
+
+from core.base.model.ProjectAliceObject import ProjectAliceObject
+
+
+class BootProfiler(ProjectAliceObject):
+	"""
+	Records wall and cpu time of the boot steps, managers and skills, when the alice.profile flag file exists.
+	The timeline is saved in the Chrome trace event format, open it with chrome://tracing or ui.perfetto.dev
+	"""
+
+	FLAG_FILE = Path('alice.profile')
+
+
+	def __init__(self):
+		super().__init__()
+		self._enabled = self.FLAG_FILE.exists()
+		self._origin = time.perf_counter()
+		self._lock = threading.Lock()
+		self._events: List[dict] = list()
+		self._threads: Dict[int, str] = dict()
+
+		if self._enabled:
+			self.logInfo('Flag file detected, profiling boot')
+
+
+	@property
+	def enabled(self) -> bool:
+		return self._enabled
+
+
+	def measure(self, name: str, category: str = 'boot', **kwargs) -> ContextManager:
+		"""
+		Times the code run in the returned context, does nothing if profiling is disabled
+		:param name: Name of the span on the timeline
+		:param category: Used to group or filter the spans, boot, manager or skill
+		:param kwargs: Extra information shown with the span
+		:return:
+		"""
+		if not self._enabled:
+			return nullcontext()
+
+		return self._span(name=name, category=category, args=kwargs)
+
+
+	@contextmanager
+	def _span(self, name: str, category: str, args: dict):
+		wallStart = time.perf_counter()
+		cpuStart = time.thread_time()
+		try:
+			yield
+		except Exception as e:
+			args['error'] = repr(e)
+			raise
+		finally:
+			cpu = time.thread_time() - cpuStart
+			wall = time.perf_counter() - wallStart
+			thread = threading.current_thread()
+
+			with self._lock:
+				self._threads[thread.ident] = thread.name
+				self._events.append({
+					'name': name,
+					'cat' : category,
+					'ph'  : 'X',
+					'ts'  : round((wallStart - self._origin) * 1000000),
+					'dur' : round(wall * 1000000),
+					'pid' : os.getpid(),
+					'tid' : thread.ident,
+					'args': {'cpuMs': round(cpu * 1000, 3), **args}
+				})
+
+
+	def save(self, path: Path) -> bool:
+		"""
+		Writes the recorded timeline and stops profiling, boot is over
+		:param path: The json file to write
+		:return: True if a timeline was written
+		"""
+		if not self._enabled:
+			return False
+
+		self._enabled = False
+		with self._lock:
+			events = [
+				{'name': 'process_name', 'ph': 'M', 'pid': os.getpid(), 'args': {'name': 'Project Alice'}},
+				*({'name': 'thread_name', 'ph': 'M', 'pid': os.getpid(), 'tid': tid, 'args': {'name': threadName}} for tid, threadName in self._threads.items()),
+				*sorted(self._events, key=lambda event: event['ts'])
+			]
+			self._events = list()
+			self._threads = dict()
+
+		try:
+			path.parent.mkdir(parents=True, exist_ok=True)
+			path.write_text(json.dumps({'traceEvents': events, 'displayTimeUnit': 'ms'}))
+		except Exception as e:
+			self.logError(f'Failed writing boot profile: {e}')
+			return False
+
+		self.logInfo(f'Boot profile written to {path}')
+		return True
@@ -0,0 +1,129 @@
+#  Copyright (c) 2021
+#
+#  This file, DatabasePool.py, is part of Project Alice.
+#
+#  Project Alice is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>
+#
+#  Last modified: 2026.10.18 at 20:16:41 CEST
+
+import sqlite3
+import threading
+from typing import Dict, Optional, Tuple
+
+
+class DatabasePool(object):
+	"""
+	Keeps one read connection per thread plus a single writer connection shared by all threads.
+	The database runs in WAL mode so that readers do not block the writer and the other way around.
+	Writes must be done while holding writeLock, sqlite only allows one writer at a time anyway
+	"""
+
+	# Negative cache sizes are in KiB
+	PRAGMAS = (
+		'PRAGMA journal_mode = WAL',
+		'PRAGMA synchronous = NORMAL',
+		'PRAGMA cache_size = -8000',
+		'PRAGMA temp_store = MEMORY'
+	)
+
+
+	def __init__(self, database: str, timeout: float = 10):
+		self._database = database
+		self._timeout = timeout
+		self._lock = threading.Lock()
+		self._writeLock = threading.RLock()
+		self._writer: Optional[sqlite3.Connection] = None
+		self._readers: Dict[int, Tuple[threading.Thread, sqlite3.Connection]] = dict()
+
+
+	@property
+	def writeLock(self) -> threading.RLock:
+		return self._writeLock
+
+
+	def connect(self) -> sqlite3.Connection:
+		"""
+		Opens and configures a new connection. Connections are closed by the pool, possibly from another thread
+		:return:
+		"""
+		connection = sqlite3.connect(self._database, timeout=self._timeout, check_same_thread=False)
+		connection.row_factory = sqlite3.Row
+		for pragma in self.PRAGMAS:
+			connection.execute(pragma)
+		return connection
+
+
+	def reader(self) -> sqlite3.Connection:
+		"""
+		Returns the read connection of the calling thread, opening it if needed
+		:return:
+		"""
+		thread = threading.current_thread()
+		entry = self._readers.get(thread.ident)
+		if entry and entry[0] is thread:
+			return entry[1]
+
+		connection = self.connect()
+		with self._lock:
+			self._closeDeadReaders()
+			self._readers[thread.ident] = (thread, connection)
+		return connection
+
+
+	def writer(self) -> sqlite3.Connection:
+		"""
+		Returns the shared writer connection. Callers must hold writeLock until they commit or rollback
+		:return:
+		"""
+		with self._lock:
+			if not self._writer:
+				self._writer = self.connect()
+			return self._writer
+
+
+	def close(self):
+		"""
+		Closes every pooled connection. The pool opens new ones if it is used again
+		:return:
+		"""
+		with self._writeLock, self._lock:
+			connections = [connection for _, connection in self._readers.values()]
+			if self._writer:
+				connections.append(self._writer)
+
+			self._readers = dict()
+			self._writer = None
+
+		for connection in connections:
+			try:
+				connection.close()
+			except sqlite3.Error:
+				pass
+
+
+	@property
+	def size(self) -> int:
+		return len(self._readers) + (1 if self._writer else 0)
+
+
+	def _closeDeadReaders(self):
+		for ident, (thread, connection) in list(self._readers.items()):
+			if thread.is_alive():
+				continue
+
+			self._readers.pop(ident)
+			try:
+				connection.close()
+			except sqlite3.Error:
+				pass
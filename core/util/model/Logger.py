@@ -20,30 +20,43 @@
 import logging
 import re
 import traceback
-from typing import Match, Union
+from typing import Any, Callable, Match, Union
 
 
 class Logger(object):
+	LEVELS = {
+		'debug'   : logging.DEBUG,
+		'info'    : logging.INFO,
+		'warning' : logging.WARNING,
+		'error'   : logging.ERROR,
+		'critical': logging.CRITICAL,
+		'fatal'   : logging.FATAL
+	}
+
+	TAG_REGEX = re.compile(r'^(\[[\w ]+])(.*)$')
+
+	# Set by the bug report manager, history needs every line, whatever the log level
+	recordHistory = False
 
 	def __init__(self, prepend: str = None, **_kwargs):
 		self._prepend = prepend
 		self._logger = logging.getLogger('ProjectAlice')
 
 
-	def logInfo(self, msg: str, plural: Union[list, str] = None):
-		self.doLog(function='info', msg=msg, printStack=False, plural=plural)
+	def logInfo(self, msg: Union[str, Callable[[], str]], *args: Any, plural: Union[list, str] = None):
+		self.doLog(function='info', msg=msg, printStack=False, plural=plural, args=args)
 
 
-	def logError(self, msg: str, plural: Union[list, str] = None):
-		self.doLog(function='error', msg=msg, plural=plural)
+	def logError(self, msg: Union[str, Callable[[], str]], *args: Any, plural: Union[list, str] = None):
+		self.doLog(function='error', msg=msg, plural=plural, args=args)
 
 
-	def logDebug(self, msg: str, plural: Union[list, str] = None):
-		self.doLog(function='debug', msg=msg, printStack=False, plural=plural)
+	def logDebug(self, msg: Union[str, Callable[[], str]], *args: Any, plural: Union[list, str] = None):
+		self.doLog(function='debug', msg=msg, printStack=False, plural=plural, args=args)
 
 
-	def logFatal(self, msg: str, plural: Union[list, str] = None):
-		self.doLog(function='fatal', msg=msg, plural=plural)
+	def logFatal(self, msg: Union[str, Callable[[], str]], *args: Any, plural: Union[list, str] = None):
+		self.doLog(function='fatal', msg=msg, plural=plural, args=args)
 		try:
 			from core.base.SuperManager import SuperManager
 
@@ -52,20 +65,50 @@ class Logger(object):
 			exit()
 
 
-	def logWarning(self, msg: str, printStack: bool = False, plural: Union[list, str] = None):
-		from core.base.SuperManager import SuperManager
+	def logWarning(self, msg: Union[str, Callable[[], str]], *args: Any, printStack: bool = False, plural: Union[list, str] = None):
+		# The debug setting is what sets the logger to debug level
+		self.doLog(function='warning', msg=msg, printStack=printStack or self._logger.isEnabledFor(logging.DEBUG), plural=plural, args=args)
+
+
+	def logCritical(self, msg: Union[str, Callable[[], str]], *args: Any, plural: Union[list, str] = None):
+		self.doLog(function='critical', msg=msg, plural=plural, args=args)
+
+
+	def isEnabledFor(self, function: str) -> bool:
+		"""
+		Whether a line logged with the given function would go anywhere. Use it to skip building costly log messages
+		:param function: debug, info, warning, error, critical or fatal
+		:return:
+		"""
+		return Logger.recordHistory or self._logger.isEnabledFor(self.LEVELS.get(function, logging.INFO))
+
+
+	@staticmethod
+	def formatMessage(msg: Union[str, Callable[[], str]], args: tuple = None) -> str:
+		"""
+		Builds a log message, only called once the level is known to be enabled
+		:param msg: The message, a str.format format string if args are given, or a callable returning the message
+		:param args: The format arguments
+		:return:
+		"""
+		if callable(msg):
+			msg = msg()
+
+		if args:
+			msg = msg.format(*args)
 
-		if SuperManager.getInstance().ConfigManager.getAliceConfigByName('debug'):
-			self.doLog(function='warning', msg=msg, printStack=True, plural=plural)
-		else:
-			self.doLog(function='warning', msg=msg, printStack=printStack, plural=plural)
+		return str(msg)
 
 
-	def logCritical(self, msg: str, plural: Union[list, str] = None):
-		self.doLog(function='critical', msg=msg, plural=plural)
+	def doLog(self, function: str, msg: Union[str, Callable[[], str]], printStack=True, plural: Union[list, str] = None, args: tuple = None):
+		if not msg:
+			return
 
+		enabled = self._logger.isEnabledFor(self.LEVELS.get(function, logging.INFO))
+		if not enabled and not Logger.recordHistory:
+			return
 
-	def doLog(self, function: str, msg: str, printStack=True, plural: Union[list, str] = None):
+		msg = self.formatMessage(msg, args)
 		if not msg:
 			return
 
@@ -77,20 +120,24 @@ class Logger(object):
 		elif not msg.startswith('['):
 			msg = f'[Project Alice Logger] {msg}'
 
-		match = re.match(r'^(\[[\w ]+])(.*)$', msg)
+		match = self.TAG_REGEX.match(msg)
 		if match:
 			tag, log = match.groups()
-			space = ''.join([' ' for _ in range(35 - len(tag))])
-			msg = f'{tag}{space}{log}'
+			msg = f'{tag:<35}{log}'
+
+		if enabled:
+			func = getattr(self._logger, function)
+			func(msg)
 
-		func = getattr(self._logger, function)
-		func(msg)
 		if printStack:
 			for line in traceback.format_exc().split('\n'):
 				if not line.strip():
 					continue
 				self.doLog(function=function, msg=f'[Traceback] {line}', printStack=False)
 
+		if not Logger.recordHistory:
+			return
+
 		try:
 			from core.base.SuperManager import SuperManager
 			SuperManager.getInstance().BugReportManager.addToHistory(function, msg)
@@ -0,0 +1,175 @@
+#  Copyright (c) 2021
+#
+#  This file, TaskGraph.py, is part of Project Alice.
+#
+#  Project Alice is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>
+#
+#  Last modified: 2026.10.18 at 20:49:42 CEST
+
+
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Set
+
+from core.base.model.ProjectAliceObject import ProjectAliceObject
+from core.util.model.WorkerPool import WorkerPool
+
+
+class TaskGraph(ProjectAliceObject):
+	"""
+	A set of named tasks run on a worker pool, each task being queued as soon as all the tasks it depends on
+	are done, whatever their outcome. Dependencies on tasks that are not part of the graph are ignored and
+	dependency cycles are broken by running the tasks involved one after the other, in the order they were added
+	"""
+
+
+	def __init__(self, pool: WorkerPool):
+		super().__init__()
+		self._pool = pool
+		self._lock = threading.RLock()
+		self._done = threading.Event()
+		self._funcs: Dict[str, tuple] = dict()
+		self._dependencies: Dict[str, Set[str]] = dict()
+		self._dependents: Dict[str, List[str]] = dict()
+		self._timings: Dict[str, dict] = dict()
+		self._remaining = 0
+		self._running = 0
+		self._aborted = False
+		self._startedAt = 0.0
+
+
+	@property
+	def aborted(self) -> bool:
+		return self._aborted
+
+
+	def add(self, name: str, func: Callable, args: list = None, dependencies: Iterable[str] = None):
+		"""
+		Adds a task to the graph
+		:param name: Unique task name, used to declare dependencies
+		:param func: The callable to run
+		:param args:
+		:param dependencies: Names of the tasks that need to be done before this one starts
+		:return:
+		"""
+		self._funcs[name] = (func, args or list())
+		self._dependencies[name] = set(dependencies or list())
+
+
+	def abort(self):
+		"""
+		Stops queuing tasks, the ones already running are let finish
+		:return:
+		"""
+		with self._lock:
+			self._aborted = True
+			self._checkDone()
+
+
+	def run(self) -> Dict[str, dict]:
+		"""
+		Runs the graph and blocks until every task is done or the graph was aborted
+		:return: Per task timings, by task name in completion order. Start is relative to the start of the graph
+		"""
+		self._resolveDependencies()
+		self._startedAt = time.monotonic()
+
+		with self._lock:
+			self._remaining = len(self._funcs)
+			for name, dependencies in self._dependencies.items():
+				if not dependencies and not self._aborted:
+					self._queue(name)
+			self._checkDone()
+
+		self._done.wait()
+		return self._timings
+
+
+	def _resolveDependencies(self):
+		for name, dependencies in self._dependencies.items():
+			dependencies.intersection_update(self._funcs)
+			dependencies.discard(name)
+
+		# Peel off the tasks that can be ordered, what is left is part of or waiting on a cycle
+		pending = {name: set(dependencies) for name, dependencies in self._dependencies.items()}
+		ready = [name for name, dependencies in pending.items() if not dependencies]
+		while ready:
+			done = ready.pop()
+			pending.pop(done)
+			for name, dependencies in pending.items():
+				if done in dependencies:
+					dependencies.discard(done)
+					if not dependencies:
+						ready.append(name)
+
+		if pending:
+			self.logWarning(f'Dependency cycle between {", ".join(pending)}, running them in order')
+			previous = None
+			for name in pending:
+				self._dependencies[name].difference_update(pending)
+				if previous:
+					self._dependencies[name].add(previous)
+				previous = name
+
+		self._dependents = {name: list() for name in self._funcs}
+		for name, dependencies in self._dependencies.items():
+			for dependency in dependencies:
+				self._dependents[dependency].append(name)
+
+
+	def _queue(self, name: str):
+		self._running += 1
+		try:
+			self._pool.submit(self._runTask, args=[name])
+		except Exception as e:
+			self.logError(f'Failed queuing task {name}: {e}')
+			self._complete(name=name, startedAt=time.monotonic(), error=str(e))
+
+
+	def _runTask(self, name: str):
+		func, args = self._funcs[name]
+		startedAt = time.monotonic()
+		error = None
+		try:
+			func(*args)
+		except Exception as e:
+			self.logError(f'Task {name} failed: {e}', printStack=True)
+			error = str(e)
+		finally:
+			self._complete(name=name, startedAt=startedAt, error=error)
+
+
+	def _complete(self, name: str, startedAt: float, error: str = None):
+		with self._lock:
+			self._timings[name] = {
+				'start'   : startedAt - self._startedAt,
+				'duration': time.monotonic() - startedAt,
+				'thread'  : threading.current_thread().name,
+				'error'   : error
+			}
+			self._running -= 1
+			self._remaining -= 1
+
+			for dependent in self._dependents[name]:
+				dependencies = self._dependencies[dependent]
+				dependencies.discard(name)
+				if not dependencies and not self._aborted:
+					self._queue(dependent)
+
+			self._checkDone()
+
+
+	def _checkDone(self):
+		if self._running == 0 and (self._aborted or self._remaining == 0):
+			self._done.set()
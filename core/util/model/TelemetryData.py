@@ -17,31 +17,29 @@
 #
 #  Last modified: 2021.04.13 at 12:56:48 CEST
 
-from dataclasses import dataclass, field
+from typing import Optional, Tuple
 
-from core.base.model.ProjectAliceObject import ProjectAliceObject
+from core.base.SuperManager import SuperManager
 from core.util.model.TelemetryType import TelemetryType
 
 
-@dataclass
-class TelemetryData(ProjectAliceObject):
+class TelemetryData(object):
 	"""Class holding one data point of telemetry"""
-	data: dict
-	service: str = field(init=False)
-	deviceId: str = field(init=False)
-	locationId: int = field(init=False)
-	value: str = field(init=False)
-	timestamp: str = field(init=False)
-	type: TelemetryType = field(init=False)
+	__slots__ = ('service', 'deviceId', 'locationId', 'value', 'timestamp', 'type')
 
 
-	def __post_init__(self):  # NOSONAR
-		self.service = self.data['service']
-		self.deviceId = self.data['deviceId']
-		self.locationId = self.data['locationId']
-		self.value = self.data['value']
-		self.timestamp = self.data['timestamp']
-		self.type = TelemetryType(self.data['type'])
+	def __init__(self, data: dict):
+		self.service = data['service']
+		self.deviceId = data['deviceId']
+		self.locationId = data['locationId']
+		self.value = data['value']
+		self.timestamp = data['timestamp']
+		self.type = TelemetryType(data['type'])
+
+
+	@property
+	def key(self) -> Tuple[TelemetryType, str, int, Optional[int]]:
+		return self.type, self.service, self.deviceId, self.locationId
 
 
 	def forApi(self):
@@ -61,8 +59,12 @@ class TelemetryData(ProjectAliceObject):
 
 
 	def getDeviceName(self):
-		return self.DeviceManager.getDevice(deviceId=int(self.deviceId)).displayName
+		return SuperManager.getInstance().DeviceManager.getDevice(deviceId=int(self.deviceId)).displayName
 
 
 	def getLocationName(self):
-		return self.LocationManager.getLocation(locId=self.locationId).name
+		return SuperManager.getInstance().LocationManager.getLocation(locId=self.locationId).name
+
+
+	def __repr__(self) -> str:
+		return f'TelemetryData({self.type.value}, {self.service}, {self.deviceId}, {self.locationId}: {self.value} at {self.timestamp})'
@@ -0,0 +1,133 @@
+#  Copyright (c) 2021
+#
+#  This file, TelemetryStore.py, is part of Project Alice.
+#
+#  Project Alice is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>
+#
+#  Last modified: 2026.10.18 at 20:18:59 CEST
+
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from core.util.model.TelemetryData import TelemetryData
+from core.util.model.TelemetryType import TelemetryType
+
+
+TelemetryKey = Tuple[TelemetryType, str, int, Optional[int]]
+
+
+class TelemetryStore(object):
+	"""
+	Current telemetry values, one per (type, service, deviceId, locationId), hash indexed on that key
+	with secondary indexes per location and per type. Reads do not lock, writes replace whole entries under a lock
+	"""
+
+	def __init__(self):
+		self._lock = threading.Lock()
+		self._values: Dict[TelemetryKey, TelemetryData] = dict()
+		self._byLocation: Dict[Optional[int], Dict[TelemetryKey, TelemetryData]] = dict()
+		self._byType: Dict[TelemetryType, Dict[TelemetryKey, TelemetryData]] = dict()
+
+
+	def __len__(self) -> int:
+		return len(self._values)
+
+
+	def __iter__(self) -> Iterator[TelemetryData]:
+		return iter(list(self._values.values()))
+
+
+	def clear(self):
+		with self._lock:
+			self._values = dict()
+			self._byLocation = dict()
+			self._byType = dict()
+
+
+	def add(self, data: TelemetryData):
+		"""
+		Adds or replaces the current value for the data key
+		:param data:
+		:return:
+		"""
+		key = data.key
+		with self._lock:
+			self._values[key] = data
+			self._byLocation.setdefault(data.locationId, dict())[key] = data
+			self._byType.setdefault(data.type, dict())[key] = data
+
+
+	def update(self, ttype: TelemetryType, value: str, service: str, deviceId: int, timestamp=None, locationId: int = None) -> bool:
+		"""
+		Updates the current value for the given combination
+		:param ttype:
+		:param value:
+		:param service:
+		:param deviceId:
+		:param timestamp:
+		:param locationId:
+		:return: False if this exact value was already known
+		"""
+		current = self._values.get((ttype, service, deviceId, locationId), None)
+		if current:
+			if current.timestamp == timestamp and current.value == value:
+				# skip exact duplicates
+				return False
+
+			current.timestamp = timestamp
+			current.value = value
+			return True
+
+		self.add(TelemetryData({
+			'type'      : ttype,
+			'value'     : value,
+			'service'   : service,
+			'deviceId'  : deviceId,
+			'timestamp' : timestamp,
+			'locationId': locationId
+		}))
+		return True
+
+
+	def get(self, ttype: TelemetryType, service: str, deviceId: int, locationId: int = None) -> Optional[TelemetryData]:
+		return self._values.get((ttype, service, deviceId, locationId), None)
+
+
+	def byLocation(self, locationId: int) -> List[TelemetryData]:
+		return list(self._byLocation.get(locationId, dict()).values())
+
+
+	def byType(self, ttype: TelemetryType) -> List[TelemetryData]:
+		return list(self._byType.get(ttype, dict()).values())
+
+
+	def find(self, ttype: TelemetryType = None, locationId: int = None) -> List[TelemetryData]:
+		"""
+		Returns the current values matching the given type and location, using the smallest index
+		:param ttype:
+		:param locationId:
+		:return:
+		"""
+		if ttype is None and locationId is None:
+			return list(self)
+		elif ttype is None:
+			return self.byLocation(locationId)
+		elif locationId is None:
+			return self.byType(ttype)
+
+		byLocation = self._byLocation.get(locationId, dict())
+		byType = self._byType.get(ttype, dict())
+		if len(byLocation) <= len(byType):
+			return [data for data in list(byLocation.values()) if data.type == ttype]
+		return [data for data in list(byType.values()) if data.locationId == locationId]
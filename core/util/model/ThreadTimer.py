@@ -17,14 +17,69 @@
 #
 #  Last modified: 2021.04.13 at 12:56:48 CEST
 
-from dataclasses import dataclass, field
-from threading import Timer
-from typing import Callable, Optional
+from __future__ import annotations
+
+from typing import Callable, TYPE_CHECKING
+
+
+if TYPE_CHECKING:
+	from core.util.model.TimerScheduler import TimerScheduler
 
 
-@dataclass
 class ThreadTimer(object):
-	callback: Callable
-	args: list = field(default_factory=list)
-	kwargs: dict = field(default_factory=dict)
-	timer: Optional[Timer] = None
+	"""
+	Cancellable handle on a callback queued on the timer scheduler. It mimics the threading.Timer api
+	it replaces, so the handles returned by ThreadManager.newTimer can still be started, cancelled and checked
+	"""
+
+	def __init__(self, scheduler: TimerScheduler, interval: float, callback: Callable, args: list = None, kwargs: dict = None):
+		self.interval = interval
+		self.callback = callback
+		self.args = args or list()
+		self.kwargs = kwargs or dict()
+		self.deadline = 0.0
+		self.queued = False
+		self._scheduler = scheduler
+		self._started = False
+		self._cancelled = False
+		self._done = False
+
+
+	@property
+	def cancelled(self) -> bool:
+		return self._cancelled
+
+
+	def start(self):
+		if self._started:
+			raise RuntimeError('Timers can only be started once')
+
+		self._started = True
+		self._scheduler.schedule(self)
+
+
+	def cancel(self):
+		if self._done or self._cancelled:
+			return
+
+		self._cancelled = True
+		if self._started:
+			self._scheduler.cancel(self)
+
+
+	def is_alive(self) -> bool:
+		return self._started and not self._cancelled and not self._done
+
+
+	def isAlive(self) -> bool:
+		return self.is_alive()
+
+
+	def run(self):
+		if self._cancelled:
+			return
+
+		try:
+			self.callback(*self.args, **self.kwargs)
+		finally:
+			self._done = True
@@ -0,0 +1,190 @@
+#  Copyright (c) 2021
+#
+#  This file, TimerScheduler.py, is part of Project Alice.
+#
+#  Project Alice is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>
+#
+#  Last modified: 2026.10.18 at 20:26:46 CEST
+
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+from core.base.model.ProjectAliceObject import ProjectAliceObject
+from core.util.model.ThreadTimer import ThreadTimer
+
+
+class TimerScheduler(ProjectAliceObject):
+	"""
+	Runs delayed callbacks from a single dispatcher thread sleeping on a deadline heap, instead of one
+	threading.Timer thread per call. Due callbacks are handed to a small worker pool so a slow one
+	cannot hold the others back. Callbacks blocking for long, on network or disk, would still hold a
+	worker each, these are meant to be timed with a pool given to ThreadManager.newTimer, the timer then
+	only queues them. Cancelled timers stay in the heap until they come up, unless they make up most
+	of it, in which case the heap is compacted
+	"""
+
+	WORKERS = 8
+	COMPACT_THRESHOLD = 64
+
+
+	def __init__(self, workers: int = WORKERS):
+		super().__init__()
+		self._workers = workers
+		self._condition = threading.Condition()
+		self._heap: List[Tuple[float, int, ThreadTimer]] = list()
+		self._sequence = itertools.count()
+		self._thread: Optional[threading.Thread] = None
+		self._executor: Optional[ThreadPoolExecutor] = None
+		self._stopped = False
+
+		self._cancelledInHeap = 0
+		self._fired = 0
+		self._cancelled = 0
+		self._failed = 0
+		self._lagTotal = 0.0
+		self._lagMax = 0.0
+
+
+	@property
+	def stats(self) -> dict:
+		with self._condition:
+			return {
+				'pending'   : len(self._heap) - self._cancelledInHeap,
+				'fired'     : self._fired,
+				'cancelled' : self._cancelled,
+				'failed'    : self._failed,
+				'lagAverage': self._lagTotal / self._fired if self._fired else 0.0,
+				'lagMax'    : self._lagMax,
+				'workers'   : self._workers
+			}
+
+
+	def schedule(self, timer: ThreadTimer):
+		"""
+		Queues a started timer, waking the dispatcher if it is now the earliest one
+		:param timer:
+		:return:
+		"""
+		with self._condition:
+			if self._stopped:
+				return
+
+			if not self._thread:
+				self._executor = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix='timer')
+				self._thread = threading.Thread(name='timerScheduler', target=self.run, daemon=True)
+				self._thread.start()
+
+			timer.deadline = time.monotonic() + timer.interval
+			timer.queued = True
+			heapq.heappush(self._heap, (timer.deadline, next(self._sequence), timer))
+			if self._heap[0][2] is timer:
+				self._condition.notify()
+
+
+	def cancel(self, timer: ThreadTimer):
+		"""
+		Accounts for a cancelled timer, it is skipped when it comes up
+		:param timer:
+		:return:
+		"""
+		with self._condition:
+			self._cancelled += 1
+			if not timer.queued:
+				return
+
+			self._cancelledInHeap += 1
+			if self._cancelledInHeap > self.COMPACT_THRESHOLD and self._cancelledInHeap * 2 > len(self._heap):
+				self._heap = [entry for entry in self._heap if not entry[2].cancelled]
+				heapq.heapify(self._heap)
+				self._cancelledInHeap = 0
+
+
+	def start(self):
+		"""
+		Accepts timers again after a stop. The dispatcher and its workers are started with the first timer
+		:return:
+		"""
+		if not self._stopped:
+			return
+
+		thread = self._thread
+		if thread and thread is not threading.current_thread():
+			thread.join(timeout=1)
+
+		with self._condition:
+			self._stopped = False
+			self._thread = None
+			self._executor = None
+
+
+	def stop(self):
+		"""
+		Stops the dispatcher, pending timers are dropped
+		:return:
+		"""
+		with self._condition:
+			self._stopped = True
+			for _, _, timer in self._heap:
+				timer.queued = False
+			self._heap = list()
+			self._cancelledInHeap = 0
+			self._condition.notify()
+
+		if self._executor:
+			self._executor.shutdown(wait=False)
+
+
+	def run(self):
+		while True:
+			with self._condition:
+				while not self._stopped and (not self._heap or self._heap[0][0] > time.monotonic()):
+					self._condition.wait(self._heap[0][0] - time.monotonic() if self._heap else None)
+
+				if self._stopped:
+					return
+
+				now = time.monotonic()
+				due = list()
+				while self._heap and self._heap[0][0] <= now:
+					_, _, timer = heapq.heappop(self._heap)
+					timer.queued = False
+					if timer.cancelled:
+						self._cancelledInHeap -= 1
+						continue
+					due.append(timer)
+
+			for timer in due:
+				try:
+					self._executor.submit(self._execute, timer)
+				except RuntimeError:
+					return  # Shutting down
+
+
+	def _execute(self, timer: ThreadTimer):
+		lag = time.monotonic() - timer.deadline
+		with self._condition:
+			self._fired += 1
+			self._lagTotal += lag
+			self._lagMax = max(self._lagMax, lag)
+
+		try:
+			timer.run()
+		except Exception as e:
+			with self._condition:
+				self._failed += 1
+			self.logError(f'Timer callback **{getattr(timer.callback, "__name__", timer.callback)}** failed: {e}')
@@ -0,0 +1,196 @@
+#  Copyright (c) 2021
+#
+#  This file, WorkerPool.py, is part of Project Alice.
+#
+#  Project Alice is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>
+#
+#  Last modified: 2026.10.18 at 20:27:48 CEST
+
+import itertools
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List
+
+from core.ProjectAliceExceptions import WorkerPoolFull
+from core.base.model.ProjectAliceObject import ProjectAliceObject
+
+
+class WorkerPool(ProjectAliceObject):
+	"""
+	A named pool of at most maxWorkers threads, started on demand and reused, serving a bounded priority
+	queue of jobs. Jobs are submitted with a priority, lowest first, and return a concurrent.futures Future
+	"""
+
+	PRIORITY_HIGH = 0
+	PRIORITY_NORMAL = 5
+	PRIORITY_LOW = 10
+
+	_STOP = 2 ** 31
+
+
+	def __init__(self, name: str, maxWorkers: int, queueSize: int = 0):
+		super().__init__()
+		self._name = name
+		self._maxWorkers = max(1, maxWorkers)
+		self._queueSize = queueSize
+		self._queue = queue.PriorityQueue()
+		self._sequence = itertools.count()
+		self._lock = threading.Lock()
+		self._threads: List[threading.Thread] = list()
+		self._idle = 0
+		self._active = 0
+		self._shutdown = False
+
+		self._submitted = 0
+		self._completed = 0
+		self._failed = 0
+		self._rejected = 0
+		self._waitTotal = 0.0
+		self._runTotal = 0.0
+
+
+	@property
+	def name(self) -> str:
+		return self._name
+
+
+	@property
+	def maxWorkers(self) -> int:
+		return self._maxWorkers
+
+
+	@property
+	def queueSize(self) -> int:
+		return self._queueSize
+
+
+	@property
+	def isShutdown(self) -> bool:
+		return self._shutdown
+
+
+	@property
+	def stats(self) -> dict:
+		with self._lock:
+			return {
+				'workers'    : len(self._threads),
+				'maxWorkers' : self._maxWorkers,
+				'active'     : self._active,
+				'queueDepth' : self._queue.qsize(),
+				'queueSize'  : self._queueSize,
+				'submitted'  : self._submitted,
+				'completed'  : self._completed,
+				'failed'     : self._failed,
+				'rejected'   : self._rejected,
+				'waitAverage': self._waitTotal / self._completed if self._completed else 0.0,
+				'runAverage' : self._runTotal / self._completed if self._completed else 0.0
+			}
+
+
+	def submit(self, func: Callable, args: list = None, kwargs: dict = None, priority: int = PRIORITY_NORMAL) -> Future:
+		"""
+		Queues a job
+		:param func: The callable to run
+		:param args:
+		:param kwargs:
+		:param priority: Jobs with a lower priority are picked first
+		:return: A future resolving to the job result
+		"""
+		future = Future()
+		with self._lock:
+			if self._shutdown:
+				raise RuntimeError(f'Worker pool {self._name} is shut down')
+
+			if 0 < self._queueSize <= self._queue.qsize():
+				self._rejected += 1
+				raise WorkerPoolFull(message=f'Worker pool {self._name} queue is full')
+
+			self._submitted += 1
+			self._queue.put((priority, next(self._sequence), time.monotonic(), future, func, args or list(), kwargs or dict()))
+
+			if self._idle < self._queue.qsize() and len(self._threads) < self._maxWorkers:
+				thread = threading.Thread(name=f'{self._name}Pool-{len(self._threads)}', target=self._work, daemon=True)
+				self._threads.append(thread)
+				thread.start()
+
+		return future
+
+
+	def shutdown(self, cancelPending: bool = True):
+		"""
+		Stops the workers once they are done with their current job
+		:param cancelPending: Whether to cancel the jobs still queued or let them run first
+		:return:
+		"""
+		with self._lock:
+			self._shutdown = True
+			threads = len(self._threads)
+
+		if cancelPending:
+			while True:
+				try:
+					job = self._queue.get_nowait()
+				except queue.Empty:
+					break
+				job[3].cancel()
+
+		for _ in range(threads):
+			self._queue.put((self._STOP, next(self._sequence), 0, None, None, None, None))
+
+
+	def _work(self):
+		while True:
+			with self._lock:
+				self._idle += 1
+
+			_, _, queuedAt, future, func, args, kwargs = self._queue.get()
+
+			with self._lock:
+				self._idle -= 1
+				if not future:
+					return
+
+				if not future.set_running_or_notify_cancel():
+					continue
+
+				self._active += 1
+
+			start = time.monotonic()
+			result = None
+			error = None
+			try:
+				result = func(*args, **kwargs)
+			except Exception as e:
+				error = e
+				self.logError(f'Job **{getattr(func, "__name__", func)}** failed in pool **{self._name}**: {e}')
+			except BaseException as e:
+				# SystemExit and the like, the worker goes down and makes room for another one
+				error = e
+				with self._lock:
+					self._threads.remove(threading.current_thread())
+				return
+			finally:
+				with self._lock:
+					self._active -= 1
+					self._completed += 1
+					self._failed += error is not None
+					self._waitTotal += start - queuedAt
+					self._runTotal += time.monotonic() - start
+
+				if error is not None:
+					future.set_exception(error)
+				else:
+					future.set_result(result)
@@ -17,34 +17,71 @@
 #
 #  Last modified: 2021.07.31 at 15:54:28 CEST
 
+import sys
+import threading
+from collections import OrderedDict
 from importlib import import_module, reload
-
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
 from core.base.model.Manager import Manager
 from core.commons import constants
 from core.dialog.model.DialogSession import DialogSession
 from core.user.model.User import User
+from core.util.model.WorkerPool import WorkerPool
 from core.voice.model.TTSEnum import TTSEnum
 from core.voice.model.Tts import Tts
+from core.voice.model.TtsCache import TtsCache
 
 
 class TTSManager(Manager):
 
+	ENGINE_CACHE_SIZE = 4
+
+
 	def __init__(self):
 		super().__init__()
 
 		self._fallback = None
 		self._tts = None
 		self._cacheRoot = Path(self.Commons.rootDir(), 'var/cache')
+		self._cache = TtsCache(root=self._cacheRoot, folders=[tts.value for tts in TTSEnum])
+		self._engines: Dict[Tuple[str, str, str, str], Tts] = OrderedDict()
+		self._enginesLock = threading.Lock()
 
 
 	def onStart(self):
 		super().onStart()
-		self._loadTTS(self.ConfigManager.getAliceConfigByName('tts').lower())
+		self.clearEngines()
+		self._cache.load()
+		self._tts = self._loadTTS(self.ConfigManager.getAliceConfigByName('tts').lower())
+
+
+	def onBooted(self):
+		super().onBooted()
+		if self._tts and self.ConfigManager.getAliceConfigByName('ttsCachePrewarm'):
+			self.ThreadManager.submit(func=self.prewarmCache, pool='io', priority=WorkerPool.PRIORITY_LOW, args=[self._tts])
+
 
+	def onStop(self):
+		super().onStop()
+		self.clearEngines()
+		self._cache.save()
 
-	def _loadTTS(self, userTTS: str = None, user: User = None, forceTts=None):
+
+	def onQuarterHour(self):
+		self.evictCache()
+		self._cache.save()
+
+
+	def _loadTTS(self, userTTS: str = None, user: User = None, forceTts=None) -> Optional[Tts]:
+		"""
+		Loads, checks and starts a tts engine, falling back to the configured fallback engine if needed
+		:param userTTS: The engine to load, the configured one if not set
+		:param user: The user the engine is loaded for, if any
+		:param forceTts: Used when falling back
+		:return: The started engine, None if none could be started
+		"""
 		self._fallback = None
 		if forceTts:
 			systemTTS = forceTts
@@ -58,8 +95,6 @@ class TTSManager(Manager):
 		stayOffline = self.ConfigManager.getAliceConfigByName('stayCompletelyOffline')
 		online = self.InternetManager.online
 
-		self._tts = None
-
 		if systemTTS == TTSEnum.PICO.value:
 			package = 'core.voice.model.PicoTts'
 		elif systemTTS == TTSEnum.MYCROFT.value:
@@ -74,45 +109,47 @@ class TTSManager(Manager):
 			package = 'core.voice.model.SnipsTts'
 
 		module = import_module(package)
-		tts = getattr(module, package.rsplit('.', 1)[-1])
-		self._tts = tts(user)
+		clazz = getattr(module, package.rsplit('.', 1)[-1])
+		tts = clazz(user)
 
-		if not self._tts.checkDependencies():
-			if not self._tts.installDependencies():
-				self._tts = None
+		if not tts.checkDependencies():
+			if not tts.installDependencies():
+				tts = None
 			else:
 				module = reload(module)
-				tts = getattr(module, package.rsplit('.', 1)[-1])
-				self._tts = tts(user)
+				clazz = getattr(module, package.rsplit('.', 1)[-1])
+				tts = clazz(user)
 
-		if self._tts is None:
+		if tts is None:
 			self.logWarning("Couldn't install Tts, falling back to PicoTts")
 			from core.voice.model.PicoTts import PicoTts
 
-			self._tts = PicoTts(user)
+			tts = PicoTts(user)
 
-		if self._tts.online and (not online or keepTTSOffline or stayOffline):
-			self._tts = None
+		if tts.online and (not online or keepTTSOffline or stayOffline):
+			tts = None
 
-		if self._tts is None:
+		if tts is None:
 			if not forceTts:
 				fallback = self.ConfigManager.getAliceConfigByName('ttsFallback')
 				self.logWarning(f'Tts did not satisfy the user settings, falling back to **{fallback}**')
-				self._loadTTS(userTTS=userTTS, user=user, forceTts=fallback)
-				return
+				return self._loadTTS(userTTS=userTTS, user=user, forceTts=fallback)
 			else:
 				self.logFatal('Fallback Tts failed, going down')
-				return
+				return None
 
 		try:
-			self._tts.onStart()
+			tts.onStart()
 		except Exception as e:
 			if not forceTts:
 				fallback = self.ConfigManager.getAliceConfigByName('ttsFallback')
 				self.logWarning(f'Tts failed starting, falling back to **{fallback}**')
-				self._loadTTS(userTTS=userTTS, user=user, forceTts=fallback)
+				return self._loadTTS(userTTS=userTTS, user=user, forceTts=fallback)
 			else:
 				self.logFatal(f"Tts failed starting: {e}")
+				return None
+
+		return tts
 
 
 	@property
@@ -122,9 +159,9 @@ class TTSManager(Manager):
 
 	@property
 	def speaking(self) -> bool:
-		if not self._tts:
-			return False
-		return self._tts.speaking
+		if self._tts and self._tts.speaking:
+			return True
+		return any(tts.speaking for tts in self._engines.copy().values())
 
 
 	@property
@@ -132,6 +169,42 @@ class TTSManager(Manager):
 		return self._cacheRoot
 
 
+	@property
+	def cache(self) -> TtsCache:
+		return self._cache
+
+
+	def evictCache(self):
+		maxSize = int(self.ConfigManager.getAliceConfigByName('ttsCacheSize') or 0) * 1024 * 1024 or sys.maxsize
+		maxAge = int(self.ConfigManager.getAliceConfigByName('ttsCacheMaxAge') or 0) * 86400
+		evicted = self._cache.evict(maxSize=maxSize, maxAge=maxAge)
+		if evicted:
+			self.logInfo(f'Removed {evicted} speech file(s) from the cache')
+
+
+	def prewarmCache(self, tts: Tts):
+		"""
+		Synthesizes all the known talk strings for the given engine, stopping if it is replaced meanwhile
+		:param tts:
+		:return:
+		"""
+		count = 0
+		for text in sorted(self.TalkManager.getAllTexts()):
+			if tts is not self._tts or not self.isActive:
+				return
+
+			try:
+				count += tts.precache(text)
+			except Exception as e:
+				self.logWarning(f'Failed prewarming the speech cache: {e}')
+				return
+
+		if count:
+			self.logInfo(f'Prewarmed the speech cache with {count} new talk(s)')
+			self.evictCache()
+			self._cache.save()
+
+
 	def onInternetConnected(self):
 		if self.ConfigManager.getAliceConfigByName('stayCompletelyOffline') or self.ConfigManager.getAliceConfigByName('keepTTSOffline'):
 			return
@@ -139,13 +212,15 @@ class TTSManager(Manager):
 		confValue = self.ConfigManager.getAliceConfigByName('tts').lower()
 		if not self._tts.online and confValue != self._tts.TTS.value:
 			self.logInfo('Connected to internet, switching TTS')
-			self._loadTTS(confValue)
+			self.clearEngines()
+			self._tts = self._loadTTS(confValue)
 
 
 	def onInternetLost(self):
 		if self._tts.online:
 			self.logInfo('Internet lost, switching to offline TTS')
-			self._loadTTS(self.ConfigManager.getAliceConfigByName('ttsFallback').lower())
+			self.clearEngines()
+			self._tts = self._loadTTS(self.ConfigManager.getAliceConfigByName('ttsFallback').lower())
 
 
 	def onSay(self, session: DialogSession):
@@ -157,9 +232,69 @@ class TTSManager(Manager):
 			self.MqttManager.endSession(sessionId=session.sessionIdl, forceEnd=True)
 			return
 
+		tts = self._tts
 		if session and session.user != constants.UNKNOWN_USER:
 			user: User = self.UserManager.getUser(session.user)
 			if user and user.tts:
-				self._loadTTS(user.tts, user)
-
-		self._tts.onSay(session)
+				tts = self.getUserTts(user) or tts
+
+		tts.onSay(session)
+
+
+	def engineKey(self, userTTS: str, user: User) -> Tuple[str, str, str, str]:
+		"""
+		The settings a user tts engine is started with, engines with the same key are interchangeable
+		:param userTTS:
+		:param user:
+		:return: engine, language, type and voice
+		"""
+		return (
+			userTTS.lower(),
+			user.ttsLanguage or self.ConfigManager.getAliceConfigByName('ttsLanguage') or self.LanguageManager.activeLanguageAndCountryCode,
+			user.ttsType or self.ConfigManager.getAliceConfigByName('ttsType'),
+			user.ttsVoice or self.ConfigManager.getAliceConfigByName('ttsVoice')
+		)
+
+
+	def getUserTts(self, user: User) -> Optional[Tts]:
+		"""
+		Returns a started engine for the user tts settings, loading it only if none with the same settings is kept warm
+		:param user:
+		:return:
+		"""
+		key = self.engineKey(user.tts, user)
+		with self._enginesLock:
+			tts = self._engines.get(key, None)
+			if tts:
+				self._engines.move_to_end(key)
+				return tts
+
+		tts = self._loadTTS(user.tts, user)
+		if not tts:
+			return None
+
+		evicted = list()
+		with self._enginesLock:
+			self._engines[key] = tts
+			self._engines.move_to_end(key)
+			while len(self._engines) > self.ENGINE_CACHE_SIZE:
+				evicted.append(self._engines.popitem(last=False)[1])
+
+		self._stopEngines(evicted)
+		return tts
+
+
+	def clearEngines(self):
+		with self._enginesLock:
+			engines = list(self._engines.values())
+			self._engines.clear()
+
+		self._stopEngines(engines)
+
+
+	def _stopEngines(self, engines: List[Tts]):
+		for tts in engines:
+			try:
+				tts.onStop()
+			except Exception as e:
+				self.logWarning(f'Failed stopping user tts {tts.__class__.__name__}: {e}')
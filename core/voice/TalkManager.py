@@ -20,6 +20,7 @@
 import json
 import random
 from pathlib import Path
+from typing import Set
 
 from core.base.model.Manager import Manager
 
@@ -77,6 +78,22 @@ class TalkManager(Manager):
 		return arr
 
 
+	def getAllTexts(self, language: str = None) -> Set[str]:
+		"""
+		Returns every talk string known in the given language, except the ones with placeholders as they are only spoken once formatted
+		:param language: Defaults to the active language
+		:return:
+		"""
+		language = language or self.LanguageManager.activeLanguage
+		ret = set()
+		for skillTalks in self._langData.copy().values():
+			for talk in skillTalks.get(language, dict()).values():
+				texts = talk if isinstance(talk, list) else [text for strings in talk.values() if isinstance(strings, list) for text in strings]
+				ret.update(text for text in texts if isinstance(text, str) and text and '{' not in text)
+
+		return ret
+
+
 	def chooseTalk(self, talk: str, skill: str, activeLanguage: str, defaultLanguage: str, shortReplyMode: bool) -> str:
 		try:
 			talkData = self._langData[skill][activeLanguage][talk]
@@ -19,8 +19,6 @@
 
 from importlib import import_module, reload
 
-from paho.mqtt.client import MQTTMessage
-
 from core.base.model.Manager import Manager
 from core.dialog.model.DialogSession import DialogSession
 from core.voice.model.WakewordEngine import WakewordEngine
@@ -50,11 +48,6 @@ class WakewordManager(Manager):
 			self._engine.onBooted()
 
 
-	def onAudioFrame(self, message: MQTTMessage, deviceUid: str):
-		if self._engine:
-			self._engine.onAudioFrame(message=message, deviceUid=deviceUid)
-
-
 	def onHotwordToggleOn(self, deviceUid: str, session: DialogSession):
 		if self._engine:
 			self._engine.onHotwordToggleOn(deviceUid=deviceUid, session=DialogSession)
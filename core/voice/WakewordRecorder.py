@@ -173,7 +173,7 @@ class WakewordRecorder(Manager):
 		self.logInfo('Finalyzing wakeword')
 		self._state = WakewordRecorderState.FINALIZING
 		path = self._wakeword.save()
-		self.ThreadManager.newThread(name='SatelliteWakewordUpload', target=self._upload, args=[path, self._wakeword.username], autostart=True)
+		self.ThreadManager.submit(func=self._upload, pool='io', args=[path, self._wakeword.username])
 		self.cancelWakeword()
 		self.WakewordManager.restartEngine()
 
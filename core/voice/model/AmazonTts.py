@@ -18,8 +18,8 @@
 #  Last modified: 2021.04.13 at 12:56:48 CEST
 
 import re
+from pathlib import Path
 
-from core.dialog.model.DialogSession import DialogSession
 from core.user.model.User import User
 from core.voice.model.TTSEnum import TTSEnum
 from core.voice.model.Tts import Tts
@@ -291,8 +291,8 @@ class AmazonTts(Tts):
 		return '<amazon:effect name="whispered">', '</amazon:effect>'
 
 
-	def _checkText(self, session: DialogSession) -> str:
-		text = super()._checkText(session)
+	def _cleanText(self, text: str) -> str:
+		text = super()._cleanText(text)
 
 		if self._supportsSSML and not re.search('<amazon:auto-breaths>', text):
 			text = re.sub(r'<speak>(.*)</speak>', r'<speak><amazon:auto-breaths>\1</amazon:auto-breaths></speak>', text)
@@ -300,38 +300,29 @@ class AmazonTts(Tts):
 		return text
 
 
-	def onSay(self, session: DialogSession):
-		super().onSay(session)
-
-		if not self._text:
-			return
-
+	def _synthesize(self, text: str, cacheFile: Path) -> bool:
 		neural = self.ConfigManager.getAliceConfigByName('ttsNeural') and self._neuralVoice
 
-		tmpFile = self.TEMP_ROOT / self._cacheFile.with_suffix('.mp3')
-		if not self._cacheFile.exists():
-			self.logDebug(f'Downloading file **{self._cacheFile.stem}**')
-			response = self._client.synthesize_speech(
-				Engine='neural' if neural else 'standard',
-				LanguageCode=self._lang,
-				OutputFormat='mp3',
-				SampleRate=str(self.AudioServer.SAMPLERATE),
-				Text=self._checkText(session) if neural else self._text,
-				TextType='text' if neural else 'ssml',
-				VoiceId=self._voice.title()
-			)
-
-			if not response:
-				self.logError(f'[{self.TTS.value}] Failed downloading speech file')
-				return
+		tmpFile = self.TEMP_ROOT / cacheFile.with_suffix('.mp3')
+		self.logDebug(f'Downloading file **{cacheFile.stem}**')
+		response = self._client.synthesize_speech(
+			Engine='neural' if neural else 'standard',
+			LanguageCode=self._lang,
+			OutputFormat='mp3',
+			SampleRate=str(self.AudioServer.SAMPLERATE),
+			Text=text,
+			TextType='text' if neural else 'ssml',
+			VoiceId=self._voice.title()
+		)
 
-			tmpFile.write_bytes(response['AudioStream'].read())
+		if not response:
+			self.logError(f'[{self.TTS.value}] Failed downloading speech file')
+			return False
 
-			self._mp3ToWave(src=tmpFile, dest=self._cacheFile)
-			tmpFile.unlink()
+		tmpFile.write_bytes(response['AudioStream'].read())
 
-			self.logDebug(f'Downloaded speech file **{self._cacheFile.stem}**')
-		else:
-			self.logDebug(f'Using existing cached file **{self._cacheFile.stem}**')
+		self._mp3ToWave(src=tmpFile, dest=cacheFile)
+		tmpFile.unlink()
 
-		self._speak(self._cacheFile, session)
+		self.logDebug(f'Downloaded speech file **{cacheFile.stem}**')
+		return True
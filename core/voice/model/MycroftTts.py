@@ -21,7 +21,6 @@ import getpass
 from pathlib import Path
 
 from core.base.SuperManager import SuperManager
-from core.dialog.model.DialogSession import DialogSession
 from core.user.model.User import User
 from core.voice.model.TTSEnum import TTSEnum
 from core.voice.model.Tts import Tts
@@ -125,41 +124,32 @@ class MycroftTts(Tts):
 			return True
 
 
-	def onSay(self, session: DialogSession):
-		super().onSay(session)
-
-		if not self._text:
-			return
-
-		if not self._cacheFile.exists():
-			if not Path(self._mimicDirectory, 'voices', self._voice + '.flitevox').exists():
-				htsvoice = Path(self._mimicDirectory, 'voices', self._voice + '.htsvoice')
-				if htsvoice.exists():
-					SuperManager.getInstance().CommonsManager.runRootSystemCommand([
-						'-u', getpass.getuser(),
-						self._mimicDirectory,
-						'-t', self._text,
-						'-o', self._cacheFile,
-						'-voice', htsvoice
-					])
-				else:
-					SuperManager.getInstance().CommonsManager.runRootSystemCommand([
-						'-u', getpass.getuser(),
-						self._mimicDirectory,
-						'-t', self._text,
-						'-o', self._cacheFile,
-						'-voice', 'slt'
-					])
+	def _synthesize(self, text: str, cacheFile: Path) -> bool:
+		if not Path(self._mimicDirectory, 'voices', self._voice + '.flitevox').exists():
+			htsvoice = Path(self._mimicDirectory, 'voices', self._voice + '.htsvoice')
+			if htsvoice.exists():
+				SuperManager.getInstance().CommonsManager.runRootSystemCommand([
+					'-u', getpass.getuser(),
+					self._mimicDirectory,
+					'-t', text,
+					'-o', cacheFile,
+					'-voice', htsvoice
+				])
 			else:
 				SuperManager.getInstance().CommonsManager.runRootSystemCommand([
 					'-u', getpass.getuser(),
 					self._mimicDirectory,
-					'-t', self._text,
-					'-o', self._cacheFile,
-					'-voice', self._voice
+					'-t', text,
+					'-o', cacheFile,
+					'-voice', 'slt'
 				])
-			self.logDebug(f'Generated speech file **{self._cacheFile.stem}**')
 		else:
-			self.logDebug(f'Using existing cached file **{self._cacheFile.stem}**')
-
-		self._speak(file=self._cacheFile, session=session)
+			SuperManager.getInstance().CommonsManager.runRootSystemCommand([
+				'-u', getpass.getuser(),
+				self._mimicDirectory,
+				'-t', text,
+				'-o', cacheFile,
+				'-voice', self._voice
+			])
+		self.logDebug(f'Generated speech file **{cacheFile.stem}**')
+		return True
@@ -17,14 +17,11 @@
 #
 #  Last modified: 2021.04.13 at 12:56:48 CEST
 
-import io
 import queue
 import struct
-import wave
 from typing import Generator
 
 import pyaudio
-from paho.mqtt.client import MQTTMessage
 
 from core.commons import constants
 from core.dialog.model.DialogSession import DialogSession
@@ -88,20 +85,11 @@ class PorcupineWakeword(WakewordEngine):
 			self._hotwordThread = self.ThreadManager.newThread(name='HotwordThread', target=self.worker)
 
 
-	def onAudioFrame(self, message: MQTTMessage, deviceUid: str):
+	def onAudioFrame(self, frame: memoryview, deviceUid: str):
 		if not self.enabled or not self._working.is_set():
 			return
 
-		with io.BytesIO(message.payload) as buffer:
-			try:
-				with wave.open(buffer, 'rb') as wav:
-					frame = wav.readframes(self.AudioServer.FRAMES_PER_BUFFER)
-					while frame:
-						self._buffer.put(frame)
-						frame = wav.readframes(self.AudioServer.FRAMES_PER_BUFFER)
-
-			except Exception as e:
-				self.logError(f'Error recording audio frame: {e}')
+		self._buffer.put(frame)
 
 
 	def worker(self):
@@ -17,10 +17,6 @@
 #
 #  Last modified: 2021.04.13 at 12:56:48 CEST
 
-import io
-import wave
-from paho.mqtt.client import MQTTMessage
-
 from core.commons import constants
 from core.dialog.model.DialogSession import DialogSession
 from core.voice.model.WakewordEngine import WakewordEngine
@@ -97,17 +93,11 @@ class PreciseWakeword(WakewordEngine):
 			self._handler.start()
 
 
-	def onAudioFrame(self, message: MQTTMessage, deviceUid: str):
+	def onAudioFrame(self, frame: memoryview, deviceUid: str):
 		if not self.enabled or not self._handler or self._handler.is_paused or self._stream is None:
 			return
 
-		with io.BytesIO(message.payload) as buffer:
-			try:
-				with wave.open(buffer, 'rb') as wav:
-					frame = wav.readframes(self.AudioServer.FRAMES_PER_BUFFER)
-					while frame:
-						self._stream.write(frame)
-						frame = wav.readframes(self.AudioServer.FRAMES_PER_BUFFER)
-
-			except Exception as e:
-				self.logError(f'Error recording audio frame: {e}')
+		try:
+			self._stream.write(frame.tobytes())
+		except Exception as e:
+			self.logError(f'Error recording audio frame: {e}')
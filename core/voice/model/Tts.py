@@ -21,12 +21,13 @@ import getpass
 import hashlib
 import re
 import tempfile
+import time
+import wave
 from pathlib import Path
-from pydub import AudioSegment
-from pydub.exceptions import CouldntDecodeError
 from re import Match
-from typing import Optional
+from typing import List, Optional
 
+from core.ProjectAliceExceptions import WorkerPoolFull
 from core.base.model.ProjectAliceObject import ProjectAliceObject
 from core.commons import constants
 from core.dialog.model.DialogSession import DialogSession
@@ -37,6 +38,9 @@ class Tts(ProjectAliceObject):
 	TEMP_ROOT = Path(tempfile.gettempdir(), '/tempTTS')
 	TTS = None
 	SPELL_OUT = re.compile(r'<say-as interpret-as=\"(?:spell-out|characters|verbatim)\">(.+)</say-as>')
+	SENTENCE_END = re.compile(r'(?<=[.!?;])\s+')
+	# Sentences shorter than this are synthesized along with the next one
+	MIN_SENTENCE_LENGTH = 20
 
 
 	def __init__(self, user: User = None, *args, **kwargs):
@@ -176,10 +180,36 @@ class Tts(ProjectAliceObject):
 		return hashlib.md5(string.encode('utf-8')).hexdigest()
 
 
-	def _speak(self, file: Path, session: DialogSession):
-		self._speaking = True
-		session.lastWasSoundPlayOnly = False
+	@staticmethod
+	def wavDuration(file: Path) -> float:
+		"""
+		Reads the duration of a wave file from its header, without decoding it
+		:param file:
+		:return: The duration in seconds
+		"""
+		with wave.open(str(file), 'rb') as wav:
+			frames = wav.getnframes()
+			frameSize = wav.getsampwidth() * wav.getnchannels()
+			rate = wav.getframerate()
+
+		if not frames and frameSize:
+			# Some encoders write the header before knowing the length
+			frames = (file.stat().st_size - 44) // frameSize
+
+		return round(frames / rate, 2)
+
 
+	def _duration(self, file: Path) -> Optional[float]:
+		try:
+			return self.wavDuration(file)
+		except (wave.Error, EOFError, OSError, ZeroDivisionError):
+			self.logError('Error decoding TTS file')
+			if file.exists():
+				file.unlink()
+			return None
+
+
+	def _play(self, file: Path, session: DialogSession):
 		self.MqttManager.playSound(
 			soundFilename=file.stem,
 			location=file.parent,
@@ -187,17 +217,77 @@ class Tts(ProjectAliceObject):
 			deviceUid=session.deviceUid
 		)
 
-		try:
-			duration = round(len(AudioSegment.from_file(file)) / 1000, 2)
-		except CouldntDecodeError:
-			self.logError('Error decoding TTS file')
-			file.unlink()
+
+	def _speak(self, file: Path, session: DialogSession):
+		self._speaking = True
+		session.lastWasSoundPlayOnly = False
+
+		duration = self._duration(file)
+		if duration is None:
 			self.onSay(session)
-		else:
-			self.DialogManager.increaseSessionTimeout(session=session, interval=duration + 1)
+			return
+
+		self._play(file=file, session=session)
+		self.DialogManager.increaseSessionTimeout(session=session, interval=duration + 1)
+
+		if session.deviceUid == self.DeviceManager.getMainDevice().uid:
+			self.ThreadManager.doLater(interval=duration + 0.2, func=self._sayFinished, args=[session])
+
+
+	def _speakSentences(self, sentences: List[str], session: DialogSession):
+		"""
+		Synthesizes and sends the sentences one by one, so that the device plays the first ones while the
+		next ones are synthesized. The device plays the chunks in the order they are received.
+		The caller is the mqtt thread, which also plays the main device audio, so synthesis runs on a worker
+		:param sentences:
+		:param session:
+		:return:
+		"""
+		self._speaking = True
+		session.lastWasSoundPlayOnly = False
+
+		try:
+			self.ThreadManager.submit(func=self._streamSentences, args=[sentences, session])
+		except (WorkerPoolFull, RuntimeError) as e:
+			self.logWarning(f'Cannot stream speech on a worker, speaking it at once: {e}')
+			self._streamSentences(sentences=sentences, session=session)
+
 
-			if session.deviceUid == self.DeviceManager.getMainDevice().uid:
-				self.ThreadManager.doLater(interval=duration + 0.2, func=self._sayFinished, args=[session])
+	def _streamSentences(self, sentences: List[str], session: DialogSession):
+		# A chunk starts playing when it is sent, or when the previous one ends if that is later
+		playbackEnd = time.monotonic()
+		played = False
+		for sentence in sentences:
+			if session.hasEnded:
+				break
+
+			text = self._cleanText(sentence)
+			if not text:
+				continue
+
+			cacheFile = self.cacheFile(text)
+			if not self.TTSManager.cache.lookup(cacheFile):
+				if not self._synthesize(text=text, cacheFile=cacheFile):
+					continue
+				self.TTSManager.cache.add(cacheFile)
+
+			duration = self._duration(cacheFile)
+			if duration is None:
+				continue
+
+			self._play(file=cacheFile, session=session)
+			played = True
+
+			now = time.monotonic()
+			playbackEnd = max(playbackEnd, now) + duration
+			self.DialogManager.increaseSessionTimeout(session=session, interval=playbackEnd - now + 1)
+
+		if not played:
+			self._speaking = False
+			return
+
+		if session.deviceUid == self.DeviceManager.getMainDevice().uid:
+			self.ThreadManager.doLater(interval=max(0.0, playbackEnd - time.monotonic()) + 0.2, func=self._sayFinished, args=[session])
 
 
 	def _sayFinished(self, session: DialogSession):
@@ -217,7 +307,10 @@ class Tts(ProjectAliceObject):
 
 
 	def _checkText(self, session: DialogSession) -> str:
-		text = session.payload['text']
+		return self._cleanText(session.payload['text'])
+
+
+	def _cleanText(self, text: str) -> str:
 		if not self._supportsSSML:
 			# We need to remove all ssml tags but transform some first
 			text = re.sub(self.SPELL_OUT, self._replaceSpellOuts, text)
@@ -228,19 +321,102 @@ class Tts(ProjectAliceObject):
 			return text
 
 
+	def _splitSentences(self, text: str) -> List[str]:
+		"""
+		Splits a plain text in sentences, merging the short ones with the next. Texts with markup are not split
+		:param text:
+		:return:
+		"""
+		if '<' in text:
+			return [text]
+
+		sentences = list()
+		current = ''
+		for sentence in self.SENTENCE_END.split(text.strip()):
+			current = f'{current} {sentence}' if current else sentence
+			if len(current) >= self.MIN_SENTENCE_LENGTH:
+				sentences.append(current)
+				current = ''
+
+		if current:
+			if sentences:
+				sentences[-1] = f'{sentences[-1]} {current}'
+			else:
+				sentences.append(current)
+
+		return sentences
+
+
 	@staticmethod
 	def _replaceSpellOuts(matching: Match) -> str:
 		return '<break time="160ms"/>'.join(matching.group(1))
 
 
+	def cacheFile(self, text: str) -> Path:
+		self.cacheDirectory().mkdir(parents=True, exist_ok=True)
+		return self.cacheDirectory() / (self._hash(text=text) + '.wav')
+
+
+	def _synthesize(self, text: str, cacheFile: Path) -> bool:
+		"""
+		Synthesizes the cleaned text to a wave file. Tts providers must redefine this method
+		:param text:
+		:param cacheFile:
+		:return: True if the file was written
+		"""
+		self.logError(f'{self.__class__.__name__} does not implement _synthesize')
+		return False
+
+
+	def precache(self, text: str) -> bool:
+		"""
+		Synthesizes a text to the cache, without playing it
+		:param text:
+		:return: True if the text had to be synthesized
+		"""
+		text = self._cleanText(text)
+		if not text:
+			return False
+
+		cacheFile = self.cacheFile(text)
+		if cacheFile.exists():
+			return False
+
+		# Synthesize aside and move in place once complete, the cache would otherwise serve a half written file to onSay
+		partFile = cacheFile.with_name(f'{cacheFile.stem}.part{cacheFile.suffix}')
+		try:
+			if not self._synthesize(text=text, cacheFile=partFile) or not partFile.exists():
+				return False
+			partFile.replace(cacheFile)
+		finally:
+			if partFile.exists():
+				partFile.unlink()
+
+		self.TTSManager.cache.add(cacheFile)
+		return True
+
+
 	def onSay(self, session: DialogSession) -> None:
 		"""
-		cleans the requested text for speaking if required and prepares the cache
-		Tts provides must redefine this method, but should call it at the start of their redefinition.
+		Cleans the requested text for speaking if required, synthesizes it unless it is cached and plays it
 		:param session:
 		:return:
 		"""
 		self._text = self._checkText(session)
-		if self._text:
-			self._cacheFile = self.cacheDirectory() / (self._hash(text=self._text) + '.wav')
-			self.cacheDirectory().mkdir(parents=True, exist_ok=True)
+		if not self._text:
+			return
+
+		sentences = self._splitSentences(session.payload['text'])
+		if len(sentences) > 1:
+			self._speakSentences(sentences=sentences, session=session)
+			return
+
+		self._cacheFile = self.cacheFile(self._text)
+		if self.TTSManager.cache.lookup(self._cacheFile):
+			self.logDebug(f'Using existing cached file **{self._cacheFile.stem}**')
+		elif self._synthesize(text=self._text, cacheFile=self._cacheFile):
+			self.TTSManager.cache.add(self._cacheFile)
+		else:
+			return
+
+		self._speak(file=self._cacheFile, session=session)
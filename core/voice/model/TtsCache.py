@@ -0,0 +1,210 @@
+#  Copyright (c) 2021
+#
+#  This file, TtsCache.py, is part of Project Alice.
+#
+#  Project Alice is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>
+#
+#  Last modified: 2026.10.18 at 20:30:22 CEST
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List
+
+from core.base.model.ProjectAliceObject import ProjectAliceObject
+
+
+class TtsCache(ProjectAliceObject):
+	"""
+	Index of the synthesized speech files, kept in least recently used order and persisted as a manifest
+	in the cache root. Files are evicted when they grow too old or the cache grows too big. Only the engine
+	folders are indexed, the cache root being shared with other files, such as the recorded user speech
+	"""
+
+	MANIFEST = 'ttsCache.json'
+
+
+	def __init__(self, root: Path, folders: List[str]):
+		super().__init__()
+		self._root = root
+		self._folders = folders
+		self._manifest = root / self.MANIFEST
+		self._lock = threading.Lock()
+		self._entries: Dict[str, List] = OrderedDict()  # relative path: [size, last used]
+		self._size = 0
+		self._dirty = False
+
+		self._hits = 0
+		self._misses = 0
+		self._evictions = 0
+
+
+	@property
+	def size(self) -> int:
+		return self._size
+
+
+	@property
+	def stats(self) -> dict:
+		with self._lock:
+			lookups = self._hits + self._misses
+			return {
+				'entries'  : len(self._entries),
+				'size'     : self._size,
+				'hits'     : self._hits,
+				'misses'   : self._misses,
+				'hitRate'  : self._hits / lookups if lookups else 0.0,
+				'evictions': self._evictions
+			}
+
+
+	def load(self):
+		"""
+		Loads the manifest, reconciled with the files actually on disk so that caches created before the
+		manifest existed, or files removed by hand, are accounted for
+		:return:
+		"""
+		known = dict()
+		try:
+			if self._manifest.exists():
+				known = json.loads(self._manifest.read_text())
+		except ValueError:
+			self.logWarning('Tts cache manifest is corrupted, rebuilding it')
+
+		entries = list()
+		for folder in self._folders:
+			if not (self._root / folder).is_dir():
+				continue
+
+			for file in (self._root / folder).rglob('*.wav'):
+				key = str(file.relative_to(self._root))
+				if key in known:
+					entries.append((key, known[key]))
+				else:
+					stat = file.stat()
+					entries.append((key, [stat.st_size, stat.st_mtime]))
+
+		entries.sort(key=lambda item: item[1][1])
+		with self._lock:
+			self._entries = OrderedDict(entries)
+			self._size = sum(size for size, _ in self._entries.values())
+			self._dirty = True
+
+
+	def save(self):
+		"""
+		Writes the manifest if it changed, through a temporary file so a crash never leaves it half written
+		:return:
+		"""
+		with self._lock:
+			if not self._dirty:
+				return
+			data = json.dumps(self._entries)
+			self._dirty = False
+
+		self._root.mkdir(parents=True, exist_ok=True)
+		tmp = self._manifest.with_suffix('.tmp')
+		tmp.write_text(data)
+		tmp.replace(self._manifest)
+
+
+	def lookup(self, file: Path) -> bool:
+		"""
+		Checks if a speech file is cached, counting the hit or miss and marking it as recently used
+		:param file:
+		:return:
+		"""
+		key = self._key(file)
+		with self._lock:
+			if key in self._entries and file.exists():
+				self._hits += 1
+				self._entries[key][1] = time.time()
+				self._entries.move_to_end(key)
+				self._dirty = True
+				return True
+
+			self._misses += 1
+			entry = self._entries.pop(key, None)
+			if entry:
+				self._size -= entry[0]
+				self._dirty = True
+
+		if file.exists():
+			# Cached before being indexed
+			self.add(file)
+			return True
+		return False
+
+
+	def add(self, file: Path):
+		"""
+		Indexes a freshly synthesized speech file
+		:param file:
+		:return:
+		"""
+		key = self._key(file)
+		if Path(key).parts[0] not in self._folders:
+			return
+
+		try:
+			size = file.stat().st_size
+		except OSError:
+			return
+
+		with self._lock:
+			entry = self._entries.pop(key, None)
+			if entry:
+				self._size -= entry[0]
+			self._entries[key] = [size, time.time()]
+			self._size += size
+			self._dirty = True
+
+
+	def evict(self, maxSize: int, maxAge: float = 0) -> int:
+		"""
+		Removes the files unused for more than maxAge seconds, then the least recently used ones until the cache fits in maxSize bytes
+		:param maxSize:
+		:param maxAge: 0 to not evict by age
+		:return: The number of removed files
+		"""
+		expired = list()
+		oldest = time.time() - maxAge if maxAge else 0
+		with self._lock:
+			for key, (size, lastUsed) in list(self._entries.items()):
+				if lastUsed >= oldest and self._size <= maxSize:
+					break
+				self._entries.pop(key)
+				self._size -= size
+				expired.append(key)
+
+			if expired:
+				self._evictions += len(expired)
+				self._dirty = True
+
+		for key in expired:
+			try:
+				(self._root / key).unlink()
+			except OSError:
+				pass  # Already gone
+
+		return len(expired)
+
+
+	def _key(self, file: Path) -> str:
+		try:
+			return str(file.relative_to(self._root))
+		except ValueError:
+			return str(file)
@@ -34,11 +34,18 @@ class WakewordEngine(ProjectAliceObject):
 		self.logInfo(f'Starting **{self.NAME}**')
 		self._enabled = True
 
+		# Only engines implementing onAudioFrame(frame, deviceUid) get the frames
+		if 'onAudioFrame' in self.eventHandlerNames():
+			self.AudioServer.subscribeAudioFrames(callback=self.onAudioFrame)
+
 
 	def onStop(self, **kwargs):
 		self.logInfo(f'Stopping **{self.NAME}**')
 		self._enabled = False
 
+		if 'onAudioFrame' in self.eventHandlerNames():
+			self.AudioServer.unsubscribeAudioFrames(callback=self.onAudioFrame)
+
 
 	@property
 	def enabled(self) -> bool:
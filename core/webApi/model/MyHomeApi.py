@@ -269,7 +269,7 @@ class MyHomeApi(Api):
 				ffile.save(f'{self.Commons.rootDir()}/core/webApi/static/images/floors/0000_{int(time.time())}.png')
 				return jsonify(success=True)
 		except Exception as e:
-			self.logError('Error saving new floor tile:', str(e))
+			self.logError(f'Error saving new floor tile: {e}')
 			return jsonify(success=False, message=str(e))
 
 
@@ -39,7 +39,9 @@ class TelemetryApi(Api):
 			historyFrom = request.args.get('historyFrom', None)
 			historyTo = request.args.get('historyTo', None)
 			getAll = request.args.get('all', False)
-			rows = self.TelemetryManager.getData(ttype=ttype, deviceId=deviceId, locationId=locationId, historyTo=historyTo, historyFrom=historyFrom, everything=getAll)
+			points = request.args.get('points', None)
+			resolution = request.args.get('resolution', None)
+			rows = self.TelemetryManager.getData(ttype=ttype, deviceId=deviceId, locationId=locationId, historyTo=historyTo, historyFrom=historyFrom, everything=getAll, points=int(points) if points else None, resolution=resolution)
 			return jsonify(rows)
 		except Exception as e:
 			self.logError(f'Failed getting telemetry data: {e}')
@@ -49,4 +51,19 @@ class TelemetryApi(Api):
 	@route('/overview/', methods=['GET'])
 	@ApiAuthenticated
 	def getOverview(self) -> Response:
-		return jsonify(self.TelemetryManager.getAllCombinationsForAPI())
+		try:
+			ttype = request.args.get('telemetryType', None)
+			locationId = request.args.get('locationId', None)
+			return jsonify(self.TelemetryManager.getAllCombinationsForAPI(
+				ttype=TelemetryType(ttype) if ttype else None,
+				locationId=int(locationId) if locationId else None
+			))
+		except Exception as e:
+			self.logError(f'Failed getting telemetry overview: {e}')
+			return jsonify(success=False, message=str(e))
+
+
+	@route('/stats/', methods=['GET'])
+	@ApiAuthenticated
+	def getStats(self) -> Response:
+		return jsonify(self.TelemetryManager.bufferStats)
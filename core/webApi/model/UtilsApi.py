@@ -40,7 +40,7 @@ class UtilsApi(Api):
 	@ApiAuthenticated
 	def restart(self) -> Response:
 		try:
-			self.ThreadManager.doLater(interval=2, func=self.ProjectAlice.doRestart)
+			self.ThreadManager.doLater(interval=2, func=self.ProjectAlice.doRestart, pool='io')
 			return jsonify(success=True)
 		except Exception as e:
 			self.logError(f'Failed restarting Alice: {e}')
@@ -51,7 +51,7 @@ class UtilsApi(Api):
 	@ApiAuthenticated
 	def reboot(self) -> Response:
 		try:
-			self.ThreadManager.doLater(interval=2, func=self.Commons.runRootSystemCommand, args=[['shutdown', '-r', 'now']])
+			self.ThreadManager.doLater(interval=2, func=self.Commons.runRootSystemCommand, args=[['shutdown', '-r', 'now']], pool='io')
 			return jsonify(success=True)
 		except Exception as e:
 			self.logError(f'Failed rebooting device: {e}')
@@ -127,6 +127,46 @@ class UtilsApi(Api):
 		)
 
 
+	@route('/timers/', methods=['GET'])
+	@ApiAuthenticated
+	def timers(self) -> Response:
+		try:
+			return jsonify(success=True, stats=self.ThreadManager.timerStats)
+		except Exception as e:
+			self.logError(f'Failed retrieving timer stats: {e}')
+			return jsonify(success=False, message=str(e))
+
+
+	@route('/pools/', methods=['GET'])
+	@ApiAuthenticated
+	def pools(self) -> Response:
+		try:
+			return jsonify(success=True, stats=self.ThreadManager.poolStats)
+		except Exception as e:
+			self.logError(f'Failed retrieving worker pool stats: {e}')
+			return jsonify(success=False, message=str(e))
+
+
+	@route('/skillStartup/', methods=['GET'])
+	@ApiAuthenticated
+	def skillStartup(self) -> Response:
+		try:
+			return jsonify(success=True, report=self.SkillManager.startupReport)
+		except Exception as e:
+			self.logError(f'Failed retrieving skill startup report: {e}')
+			return jsonify(success=False, message=str(e))
+
+
+	@route('/ttsCache/', methods=['GET'])
+	@ApiAuthenticated
+	def ttsCache(self) -> Response:
+		try:
+			return jsonify(success=True, stats=self.TTSManager.cache.stats)
+		except Exception as e:
+			self.logError(f'Failed retrieving tts cache stats: {e}')
+			return jsonify(success=False, message=str(e))
+
+
 	@route('/i18n/', methods=['GET'])
 	def i18n(self) -> Response:
 		return jsonify(success=True, data=self.LanguageManager.loadWebUIStrings())
@@ -174,7 +214,7 @@ class UtilsApi(Api):
 	def wipeAll(self) -> Response:
 		try:
 			self.ProjectAlice.wipeAll()
-			self.ThreadManager.doLater(interval=2, func=self.ProjectAlice.doRestart)
+			self.ThreadManager.doLater(interval=2, func=self.ProjectAlice.doRestart, pool='io')
 			return jsonify(success=True)
 		except Exception as e:
 			self.logError(f'Failed wiping system: {e}')
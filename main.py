@@ -47,9 +47,11 @@ except:
 	# Do nothing, this is only for debug server, advanced stuff
 	pass
 
+import atexit
 import logging.handlers
 from datetime import datetime
 from core.util.model import FileFormatting, BashFormatting
+from core.util.model.AsyncLogHandler import AsyncLogHandler
 
 _logger = logging.getLogger('ProjectAlice')
 _logger.setLevel(logging.INFO)
@@ -67,9 +69,11 @@ logFileHandler.setFormatter(logFileFormatter)
 rotatingHandler.setFormatter(logFileFormatter)
 streamHandler.setFormatter(bashFormatter)
 
-_logger.addHandler(logFileHandler)
-_logger.addHandler(rotatingHandler)
-_logger.addHandler(streamHandler)
+# Handlers run on the log listener thread, logging callers only queue their records
+asyncLogHandler = AsyncLogHandler(logFileHandler, rotatingHandler, streamHandler)
+asyncLogHandler.start()
+atexit.register(asyncLogHandler.stop)
+_logger.addHandler(asyncLogHandler)
 
 from core.Initializer import Initializer
 
@@ -87,7 +91,7 @@ from core.util.model.MqttLoggingHandler import MqttLoggingHandler
 htmlFormatter = HtmlFormatting.Formatter()
 mqttHandler = MqttLoggingHandler()
 #mqttHandler.setFormatter(htmlFormatter)
-_logger.addHandler(mqttHandler)
+asyncLogHandler.addHandler(mqttHandler)
 
 
 def exceptionListener(*exc_info):  # NOSONAR
@@ -150,6 +154,7 @@ def main():
 			projectAlice.onStop()
 
 	_logger.info('[Project Alice]                     Shutdown completed, see you soon!')
+	asyncLogHandler.stop()
 	if projectAlice.restart:
 		time.sleep(3)
 		restartProcess()
@@ -17,7 +17,11 @@
 #
 #  Last modified: 2021.04.13 at 12:56:50 CEST
 
+import threading
 import unittest
+from unittest import mock
+
+from core.asr.model.Asr import Asr
 
 
 class TestAsr(unittest.TestCase):
@@ -46,6 +50,38 @@ class TestAsr(unittest.TestCase):
 		pass # Nothing to test
 
 
+	@mock.patch('core.base.SuperManager.SuperManager.getInstance')
+	def test_contexts(self, mock_superManager):
+		mock_superManager.return_value.ThreadManager.newEvent.side_effect = lambda name: threading.Event()
+		asr = Asr()
+		asr._logger = mock.MagicMock()
+		kitchen = asr.newContext(mock.MagicMock(deviceUid='kitchen', sessionId='a'))
+		bedroom = asr.newContext(mock.MagicMock(deviceUid='bedroom', sessionId='b'))
+		kitchen.recorder.startRecording()
+		bedroom.recorder.startRecording()
+
+		# Each device has its own recorder, timeout and trigger state
+		self.assertIsNot(kitchen.recorder, bedroom.recorder)
+		self.assertIsNot(kitchen.timeout, bedroom.timeout)
+		asr.onVadUp('kitchen')
+		self.assertTrue(kitchen.triggered)
+		self.assertFalse(bedroom.triggered)
+		asr.timeout('bedroom')
+		self.assertTrue(bedroom.timeout.is_set())
+		self.assertFalse(kitchen.timeout.is_set())
+
+		# A new session of a device ends its previous one only
+		kitchenAgain = asr.newContext(mock.MagicMock(deviceUid='kitchen', sessionId='c'))
+		self.assertIs(asr.context('kitchen'), kitchenAgain)
+		self.assertFalse(kitchen.recorder.isRecording)
+		self.assertTrue(bedroom.recorder.isRecording)
+
+		asr.end('bedroom')
+		self.assertIsNone(asr.context('bedroom'))
+		self.assertFalse(bedroom.recorder.isRecording)
+		self.assertIs(asr.context('kitchen'), kitchenAgain)
+
+
 	def test_end(self):
 		pass # Nothing to test
 
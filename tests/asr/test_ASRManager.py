@@ -17,7 +17,13 @@
 #
 #  Last modified: 2021.04.13 at 12:56:50 CEST
 
+import threading
+import time
 import unittest
+from unittest import mock
+
+from core.ProjectAliceExceptions import WorkerPoolFull
+from core.asr.ASRManager import ASRManager
 
 
 class TestASRManager(unittest.TestCase):
@@ -46,8 +52,98 @@ class TestASRManager(unittest.TestCase):
 		pass # Nothing to test
 
 
-	def test_on_start_listening(self):
-		pass # Nothing to test
+	@mock.patch('core.base.SuperManager.SuperManager.getInstance')
+	def test_on_start_listening(self, mock_superManager):
+		superManager = mock_superManager.return_value
+		manager = ASRManager.__new__(ASRManager)
+		manager._logger = mock.MagicMock()
+		manager._asr = mock.MagicMock()
+		manager._streams = dict()
+		session = mock.MagicMock(deviceUid='kitchen', sessionId='session')
+
+		manager.onStartListening(session)
+		superManager.ThreadManager.submit.assert_called_once()
+		self.assertIn('kitchen', manager._streams)
+		manager._asr.newContext.return_value.recorder.startRecording.assert_called_once()
+
+		# The decode can't be queued, the recording must not go on forever
+		for error in (WorkerPoolFull(message='full'), RuntimeError('shut down')):
+			superManager.reset_mock()
+			manager._asr.reset_mock()
+			superManager.ThreadManager.submit.side_effect = error
+
+			manager.onStartListening(session)
+			manager._asr.end.assert_called_once_with('kitchen')
+			self.assertNotIn('kitchen', manager._streams)
+			superManager.MqttManager.endDialog.assert_called_once()
+
+		# Engines capturing the audio on their own get no recorder
+		superManager.reset_mock()
+		superManager.ThreadManager.submit.side_effect = None
+		manager._asr.reset_mock()
+		manager._asr.usesRecorder = False
+		manager.onStartListening(session)
+		superManager.ThreadManager.submit.assert_called_once()
+		manager._asr.newContext.assert_not_called()
+		self.assertNotIn('kitchen', manager._streams)
+
+
+	@mock.patch('core.base.SuperManager.SuperManager.getInstance')
+	def test_update_decode_limit(self, mock_superManager):
+		superManager = mock_superManager.return_value
+		manager = ASRManager.__new__(ASRManager)
+		manager._asr = mock.MagicMock(supportsConcurrency=True)
+
+		superManager.ConfigManager.getAliceConfigByName.return_value = 3
+		manager.updateDecodeLimit()
+		self.assertEqual(manager._decodeLimit, 3)
+		for _ in range(3):
+			self.assertTrue(manager._decodeSlots.acquire(blocking=False))
+		self.assertFalse(manager._decodeSlots.acquire(blocking=False))
+
+		superManager.ConfigManager.getAliceConfigByName.return_value = 0
+		manager.updateDecodeLimit()
+		self.assertEqual(manager._decodeLimit, 1)
+
+		# Engines sharing their recognizer decode one session at a time
+		superManager.ConfigManager.getAliceConfigByName.return_value = 3
+		manager._asr.supportsConcurrency = False
+		manager.updateDecodeLimit()
+		self.assertEqual(manager._decodeLimit, 1)
+
+
+	def test_decode(self):
+		manager = ASRManager.__new__(ASRManager)
+		manager._decodeLimit = 1
+		manager._decodeSlots = threading.BoundedSemaphore(1)
+		manager._decodeStatsLock = threading.Lock()
+		manager._activeDecodes = 0
+		manager._queuedDecodes = 0
+		manager._asr = mock.MagicMock()
+		release = threading.Event()
+		manager._asr.decodeStream.side_effect = lambda session: release.wait(2) and session.deviceUid
+
+		results = list()
+		threads = [threading.Thread(target=lambda uid=uid: results.append(manager._decode(mock.MagicMock(deviceUid=uid, hasEnded=False)))) for uid in ('kitchen', 'bedroom')]
+		for thread in threads:
+			thread.start()
+
+		# One session decodes, the other waits for the slot
+		deadline = time.monotonic() + 2
+		while manager.decodeStats != {'limit': 1, 'active': 1, 'queued': 1} and time.monotonic() < deadline:
+			time.sleep(0.01)
+		self.assertEqual(manager.decodeStats, {'limit': 1, 'active': 1, 'queued': 1})
+
+		release.set()
+		for thread in threads:
+			thread.join(2)
+		self.assertEqual(sorted(results), ['bedroom', 'kitchen'])
+		self.assertEqual(manager.decodeStats, {'limit': 1, 'active': 0, 'queued': 0})
+
+		# Ended sessions are not decoded once they get a slot
+		manager._asr.reset_mock()
+		self.assertIsNone(manager._decode(mock.MagicMock(hasEnded=True)))
+		manager._asr.decodeStream.assert_not_called()
 
 
 	def test_on_stop_listening(self):
@@ -0,0 +1,77 @@
+#  Copyright (c) 2021
+#
+#  This file, test_ConfigStore.py, is part of Project Alice.
+#
+#  Project Alice is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>
+#
+#  Last modified: 2026.10.18 at 20:42:41 CEST
+
+import json
+import tempfile
+import time
+from pathlib import Path
+from unittest import TestCase, mock
+
+from core.base.model.ConfigStore import ConfigStore
+
+
+class TestConfigStore(TestCase):
+
+	@mock.patch('core.base.SuperManager.SuperManager.getInstance')
+	def test_save(self, mock_superManager):
+		with tempfile.TemporaryDirectory() as directory:
+			path = Path(directory, 'config.json')
+			store = ConfigStore(path, flushDelay=0.1)
+
+			for i in range(10):
+				store.save({'value': i})
+
+			self.assertTrue(store.pending)
+			self.assertFalse(path.exists())
+
+			time.sleep(0.5)
+			self.assertFalse(store.pending)
+			self.assertEqual(json.loads(path.read_text()), {'value': 9})
+			self.assertEqual(store.stats, {'saves': 10, 'writes': 1})
+			self.assertEqual(list(Path(directory).iterdir()), [path])
+
+
+	@mock.patch('core.base.SuperManager.SuperManager.getInstance')
+	def test_flush(self, mock_superManager):
+		with tempfile.TemporaryDirectory() as directory:
+			path = Path(directory, 'config.json')
+			store = ConfigStore(path, flushDelay=60)
+
+			store.save({'b': 1, 'a': 'é'})
+			store.flush()
+			self.assertFalse(store.pending)
+			self.assertEqual(path.read_text(), '{\n\t"a": "\\u00e9",\n\t"b": 1\n}')
+
+			store.flush()
+			self.assertEqual(store.stats['writes'], 1)
+
+
+	@mock.patch('core.base.SuperManager.SuperManager.getInstance')
+	def test_discard(self, mock_superManager):
+		with tempfile.TemporaryDirectory() as directory:
+			path = Path(directory, 'config.json')
+			store = ConfigStore(path, flushDelay=0.1)
+
+			store.save({'value': 1})
+			store.discard()
+			self.assertFalse(store.pending)
+
+			time.sleep(0.3)
+			self.assertFalse(path.exists())
+			self.assertEqual(store.stats['writes'], 0)
@@ -0,0 +1,65 @@
+#  Copyright (c) 2021
+#
+#  This file, test_IntentRouter.py, is part of Project Alice.
+#
+#  Project Alice is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>
+#
+#  Last modified: 2026.10.18 at 20:56:53 CEST
+
+from unittest import TestCase
+
+from core.base.model.AliceSkill import AliceSkill
+from core.base.model.Intent import Intent
+from core.base.model.IntentRouter import IntentRouter
+
+
+class RoutedSkill(AliceSkill):
+
+	# noinspection PyMissingConstructor
+	def __init__(self, intents: list):
+		self._supportedIntents = {str(intent): intent for intent in intents}
+
+
+class FilteringSkill(RoutedSkill):
+
+	def filterIntent(self, session):
+		return None
+
+
+class TestIntentRouter(TestCase):
+
+	def test_route(self):
+		weather = Intent('GetWeather')
+		catchAll = Intent('hermes/intent/#', userIntent=False)
+		anyWeather = Intent('hermes/intent/+', userIntent=False)
+
+		router = IntentRouter({
+			'Clock'    : RoutedSkill([Intent('GetTime')]),
+			'Logger'   : RoutedSkill([catchAll]),
+			'Custom'   : FilteringSkill([weather]),
+			'Weather'  : RoutedSkill([anyWeather, weather]),
+			'Forecast' : RoutedSkill([Intent('GetWeather')])
+		})
+
+		self.assertEqual(router.stats, {'topics': 2, 'wildcards': 2, 'custom': 1})
+
+		routes = router.route('hermes/intent/GetWeather')
+		self.assertEqual([skillName for skillName, _ in routes], ['Logger', 'Custom', 'Weather', 'Forecast'])
+		self.assertIs(routes[0][1], catchAll)
+		self.assertIsNone(routes[1][1])
+		# The exact topic is more specific than the wildcard, as AliceSkill.filterIntent would pick
+		self.assertIs(routes[2][1], weather)
+
+		self.assertEqual([skillName for skillName, _ in router.route('hermes/intent/GetTime')], ['Clock', 'Logger', 'Custom', 'Weather'])
+		self.assertEqual([skillName for skillName, _ in router.route('hermes/hotword/default/detected')], ['Custom'])
@@ -0,0 +1,82 @@
+#  Copyright (c) 2021
+#
+#  This file, test_LazyManager.py, is part of Project Alice.
+#
+#  Project Alice is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>
+#
+#  Last modified: 2026.10.18 at 20:54:18 CEST
+
+from unittest import TestCase, mock
+
+from core.base.model.LazyManager import LazyManager
+
+
+class SleepyManager(object):
+	instances = 0
+
+
+	def __init__(self):
+		SleepyManager.instances += 1
+		self.started = False
+		self.booted = False
+		self.state = 'working'
+
+
+	def onStart(self):
+		self.started = True
+
+
+	def onBooted(self):
+		self.booted = True
+
+
+	def onQuarterHour(self):
+		return 'refreshed'
+
+
+class TestLazyManager(TestCase):
+
+	@mock.patch('core.base.SuperManager.SuperManager.getInstance')
+	def test_load(self, mock_superManager):
+		superManager = mock.MagicMock()
+		superManager.isBooted = True
+		mock_superManager.return_value = superManager
+		SleepyManager.instances = 0
+
+		proxy = LazyManager(name='SleepyManager', module=__name__, events=['onQuarterHour'], idle={'state': 'idle'})
+		self.assertEqual(proxy.name, 'SleepyManager')
+		self.assertFalse(proxy.loaded)
+		self.assertFalse(proxy.isActive)
+		self.assertEqual(proxy.eventHandlerNames(), frozenset({'onQuarterHour'}))
+		self.assertEqual(proxy.state, 'idle')
+
+		proxy.onStart()
+		proxy.onStop()
+		handler = proxy.onQuarterHour
+		self.assertEqual(SleepyManager.instances, 0)
+
+		# The sender gets its thread back at once, the manager loads and gets the event on a worker
+		self.assertIsNone(handler())
+		self.assertFalse(proxy.loaded)
+		job = superManager.ThreadManager.submit.call_args.kwargs
+		with mock.patch.object(SleepyManager, 'onQuarterHour', autospec=True, return_value='refreshed') as onQuarterHour:
+			job['func'](*job['args'])
+			onQuarterHour.assert_called_once()
+
+		self.assertTrue(proxy.loaded)
+		self.assertEqual(proxy.state, 'working')
+		self.assertTrue(proxy.started)
+		self.assertTrue(proxy.booted)
+		self.assertEqual(SleepyManager.instances, 1)
+		superManager.replaceManager.assert_called_once_with(name='SleepyManager', manager=proxy.load())
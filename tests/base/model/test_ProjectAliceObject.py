@@ -19,6 +19,8 @@
 
 from unittest import TestCase
 
+from core.base.model.ProjectAliceObject import ProjectAliceObject
+
 
 class TestProjectAliceObject(TestCase):
 
@@ -26,6 +28,22 @@ class TestProjectAliceObject(TestCase):
 		pass  # To be implemented or nothing to test
 
 
+	def test_event_handler_names(self):
+		class Listener(ProjectAliceObject):
+			@property
+			def online(self):
+				return True
+
+			def onAudioFrame(self, **kwargs):
+				pass
+
+			def onEvent(self, event: str, **kwargs):
+				pass
+
+		self.assertEqual(ProjectAliceObject.eventHandlerNames(), frozenset())
+		self.assertEqual(Listener.eventHandlerNames(), frozenset({'onAudioFrame', 'onEvent'}))
+
+
 	def test_check_dependencies(self):
 		pass  # To be implemented or nothing to test
 
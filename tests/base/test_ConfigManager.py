@@ -17,7 +17,12 @@
 #
 #  Last modified: 2021.04.13 at 12:56:50 CEST
 
-from unittest import TestCase
+import json
+import tempfile
+from pathlib import Path
+from unittest import TestCase, mock
+
+from core.ProjectAliceExceptions import ConfigurationUpdateFailed
 
 
 class TestConfigManager(TestCase):
@@ -38,6 +43,32 @@ class TestConfigManager(TestCase):
 		pass  # To be implemented or nothing to test()
 
 
+	@mock.patch('core.base.SuperManager.SuperManager.getInstance')
+	def test_cast_alice_configuration(self, mock_superManager):
+		from core.base.ConfigManager import ConfigManager
+
+		configManager = ConfigManager.__new__(ConfigManager)
+		configManager._logger = mock.MagicMock()
+		configManager._aliceTemplateConfigurations = {
+			'debug'      : {'dataType': 'boolean', 'defaultValue': False},
+			'asrTimeout' : {'dataType': 'integer', 'defaultValue': 10},
+			'sensitivity': {'dataType': 'range', 'defaultValue': 0.5, 'min': 0, 'max': 1},
+			'quality'    : {'dataType': 'range', 'defaultValue': 10, 'min': 1, 'max': 10},
+			'tts'        : {'dataType': 'list', 'defaultValue': 'pico'}
+		}
+
+		self.assertIs(configManager.castAliceConfiguration('debug', 'On'), True)
+		self.assertIs(configManager.castAliceConfiguration('debug', 0), False)
+		self.assertEqual(configManager.castAliceConfiguration('asrTimeout', '15'), 15)
+		self.assertEqual(configManager.castAliceConfiguration('sensitivity', '0.3'), 0.3)
+		self.assertEqual(configManager.castAliceConfiguration('quality', '7'), 7)
+		self.assertEqual(configManager.castAliceConfiguration('tts', 'amazon'), 'amazon')
+
+		for key, value in (('debug', 'maybe'), ('asrTimeout', 'ten'), ('sensitivity', 2)):
+			with self.assertRaises(ConfigurationUpdateFailed):
+				configManager.castAliceConfiguration(key, value)
+
+
 	def test_bulk_update_alice_configurations(self):
 		pass  # To be implemented or nothing to test()
 
@@ -98,8 +129,43 @@ class TestConfigManager(TestCase):
 		pass  # To be implemented or nothing to test()
 
 
-	def test_load_check_and_update_skill_configurations(self):
-		pass  # To be implemented or nothing to test()
+	@mock.patch('core.base.SuperManager.SuperManager.getInstance')
+	def test_load_check_and_update_skill_configurations(self, mock_superManager):
+		from core.base.ConfigManager import ConfigManager
+		from core.base.model.ConfigStore import ConfigStore
+
+		with tempfile.TemporaryDirectory() as directory:
+			skillDirectory = Path(directory)
+			(skillDirectory / 'config.json').write_text(json.dumps({'units': 'metric'}))
+			(skillDirectory / 'config.json.template').write_text(json.dumps({'units': {'defaultValue': 'metric'}}))
+			skill = mock.MagicMock()
+			skill.getResource.side_effect = lambda name: skillDirectory / name
+			mock_superManager.return_value.SkillManager.activeSkills = {'Weather': skill}
+
+			configManager = ConfigManager.__new__(ConfigManager)
+			configManager._logger = mock.MagicMock()
+			configManager._skillsConfigurations = dict()
+			configManager._skillsTemplateConfigurations = dict()
+			configManager._skillsConfigStores = {'Weather': ConfigStore(skillDirectory / 'config.json', flushDelay=60)}
+
+			# A change still waiting to be saved is not lost by reading the file
+			configManager._skillsConfigStores['Weather'].save({'units': 'imperial'})
+			configManager.loadCheckAndUpdateSkillConfigurations(skillToLoad='Weather')
+			self.assertEqual(configManager._skillsConfigurations['Weather'], {'units': 'imperial'})
+			self.assertFalse(configManager._skillsConfigStores['Weather'].pending)
+
+
+	@mock.patch('core.base.SuperManager.SuperManager.getInstance')
+	def test_on_skill_deleted(self, mock_superManager):
+		from core.base.ConfigManager import ConfigManager
+
+		configManager = ConfigManager.__new__(ConfigManager)
+		store = mock.MagicMock()
+		configManager._skillsConfigStores = {'Weather': store}
+
+		configManager.onSkillDeleted(skill='Weather')
+		store.discard.assert_called_once()
+		self.assertEqual(configManager._skillsConfigStores, dict())
 
 
 	def test__new_skill_config_file(self):
@@ -17,7 +17,10 @@
 #
 #  Last modified: 2021.04.13 at 12:56:50 CEST
 
-from unittest import TestCase
+import threading
+from unittest import TestCase, mock
+
+from core.base.SkillManager import SkillManager
 
 
 class TestSkillManager(TestCase):
@@ -102,6 +105,31 @@ class TestSkillManager(TestCase):
 		pass  # To be implemented or nothing to test()
 
 
+	def test_intent_router(self):
+		skillManager = SkillManager.__new__(SkillManager)
+		skillManager._activeSkills = dict()
+		skillManager._skillEventHandlers = dict()
+		skillManager._intentRouter = None
+		skillManager._intentRouterVersion = 0
+		skillManager._intentRouterLock = threading.Lock()
+
+		def build(skills: dict):
+			# A skill finishes starting on another thread while the table is being built
+			if build.first:
+				build.first = False
+				skillManager.invalidateSkillEventRegistry()
+			return mock.MagicMock()
+
+		build.first = True
+		with mock.patch('core.base.SkillManager.IntentRouter', side_effect=build):
+			outdated = skillManager.intentRouter
+			self.assertIsNone(skillManager._intentRouter)
+
+			router = skillManager.intentRouter
+			self.assertIsNot(router, outdated)
+			self.assertIs(skillManager.intentRouter, router)
+
+
 	def test_on_stop(self):
 		pass  # To be implemented or nothing to test()
 
@@ -110,8 +138,28 @@ class TestSkillManager(TestCase):
 		pass  # To be implemented or nothing to test()
 
 
-	def test_start_all_skills(self):
-		pass  # To be implemented or nothing to test()
+	@mock.patch('core.base.SuperManager.SuperManager.getInstance')
+	def test_start_all_skills(self, mock_superManager):
+		mock_superManager.return_value.ConfigManager.getAliceConfigByName.return_value = 2
+		skillManager = SkillManager.__new__(SkillManager)
+		skillManager._logger = mock.MagicMock()
+		skillManager._startupReport = {'init': 0.0, 'start': 0.0, 'workers': 0, 'skills': dict()}
+		skillManager._activeSkills = {'Weather': mock.MagicMock(installer=dict()), 'Clock': mock.MagicMock(installer=dict())}
+		skillManager.startSkill = lambda skillName: [f'{skillName}Intent']
+
+		pools = list()
+		startupPool = skillManager._startupPool
+		skillManager._startupPool = lambda: pools.append(startupPool()) or pools[-1]
+
+		skillManager.startAllSkills()
+		skillManager.startAllSkills()
+
+		self.assertEqual(sorted(skillManager._supportedIntents), ['ClockIntent', 'WeatherIntent'])
+		# Every run gets a fresh pool, shut down once the run is over
+		self.assertEqual(len(pools), 2)
+		self.assertIsNot(pools[0], pools[1])
+		self.assertTrue(all(pool.isShutdown for pool in pools))
+		mock_superManager.return_value.ThreadManager.newPool.assert_not_called()
 
 
 	def test__start_skill(self):
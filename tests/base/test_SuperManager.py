@@ -17,11 +17,49 @@
 #
 #  Last modified: 2021.04.13 at 12:56:50 CEST
 
-from unittest import TestCase
+from unittest import TestCase, mock
+
+from core.base.SuperManager import SuperManager
+from core.base.model.ProjectAliceObject import ProjectAliceObject
+
+
+class DummyManager(ProjectAliceObject):
+
+	def __init__(self, name: str):
+		super().__init__()
+		self.name = name
+
+
+class ListeningManager(DummyManager):
+
+	def onAudioFrame(self, **kwargs):
+		pass
 
 
 class TestSuperManager(TestCase):
 
+	def test_build_event_registry(self):
+		superManager = SuperManager(mock.MagicMock())
+		superManager._managers = {
+			'AudioManager' : ListeningManager('AudioManager'),
+			'TimeManager'  : DummyManager('TimeManager'),
+			'DialogManager': ListeningManager('DialogManager'),
+			'DeadManager'  : None
+		}
+		superManager.buildEventRegistry()
+
+		self.assertNotIn('DeadManager', superManager.managers)
+		self.assertEqual([name for name, _ in superManager.getEventHandlers('onAudioFrame')], ['DialogManager', 'AudioManager'])
+		self.assertEqual(superManager.getEventHandlers('onFullMinute'), list())
+
+
+	def test_get_event_handlers_before_registry(self):
+		superManager = SuperManager(mock.MagicMock())
+		superManager._managers = {'AudioManager': ListeningManager('AudioManager')}
+
+		self.assertEqual([name for name, _ in superManager.getEventHandlers('onAudioFrame')], ['AudioManager'])
+
+
 	def test_on_start(self):
 		pass  # To be implemented or nothing to test()
 
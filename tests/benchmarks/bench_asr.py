@@ -0,0 +1,178 @@
+#  Copyright (c) 2021
+#
+#  This file, bench_asr.py, is part of Project Alice.
+#
+#  Project Alice is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>
+#
+#  Last modified: 2026.10.18 at 20:35:50 CEST
+
+"""
+Load test of the ASR pipeline with several devices talking at once. Audio frames travel the mqtt path,
+from AudioServer.dispatchAudioFrame to the session recorders, and are decoded by an engine which,
+like the native decoders, spends its time outside of the GIL.
+
+Run with: python -m tests.benchmarks.bench_asr
+"""
+
+import io
+import threading
+import time
+import uuid
+import wave
+from unittest import mock
+
+from core.asr.ASRManager import ASRManager
+from core.asr.model.ASRResult import ASRResult
+from core.asr.model.Asr import Asr
+from core.commons import constants
+from core.dialog.model.DialogSession import DialogSession
+from core.server.AudioServer import AudioManager
+from core.util.model.AliceEvent import AliceEvent
+from core.util.model.WorkerPool import WorkerPool
+
+
+FRAME_SAMPLES = 512
+FRAME_INTERVAL = 0.032
+DECODE_COST = 0.012
+
+
+class BenchAsr(Asr):
+	NAME = 'Bench Asr'
+
+
+	def __init__(self):
+		super().__init__()
+		self._supportsConcurrency = True
+
+
+	def onVadDown(self, deviceUid: str):
+		context = self.context(deviceUid)
+		if context:
+			context.recorder.stopRecording()
+
+
+	def decodeStream(self, session: DialogSession) -> ASRResult:
+		context = self.startDecoding(session)
+		received = 0
+
+		with context.recorder as recorder:
+			for chunk in recorder:
+				if not chunk:
+					break
+
+				received += len(chunk)
+				time.sleep(DECODE_COST)
+
+		self.end(session.deviceUid)
+		return ASRResult(text=f'{received} bytes', session=session, likelihood=1.0, processingTime=0)
+
+
+def wavFrame() -> bytes:
+	with io.BytesIO() as buffer:
+		with wave.open(buffer, 'wb') as wav:
+			wav.setnchannels(1)
+			wav.setsampwidth(2)
+			wav.setframerate(16000)
+			wav.writeframes(b'\x00\x01' * FRAME_SAMPLES)
+		return buffer.getvalue()
+
+
+def run(getInstance: mock.MagicMock, devices: int, limit: int, frames: int):
+	superManager = mock.MagicMock()
+	getInstance.return_value = superManager
+	config = {'asrTimeout': 30, 'asrMaxConcurrentDecodes': limit, 'recordAudioAfterWakeword': False}
+	superManager.ConfigManager.getAliceConfigByName.side_effect = lambda configName: config.get(configName, None)
+	superManager.LanguageManager.overrideLanguage = False
+	superManager.WakewordRecorder.state = None
+
+	audioPool = WorkerPool(name='audio', maxWorkers=devices)
+	superManager.ThreadManager.submit.side_effect = lambda func, pool, priority, args: audioPool.submit(func=func, args=args, priority=priority)
+	superManager.ThreadManager.newEvent.side_effect = AliceEvent
+
+	audioServer = AudioManager.__new__(AudioManager)
+	audioServer._audioFrameSubscribers = dict()
+	audioServer._audioFrameSubscribersLock = threading.Lock()
+	audioServer._audioFrameFormats = dict()
+	audioServer._assumedFormatFrames = dict()
+	audioServer._droppedAudioFrames = dict()
+	superManager.AudioManager = audioServer
+
+	asrManager = ASRManager.__new__(ASRManager)
+	asrManager._logger = mock.MagicMock()
+	asrManager._asr = BenchAsr()
+	asrManager._streams = dict()
+	asrManager._decodeStatsLock = threading.Lock()
+	asrManager._activeDecodes = 0
+	asrManager._queuedDecodes = 0
+	asrManager.updateDecodeLimit()
+	superManager.ASRManager = asrManager
+
+	speechEnded = dict()
+	latencies = list()
+	done = threading.Semaphore(0)
+
+	def published(topic: str, payload: dict = None, **_kwargs):
+		if topic != constants.TOPIC_TEXT_CAPTURED:
+			return
+		latencies.append(time.perf_counter() - speechEnded[payload['sessionId']])
+		done.release()
+
+	superManager.MqttManager.publish.side_effect = published
+
+	payload = wavFrame()
+
+	def talk(session: DialogSession):
+		asrManager.onStartListening(session)
+		asrManager.onVadUp(session.deviceUid)
+		start = time.perf_counter()
+		for i in range(frames):
+			audioServer.dispatchAudioFrame(session.deviceUid, payload)
+			time.sleep(max(0.0, start + (i + 1) * FRAME_INTERVAL - time.perf_counter()))
+		speechEnded[session.sessionId] = time.perf_counter()
+		asrManager.onVadDown(session.deviceUid)
+
+	sessions = list()
+	for i in range(devices):
+		session = mock.MagicMock()
+		session.deviceUid = f'device{i}'
+		session.sessionId = str(uuid.uuid4())
+		session.hasEnded = False
+		session.user = constants.UNKNOWN_USER
+		sessions.append(session)
+
+	start = time.perf_counter()
+	talkers = [threading.Thread(target=talk, args=[session]) for session in sessions]
+	for talker in talkers:
+		talker.start()
+	for talker in talkers:
+		talker.join()
+	for _ in sessions:
+		done.acquire()
+	total = time.perf_counter() - start
+	audioPool.shutdown()
+
+	latencies.sort()
+	print(f'{devices:>8} {limit:>6} {total:>10.2f} {devices / total:>10.2f} {sum(latencies) / len(latencies) * 1000:>10.0f} {latencies[-1] * 1000:>10.0f}')
+
+
+def main():
+	print(f'{"devices":>8} {"limit":>6} {"total s":>10} {"utt/s":>10} {"avg ms":>10} {"max ms":>10}')
+	with mock.patch('core.base.SuperManager.SuperManager.getInstance') as getInstance:
+		for devices in (1, 4, 8, 16):
+			for limit in sorted({min(devices, limit) for limit in (1, 2, 4, devices)}):
+				run(getInstance=getInstance, devices=devices, limit=limit, frames=60)
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,114 @@
+#  Copyright (c) 2021
+#
+#  This file, bench_broadcast.py, is part of Project Alice.
+#
+#  Project Alice is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>
+#
+#  Last modified: 2026.10.18 at 20:11:52 CEST
+
+"""
+Micro benchmark of ProjectAliceObject.broadcast, comparing the event registry against the
+previous getattr scan over every manager and skill.
+
+Run from the project root: python -m tests.benchmarks.bench_broadcast
+"""
+
+import timeit
+from unittest import mock
+
+from core.base.SkillManager import SkillManager
+from core.base.SuperManager import SuperManager
+from core.base.model.ProjectAliceObject import ProjectAliceObject
+
+
+class BenchManager(ProjectAliceObject):
+
+	def __init__(self, name: str):
+		super().__init__()
+		self.name = name
+
+
+class ListeningManager(BenchManager):
+
+	def onAudioFrame(self, **kwargs):
+		pass
+
+
+class BenchSkill(ProjectAliceObject):
+	pass
+
+
+class ListeningSkill(BenchSkill):
+
+	def onAudioFrame(self, **kwargs):
+		pass
+
+
+def legacyBroadcast(superManager: SuperManager, skills: dict, method: str, exceptions: list, **kwargs):
+	"""
+	The dispatch as it was before the registry, minus the mqtt part that audio frames skip anyway
+	"""
+	func = getattr(superManager.getManager('DialogManager'), method, None)
+	if func:
+		func(**kwargs)
+
+	for name, man in superManager.managers.copy().items():
+		if man.name in exceptions:
+			continue
+		func = getattr(man, method, None)
+		if func:
+			func(**kwargs)
+
+	for skillName, skillInstance in skills.items():
+		func = getattr(skillInstance, method, None)
+		if func:
+			func(**kwargs)
+
+		func = getattr(skillInstance, 'onEvent', None)
+		if func:
+			func(event=method, **kwargs)
+
+
+def run(managerCount: int, skillCount: int, number: int = 2000):
+	superManager = SuperManager(mock.MagicMock())
+	managers = {'DialogManager': BenchManager('DialogManager')}
+	for i in range(managerCount - 1):
+		klass = ListeningManager if i % 10 == 0 else BenchManager
+		managers[f'Manager{i}'] = klass(f'Manager{i}')
+	superManager._managers = managers
+	superManager.buildEventRegistry()
+
+	skillManager = SkillManager.__new__(SkillManager)
+	skillManager._logger = mock.MagicMock()
+	skillManager._activeSkills = {f'Skill{i}': ListeningSkill() if i % 10 == 0 else BenchSkill() for i in range(skillCount)}
+	skillManager.invalidateSkillEventRegistry()
+	superManager.SkillManager = skillManager
+
+	broadcaster = managers['DialogManager']
+	payload = b'\x00' * 640
+
+	legacy = timeit.timeit(lambda: legacyBroadcast(superManager, skillManager.activeSkills, 'onAudioFrame', ['DialogManager'], message=payload, deviceUid='bench'), number=number)
+	registry = timeit.timeit(lambda: broadcaster.broadcast(method='audioFrame', exceptions=['DialogManager'], propagateToSkills=True, message=payload, deviceUid='bench'), number=number)
+
+	print(f'{managerCount:>8} {skillCount:>8} {legacy / number * 1e6:>14.2f} {registry / number * 1e6:>16.2f} {legacy / registry:>8.1f}x')
+
+
+def main():
+	print(f'{"managers":>8} {"skills":>8} {"legacy µs/call":>14} {"registry µs/call":>16} {"speedup":>9}')
+	for managerCount, skillCount in ((35, 10), (35, 40), (35, 100), (70, 200), (140, 400)):
+		run(managerCount=managerCount, skillCount=skillCount)
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,78 @@
+#  Copyright (c) 2021
+#
+#  This file, bench_callers.py, is part of Project Alice.
+#
+#  Project Alice is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>
+#
+#  Last modified: 2026.10.18 at 20:40:31 CEST
+
+"""
+Compares the cost of finding out who called, the inspect.stack() way and the cached sys._getframe way,
+at several call stack depths.
+
+Run with: python -m tests.benchmarks.bench_callers
+"""
+
+import inspect
+import timeit
+
+from core.commons.CommonsManager import CommonsManager
+
+
+def legacyGetFunctionCaller(depth: int = 3) -> str:
+	return inspect.getmodulename(inspect.stack()[depth][1])
+
+
+def legacyGetFunctionCallers() -> list:
+	return [str(inspect.getmodulename(frame[1])).lower() for frame in inspect.stack()]
+
+
+def cachedGetFunctionCaller(depth: int = 3) -> str:
+	return CommonsManager.getFunctionCaller(depth=depth + 1)
+
+
+def cachedGetFunctionCallers() -> list:
+	return [str(caller).lower() for caller in CommonsManager.getFunctionCallers(depth=1)]
+
+
+def nest(depth: int, func):
+	if depth:
+		return nest(depth - 1, func)
+	return func()
+
+
+def run(stackDepth: int, number: int):
+	results = list()
+	for legacy, cached in (
+		(legacyGetFunctionCaller, cachedGetFunctionCaller),
+		(legacyGetFunctionCallers, cachedGetFunctionCallers)
+	):
+		assert nest(stackDepth, legacy) == nest(stackDepth, cached)
+		results.append((
+			timeit.timeit(lambda: nest(stackDepth, legacy), number=number) / number * 1e6,
+			timeit.timeit(lambda: nest(stackDepth, cached), number=number) / number * 1e6
+		))
+
+	print(f'{stackDepth:>8}' + ''.join(f' {legacy:>10.2f} {cached:>10.2f} {legacy / cached:>7.1f}x' for legacy, cached in results))
+
+
+def main():
+	print(f'{"":>8} {"getFunctionCaller µs":^29} {"whole stack µs":^29}')
+	print(f'{"frames":>8}' + f' {"legacy":>10} {"cached":>10} {"speedup":>8}' * 2)
+	for stackDepth in (5, 20, 50):
+		run(stackDepth=stackDepth, number=200)
+
+
+if __name__ == '__main__':
+	main()
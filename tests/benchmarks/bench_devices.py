@@ -0,0 +1,129 @@
+#  Copyright (c) 2021
+#
+#  This file, bench_devices.py, is part of Project Alice.
+#
+#  Project Alice is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>
+#
+#  Last modified: 2026.10.18 at 20:22:39 CEST
+
+"""
+Micro benchmark of the DeviceManager lookups, comparing the device index against the
+previous linear scans over every device.
+
+Run from the project root: python -m tests.benchmarks.bench_devices
+"""
+
+import timeit
+import uuid
+from typing import List, Optional
+from unittest import mock
+
+from core.device.DeviceManager import DeviceManager
+from core.device.model.DeviceAbility import DeviceAbility
+from core.device.model.DeviceIndex import DeviceIndex
+
+
+class BenchDevice(object):
+
+	def __init__(self, deviceId: int, abilities: int, locationId: int, skillName: str):
+		self.id = deviceId
+		self.uid = str(uuid.uuid4())
+		self.parentLocation = locationId
+		self.skillName = skillName
+		self.deviceType = skillName
+		self.connected = deviceId % 3 != 0
+		self._abilities = abilities
+
+
+	def getAbilities(self) -> int:
+		return self._abilities
+
+
+	def hasAbilities(self, abilities: List[DeviceAbility]) -> bool:
+		check = DeviceIndex.abilityMask(abilities)
+		return self._abilities & check == check
+
+
+def legacyGetDevice(devices: dict, uid: str) -> Optional[BenchDevice]:
+	ret = None
+	for device in devices.values():
+		if device.uid == uid:
+			ret = device
+	return ret
+
+
+def legacyGetDevicesWithAbilities(devices: dict, abilities: List[DeviceAbility], connectedOnly: bool = True) -> List[BenchDevice]:
+	ret = list()
+	for device in devices.values():
+		if connectedOnly and not device.connected:
+			continue
+
+		if device.hasAbilities(abilities):
+			ret.append(device)
+
+	return ret
+
+
+def legacyGetMainDevice(devices: dict) -> Optional[BenchDevice]:
+	try:
+		return legacyGetDevicesWithAbilities(devices, abilities=[DeviceAbility.IS_CORE], connectedOnly=False)[0]
+	except:
+		return None
+
+
+def run(deviceCount: int, number: int = 2000):
+	masks = (
+		DeviceAbility.IS_SATELITTE | DeviceAbility.CAPTURE_SOUND | DeviceAbility.PLAY_SOUND,
+		DeviceAbility.NONE,
+		DeviceAbility.DISPLAY,
+		DeviceAbility.ALERT | DeviceAbility.NOTIFY
+	)
+
+	deviceManager = DeviceManager.__new__(DeviceManager)
+	deviceManager._devices = dict()
+	deviceManager._deviceIndex = DeviceIndex()
+	deviceManager.loadingDone = True
+
+	for i in range(deviceCount):
+		abilities = DeviceAbility.IS_CORE | DeviceAbility.PLAY_SOUND | DeviceAbility.CAPTURE_SOUND if i == deviceCount - 1 else masks[i % len(masks)]
+		device = BenchDevice(deviceId=i + 1, abilities=abilities.value, locationId=i % 20, skillName=f'Skill{i % 15}')
+		deviceManager._devices[device.id] = device
+		deviceManager._deviceIndex.add(device)
+
+	devices = deviceManager._devices
+	uid = devices[deviceCount // 2].uid
+	abilities = [DeviceAbility.IS_SATELITTE]
+
+	results = list()
+	for legacy, indexed in (
+		(lambda: legacyGetDevice(devices, uid), lambda: deviceManager.getDevice(uid=uid)),
+		(lambda: legacyGetMainDevice(devices), deviceManager.getMainDevice),
+		(lambda: legacyGetDevicesWithAbilities(devices, abilities), lambda: deviceManager.getDevicesWithAbilities(abilities))
+	):
+		assert legacy() == indexed()
+		results.append((timeit.timeit(legacy, number=number) / number * 1e6, timeit.timeit(indexed, number=number) / number * 1e6))
+
+	print(f'{deviceCount:>8}' + ''.join(f' {legacy:>10.2f} {indexed:>10.2f} {legacy / indexed:>7.1f}x' for legacy, indexed in results))
+
+
+def main():
+	print(f'{"":>8} {"getDevice(uid) µs":^29} {"getMainDevice µs":^29} {"getDevicesWithAbilities µs":^29}')
+	print(f'{"devices":>8}' + f' {"legacy":>10} {"index":>10} {"speedup":>8}' * 3)
+	with mock.patch('core.base.SuperManager.SuperManager.getInstance'):
+		for deviceCount in (50, 200, 500, 1000, 2000):
+			run(deviceCount=deviceCount)
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,127 @@
+#  Copyright (c) 2021
+#
+#  This file, bench_dispatch.py, is part of Project Alice.
+#
+#  Project Alice is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>
+#
+#  Last modified: 2026.10.18 at 20:55:59 CEST
+
+"""
+Compares intent dispatch latency through the SkillManager intent routing table against the previous
+scan matching the intent topic against every intent of every active skill.
+
+Run from the project root: python -m tests.benchmarks.bench_dispatch
+"""
+
+import random
+import threading
+import timeit
+from types import SimpleNamespace
+from unittest import mock
+
+from core.base.SkillManager import SkillManager
+from core.base.model.AliceSkill import AliceSkill
+from core.base.model.Intent import Intent
+from core.util.model.Logger import Logger
+
+
+class BenchSkill(AliceSkill):
+
+	# noinspection PyMissingConstructor
+	def __init__(self, name: str, intents: list):
+		self._name = name
+		self._active = True
+		self._logger = Logger(prepend=f'[{name}]')
+		self._supportedIntents = {str(intent): intent for intent in intents}
+
+
+def consume(session) -> bool:
+	return True
+
+
+def ignore(session) -> bool:
+	return False
+
+
+def buildSkills(skillCount: int, intentCount: int, wildcards: int) -> dict:
+	skills = dict()
+	perSkill = intentCount // skillCount
+	for skillIndex in range(skillCount):
+		intents = [Intent(f'skill{skillIndex}Intent{intentIndex}', fallbackFunction=consume) for intentIndex in range(perSkill)]
+		# Catch all subscriptions that look at every intent and let them through
+		if skillIndex < wildcards:
+			intents.append(Intent('hermes/intent/#', userIntent=False, fallbackFunction=ignore))
+		skills[f'Skill{skillIndex}'] = BenchSkill(name=f'Skill{skillIndex}', intents=intents)
+	return skills
+
+
+def legacyDispatch(skillManager: SkillManager, session) -> bool:
+	"""
+	The dispatch as it was before the routing table, minus error handling
+	"""
+	for skillName, skillInstance in skillManager.activeSkills.items():
+		if skillInstance.onMessageDispatch(session):
+			if skillManager.MultiIntentManager.isProcessing(session.sessionId):
+				skillManager.MultiIntentManager.processNextIntent(session=session)
+			return True
+
+	if skillManager.MultiIntentManager.isProcessing(session.sessionId):
+		skillManager.MultiIntentManager.processNextIntent(session=session)
+		return True
+
+	return False
+
+
+def run(skillCount: int, intentCount: int, wildcards: int, number: int):
+	skills = buildSkills(skillCount=skillCount, intentCount=intentCount, wildcards=wildcards)
+
+	skillManager = SkillManager.__new__(SkillManager)
+	skillManager._logger = Logger(prepend='[SkillManager]')
+	skillManager._activeSkills = skills
+	skillManager._skillEventHandlers = dict()
+	skillManager._intentRouter = None
+	skillManager._intentRouterVersion = 0
+	skillManager._intentRouterLock = threading.Lock()
+
+	topics = [str(intent) for skill in skills.values() for intent in skill.supportedIntents if '#' not in str(intent)]
+	random.seed(0)
+	sessions = list()
+	for _ in range(number):
+		topic = random.choice(topics)
+		sessions.append(SimpleNamespace(message=SimpleNamespace(topic=topic), intentName=topic, sessionId='bench', currentState='', user='bench'))
+
+	for session in sessions[:50]:
+		assert legacyDispatch(skillManager, session) and skillManager.dispatchMessage(session)
+
+	legacy = timeit.timeit(lambda: [legacyDispatch(skillManager, session) for session in sessions], number=1) / number * 1e6
+	routed = timeit.timeit(lambda: [skillManager.dispatchMessage(session) for session in sessions], number=1) / number * 1e6
+
+	skillManager.invalidateSkillEventRegistry()
+	build = timeit.timeit(lambda: skillManager.intentRouter, number=1) * 1e3
+
+	print(f'{skillCount:>7} {intentCount:>8} {wildcards:>10} {legacy:>11.2f} {routed:>11.2f} {legacy / routed:>8.1f}x {build:>9.2f}')
+
+
+def main():
+	with mock.patch('core.base.SuperManager.SuperManager.getInstance') as mock_superManager:
+		mock_superManager.return_value.MultiIntentManager.isProcessing.return_value = False
+
+		print(f'{"skills":>7} {"intents":>8} {"wildcards":>10} {"legacy µs":>11} {"routed µs":>11} {"speedup":>9} {"build ms":>9}')
+		run(skillCount=50, intentCount=1000, wildcards=0, number=5000)
+		run(skillCount=50, intentCount=1000, wildcards=3, number=5000)
+		run(skillCount=10, intentCount=100, wildcards=0, number=5000)
+
+
+if __name__ == '__main__':
+	main()
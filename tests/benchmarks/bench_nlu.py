@@ -0,0 +1,113 @@
+#  Copyright (c) 2021
+#
+#  This file, bench_nlu.py, is part of Project Alice.
+#
+#  Project Alice is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>
+#
+#  Last modified: 2026.10.18 at 20:47:21 CEST
+
+"""
+Compares building the NLU training dataset from scratch, the way it was done before skill fragments were cached,
+with the first build filling the cache and the incremental build after a single utterance was added to one skill.
+
+Run with: python -m tests.benchmarks.bench_nlu
+"""
+
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+from unittest import mock
+
+from core.nlu.model.SnipsNlu import SnipsNlu
+
+
+def skillTemplate(name: str, intents: int, utterances: int) -> dict:
+	return {
+		'skill'    : name,
+		'slotTypes': [{
+			'name'                   : f'{name}Thing',
+			'automaticallyExtensible': True,
+			'matchingStrictness'     : None,
+			'useSynonyms'            : True,
+			'values'                 : [{'value': f'thing {i}', 'synonyms': [f'item {i}']} for i in range(20)]
+		}],
+		'intents'  : [{
+			'name'      : f'{name}Intent{i}',
+			'slots'     : [{'name': 'Thing', 'type': f'{name}Thing'}, {'name': 'When', 'type': 'snips/datetime'}],
+			'utterances': [f'please do {{thing {j}:=>Thing}} number {j} of {i} {{tomorrow:=>When}}' if j % 2 else f'do number {j} of intent {i}' for j in range(utterances)]
+		} for i in range(intents)]
+	}
+
+
+def legacyConvert(snipsNlu: SnipsNlu, dialogTemplate: list, file: Path = None) -> dict:
+	nluTrainingSample = {'language': snipsNlu.getLanguage(), 'entities': dict(), 'intents': dict()}
+	for skill in dialogTemplate:
+		fragment = snipsNlu.convertSkillTemplate(skill)
+		nluTrainingSample['entities'].update(fragment['entities'])
+		nluTrainingSample['intents'].update(fragment['intents'])
+
+	if file:
+		with file.open('w') as fp:
+			json.dump(nluTrainingSample, fp, ensure_ascii=False)
+
+	return nluTrainingSample
+
+
+def run(skills: int, intents: int = 10, utterances: int = 40):
+	with tempfile.TemporaryDirectory() as directory:
+		root = Path(directory)
+		snipsNlu = SnipsNlu.__new__(SnipsNlu)
+		snipsNlu._logger = mock.MagicMock()
+		snipsNlu._cachePath = root / 'trainingData'
+		snipsNlu._cachePath.mkdir()
+		snipsNlu._fragmentsPath = root / 'fragments'
+
+		templates = [skillTemplate(f'Skill{i}', intents, utterances) for i in range(skills)]
+		dataFile = root / 'data.json'
+		dataFile.write_text(json.dumps(templates))
+
+		start = time.perf_counter()
+		legacyConvert(snipsNlu, json.loads(dataFile.read_text()), snipsNlu._cachePath / 'en.json')
+		legacyTime = time.perf_counter() - start
+
+		start = time.perf_counter()
+		snipsNlu.convertDialogTemplate(dataFile)
+		coldTime = time.perf_counter() - start
+
+		skill = random.choice(templates)
+		skill['intents'][0]['utterances'].append('one more way to say it')
+		dataFile.write_text(json.dumps(templates))
+
+		start = time.perf_counter()
+		snipsNlu.convertDialogTemplate(dataFile)
+		incrementalTime = time.perf_counter() - start
+
+		legacy = legacyConvert(snipsNlu, templates)
+		assert json.loads((snipsNlu._cachePath / 'en.json').read_text()) == json.loads(json.dumps(legacy, ensure_ascii=False))
+
+	print(f'{skills:>8} {skills * intents * utterances:>12} {legacyTime * 1000:>12.1f} {coldTime * 1000:>12.1f} {incrementalTime * 1000:>12.1f} {legacyTime / incrementalTime:>8.1f}x')
+
+
+def main():
+	print(f'{"skills":>8} {"utterances":>12} {"full ms":>12} {"cold ms":>12} {"one edit ms":>12} {"speedup":>9}')
+	with mock.patch('core.base.SuperManager.SuperManager.getInstance') as getInstance:
+		getInstance.return_value.LanguageManager.activeLanguage = 'en'
+		for skills in (10, 40, 80):
+			run(skills=skills)
+
+
+if __name__ == '__main__':
+	main()
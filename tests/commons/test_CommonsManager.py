@@ -32,6 +32,15 @@ class TestCommonsManager(unittest.TestCase):
 		self.assertEqual(CommonsManager.getFunctionCaller(1), 'test_CommonsManager')
 
 
+	def test_getFunctionCallers(self):
+		def nested():
+			return CommonsManager.getFunctionCallers(depth=1, count=2)
+
+		self.assertEqual(nested(), ['test_CommonsManager', 'test_CommonsManager'])
+		self.assertEqual(CommonsManager.getFunctionCallers(depth=1)[0], 'test_CommonsManager')
+		self.assertEqual(CommonsManager.getFunctionCallers(depth=10000), list())
+
+
 	@mock.patch('core.commons.CommonsManager.CommonsManager.LanguageManager')
 	def test_isEqualTranslated(self, mock_LanguageManager):
 		commonsManager = CommonsManager()
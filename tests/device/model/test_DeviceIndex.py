@@ -0,0 +1,83 @@
+#  Copyright (c) 2021
+#
+#  This file, test_DeviceIndex.py, is part of Project Alice.
+#
+#  Project Alice is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>
+#
+#  Last modified: 2026.10.18 at 20:22:57 CEST
+
+from unittest import TestCase, mock
+
+from core.device.model.DeviceAbility import DeviceAbility
+from core.device.model.DeviceIndex import DeviceIndex
+
+
+class TestDeviceIndex(TestCase):
+
+	@staticmethod
+	def device(deviceId: int, uid: str, abilities: int, locationId: int = 1, skillName: str = 'AliceCore') -> mock.MagicMock:
+		device = mock.MagicMock()
+		device.id = deviceId
+		device.uid = uid
+		device.getAbilities.return_value = abilities
+		device.parentLocation = locationId
+		device.skillName = skillName
+		return device
+
+
+	def test_add(self):
+		index = DeviceIndex()
+		core = self.device(1, 'core', DeviceAbility.IS_CORE | DeviceAbility.PLAY_SOUND)
+		satellite = self.device(2, 'satellite', DeviceAbility.IS_SATELITTE | DeviceAbility.PLAY_SOUND, locationId=2, skillName='AliceSatellite')
+		index.add(core)
+		index.add(satellite)
+
+		self.assertEqual(len(index), 2)
+		self.assertIs(index.mainDevice, core)
+		self.assertIs(index.getByUid('satellite'), satellite)
+		self.assertIsNone(index.getByUid('unknown'))
+		self.assertEqual(index.withAbilities([DeviceAbility.PLAY_SOUND]), [core, satellite])
+		self.assertEqual(index.withAbilities([DeviceAbility.IS_SATELITTE, DeviceAbility.PLAY_SOUND]), [satellite])
+		self.assertEqual(index.byLocation(2), [satellite])
+		self.assertEqual(index.bySkill('AliceCore'), [core])
+
+
+	def test_update(self):
+		index = DeviceIndex()
+		satellite = self.device(2, 'satellite', DeviceAbility.IS_SATELITTE, locationId=2)
+		index.add(satellite)
+
+		satellite.uid = 'paired'
+		satellite.parentLocation = 3
+		index.update(satellite)
+		self.assertIsNone(index.getByUid('satellite'))
+		self.assertIs(index.getByUid('paired'), satellite)
+		self.assertEqual(index.byLocation(2), list())
+		self.assertEqual(index.byLocation(3), [satellite])
+
+		# Unknown devices are not indexed by update
+		index.update(self.device(3, 'other', DeviceAbility.NONE))
+		self.assertIsNone(index.getByUid('other'))
+
+
+	def test_remove(self):
+		index = DeviceIndex()
+		core = self.device(1, 'core', DeviceAbility.IS_CORE)
+		index.add(core)
+		index.remove(core)
+
+		self.assertEqual(len(index), 0)
+		self.assertIsNone(index.mainDevice)
+		self.assertIsNone(index.getByUid('core'))
+		self.assertEqual(index.withAbilities([DeviceAbility.IS_CORE]), list())
@@ -0,0 +1,83 @@
+#  Copyright (c) 2021
+#
+#  This file, test_HeartbeatTracker.py, is part of Project Alice.
+#
+#  Project Alice is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>
+#
+#  Last modified: 2026.10.18 at 20:25:16 CEST
+
+import threading
+from unittest import TestCase, mock
+
+from core.device.model.HeartbeatTracker import HeartbeatTracker
+
+
+class TestHeartbeatTracker(TestCase):
+
+	@mock.patch('core.device.model.HeartbeatTracker.time.monotonic')
+	def test_expired(self, mockMonotonic):
+		mockMonotonic.return_value = 100
+		tracker = HeartbeatTracker(onTimeout=mock.MagicMock())
+		tracker.beat('a', 10)
+		tracker.beat('b', 20)
+		tracker.beat('c', 30)
+		self.assertEqual(len(tracker), 3)
+
+		mockMonotonic.return_value = 105
+		tracker.beat('a', 10)
+		tracker.remove('c')
+
+		self.assertEqual(tracker.expired(now=112), list())
+		self.assertEqual(tracker.expired(now=114), list())
+		self.assertEqual(tracker.expired(now=121), ['a', 'b'])
+		self.assertEqual(tracker.expired(now=140), list())
+		self.assertEqual(len(tracker), 0)
+
+		tracker.beat('c', 10)
+		self.assertEqual(tracker.expired(now=110), list())
+		self.assertEqual(tracker.expired(now=115), ['c'])
+
+
+	def test_run(self):
+		timedOut = threading.Event()
+		tracker = HeartbeatTracker(onTimeout=lambda uid: timedOut.set())
+		thread = threading.Thread(target=tracker.run, daemon=True)
+		thread.start()
+
+		tracker.beat('a', 0.05)
+		self.assertTrue(timedOut.wait(2))
+
+		tracker.stop()
+		thread.join(2)
+		self.assertFalse(thread.is_alive())
+
+
+	def test_restart(self):
+		timedOut = threading.Event()
+		tracker = HeartbeatTracker(onTimeout=lambda uid: timedOut.set())
+		thread = threading.Thread(target=tracker.run, daemon=True)
+		thread.start()
+		tracker.stop()
+		thread.join(2)
+		self.assertFalse(thread.is_alive())
+
+		tracker.start()
+		thread = threading.Thread(target=tracker.run, daemon=True)
+		thread.start()
+		tracker.beat('a', 0.05)
+		self.assertTrue(timedOut.wait(2))
+
+		tracker.stop()
+		thread.join(2)
+		self.assertFalse(thread.is_alive())
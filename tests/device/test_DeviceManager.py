@@ -17,7 +17,11 @@
 #
 #  Last modified: 2021.04.13 at 12:56:51 CEST
 
-from unittest import TestCase
+import threading
+from unittest import TestCase, mock
+
+from core.device.DeviceManager import DeviceManager
+from core.device.model.Device import Device
 
 
 class TestDeviceManager(TestCase):
@@ -42,6 +46,63 @@ class TestDeviceManager(TestCase):
 		pass  # To be implemented or nothing to test()
 
 
+	@mock.patch('core.base.SuperManager.SuperManager.getInstance')
+	def test_flush_devices(self, mock_instance):
+		deviceManager = DeviceManager.__new__(DeviceManager)
+		deviceManager._logger = mock.MagicMock()
+		deviceManager._name = 'DeviceManager'
+		deviceManager._dirtyDevices = dict()
+		deviceManager._dirtyDevicesLock = threading.Lock()
+		deviceManager._saveTimer = None
+		deviceManager.databaseInsertMany = mock.MagicMock()
+		mock_instance().DeviceManager = deviceManager
+
+		device = Device.__new__(Device)
+		device._id = 1
+		device._uid = 'uid'
+		device._parentLocation = 1
+		device._typeName = 'type'
+		device._skillName = 'skill'
+		device._settings = dict()
+		device._deviceParams = dict()
+		device._deviceConfigs = dict()
+		device._dirty = False
+		device.publishDevice = mock.MagicMock()
+		deviceManager._devices = {1: device}
+
+		for _ in range(5):
+			device.markDirty()
+
+		mock_instance().ThreadManager.newTimer.assert_called_once()
+		deviceManager.flushDevices()
+
+		deviceManager.databaseInsertMany.assert_called_once_with(tableName=DeviceManager.DB_DEVICE, query=Device.REPLACE_QUERY, values=[device.toDBValues()])
+		device.publishDevice.assert_called_once()
+		self.assertFalse(device.dirty)
+
+		# Devices saved explicitly in the meantime are not written again
+		deviceManager.databaseInsertMany.reset_mock()
+		device.markDirty()
+		device.saveToDB()
+		mock_instance().DatabaseManager.replace.assert_called_once_with(tableName=DeviceManager.DB_DEVICE, query=Device.REPLACE_QUERY, callerName='DeviceManager', values=device.toDBValues())
+		deviceManager.flushDevices()
+		deviceManager.databaseInsertMany.assert_not_called()
+
+		# A failed write keeps the device dirty and queued for the next flush
+		deviceManager.databaseInsertMany.side_effect = Exception('database locked')
+		device.markDirty()
+		deviceManager.flushDevices()
+		self.assertTrue(device.dirty)
+		self.assertIn(1, deviceManager._dirtyDevices)
+
+		deviceManager.databaseInsertMany.side_effect = None
+		deviceManager.databaseInsertMany.reset_mock()
+		deviceManager.flushDevices()
+		deviceManager.databaseInsertMany.assert_called_once()
+		self.assertFalse(device.dirty)
+		self.assertEqual(deviceManager._dirtyDevices, dict())
+
+
 	def test_device_message(self):
 		pass  # To be implemented or nothing to test()
 
@@ -17,7 +17,20 @@
 #
 #  Last modified: 2021.04.13 at 12:56:51 CEST
 
-from unittest import TestCase
+import json
+import tempfile
+from pathlib import Path
+from unittest import TestCase, mock
+
+from core.nlu.model.SnipsNlu import SnipsNlu
+
+
+def skillTemplate(name: str, utterances: list) -> dict:
+	return {
+		'skill'    : name,
+		'slotTypes': [{'name': 'Color', 'automaticallyExtensible': False, 'matchingStrictness': None, 'useSynonyms': True, 'values': [{'value': name}]}],
+		'intents'  : [{'name': f'{name}Intent', 'slots': [{'name': 'Color', 'type': 'Color'}, {'name': 'When', 'type': 'snips/datetime'}], 'utterances': utterances}]
+	}
 
 
 class TestSnipsNlu(TestCase):
@@ -30,8 +43,42 @@ class TestSnipsNlu(TestCase):
 		pass  # To be implemented or nothing to test()
 
 
-	def test_convert_dialog_template(self):
-		pass  # To be implemented or nothing to test()
+	@mock.patch('core.base.SuperManager.SuperManager.getInstance')
+	def test_convert_dialog_template(self, mock_superManager):
+		mock_superManager.return_value.LanguageManager.activeLanguage = 'en'
+
+		with tempfile.TemporaryDirectory() as directory:
+			root = Path(directory)
+			snipsNlu = SnipsNlu.__new__(SnipsNlu)
+			snipsNlu._logger = mock.MagicMock()
+			snipsNlu._cachePath = root / 'trainingData'
+			snipsNlu._cachePath.mkdir()
+			snipsNlu._fragmentsPath = root / 'fragments'
+
+			templates = [skillTemplate('A', ['turn {red:=>Color}']), skillTemplate('B', ['hello {tomorrow:=>When}']), skillTemplate('C', ['bye'])]
+			dataFile = root / 'data.json'
+			dataFile.write_text(json.dumps(templates))
+
+			with mock.patch.object(snipsNlu, 'convertSkillTemplate', wraps=snipsNlu.convertSkillTemplate) as convert:
+				snipsNlu.convertDialogTemplate(dataFile)
+				self.assertEqual(convert.call_count, 3)
+				full = json.loads((snipsNlu._cachePath / 'en.json').read_text())
+
+				templates[1]['intents'][0]['utterances'].append('hi')
+				del templates[2]
+				dataFile.write_text(json.dumps(templates))
+				snipsNlu.convertDialogTemplate(dataFile)
+				self.assertEqual(convert.call_count, 4)
+				updated = json.loads((snipsNlu._cachePath / 'en.json').read_text())
+				self.assertEqual(sorted(path.name for path in (snipsNlu._fragmentsPath / 'en').iterdir()), ['A.json', 'B.json', 'index.json'])
+
+		# Last skill defining an entity wins, as in a full conversion
+		self.assertEqual(full['entities']['Color']['data'], [{'value': 'C', 'synonyms': []}])
+		self.assertEqual(full['entities']['snips/datetime'], dict())
+		self.assertEqual(full['intents']['AIntent']['utterances'], [{'data': [{'text': 'turn '}, {'entity': 'Color', 'slot_name': 'Color', 'text': 'red'}, {'text': ''}]}])
+		self.assertEqual(sorted(full['intents']), ['AIntent', 'BIntent', 'CIntent'])
+		self.assertEqual(sorted(updated['intents']), ['AIntent', 'BIntent'])
+		self.assertEqual(len(updated['intents']['BIntent']['utterances']), 2)
 
 
 	def test_train(self):
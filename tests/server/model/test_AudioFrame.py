@@ -0,0 +1,81 @@
+#  Copyright (c) 2021
+#
+#  This file, test_AudioFrame.py, is part of Project Alice.
+#
+#  Project Alice is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>
+#
+#  Last modified: 2026.10.18 at 20:13:57 CEST
+
+import io
+import wave
+from unittest import TestCase
+
+from core.server.model.AudioFrame import AudioFormat, AudioFrame
+
+
+class TestAudioFrame(TestCase):
+
+	def test_decode(self):
+		pcm = bytes(range(256)) * 2 + b'\x01\x02'
+		with io.BytesIO() as buffer:
+			with wave.open(buffer, 'wb') as wav:
+				wav.setnchannels(1)
+				wav.setsampwidth(2)
+				wav.setframerate(16000)
+				wav.writeframes(pcm)
+			payload = buffer.getvalue()
+
+		frame = AudioFrame.decode(payload)
+		self.assertIsInstance(frame, memoryview)
+		self.assertEqual(frame.tobytes(), pcm)
+		self.assertIs(frame.obj, payload)
+
+		self.assertIsNone(AudioFrame.decode(b''))
+		self.assertIsNone(AudioFrame.decode(b'not a wav container at all'))
+		self.assertIsNone(AudioFrame.decode(payload[:36]))
+
+
+	def test_decode_raw(self):
+		pcm = bytes(range(256)) * 2
+		audioFormat = AudioFormat(rate=16000, width=2, channels=1)
+
+		self.assertIsNone(AudioFrame.decode(pcm))
+
+		frame = AudioFrame.decode(pcm, rawFormat=audioFormat)
+		self.assertIsInstance(frame, memoryview)
+		self.assertIs(frame.obj, pcm)
+		self.assertEqual(frame.tobytes(), pcm)
+
+		self.assertIsNone(AudioFrame.decode(pcm + b'\x01', rawFormat=audioFormat))
+		self.assertIsNone(AudioFrame.decode(b'', rawFormat=audioFormat))
+
+		# Satellites still sending wav keep working even if a format was announced
+		with io.BytesIO() as buffer:
+			with wave.open(buffer, 'wb') as wav:
+				wav.setnchannels(1)
+				wav.setsampwidth(2)
+				wav.setframerate(16000)
+				wav.writeframes(pcm)
+			payload = buffer.getvalue()
+		self.assertEqual(AudioFrame.decode(payload, rawFormat=audioFormat).tobytes(), pcm)
+
+
+	def test_format(self):
+		audioFormat = AudioFormat(rate=16000, width=2, channels=1)
+		self.assertEqual(AudioFrame.decodeFormat(AudioFrame.encodeFormat(audioFormat).encode()), audioFormat)
+
+		self.assertIsNone(AudioFrame.decodeFormat(b''))
+		self.assertIsNone(AudioFrame.decodeFormat(b'not json'))
+		self.assertIsNone(AudioFrame.decodeFormat(b'{"rate": 16000}'))
+		self.assertIsNone(AudioFrame.decodeFormat(b'{"rate": 16000, "width": 0, "channels": 1}'))
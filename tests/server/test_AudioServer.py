@@ -17,7 +17,7 @@
 #
 #  Last modified: 2021.04.13 at 12:56:51 CEST
 
-from unittest import TestCase
+from unittest import TestCase, mock
 
 
 class TestAudioManager(TestCase):
@@ -46,6 +46,37 @@ class TestAudioManager(TestCase):
 		pass  # To be implemented or nothing to test()
 
 
+	@mock.patch('core.base.SuperManager.SuperManager.getInstance')
+	def test_dispatch_audio_frame(self, mock_superManager):
+		from core.server.AudioServer import AudioManager
+
+		audioManager = AudioManager.__new__(AudioManager)
+		audioManager._logger = mock.MagicMock()
+		audioManager._audioFrameFormats = dict()
+		audioManager._assumedFormatFrames = dict()
+		audioManager._droppedAudioFrames = dict()
+		frames = list()
+		audioManager._audioFrameSubscribers = {'satellite': (lambda frame, deviceUid: frames.append(bytes(frame)),)}
+
+		# Raw frames coming in before the retained format are read with the default format
+		audioManager.dispatchAudioFrame('satellite', b'\x01\x00' * 320)
+		audioManager.dispatchAudioFrame('satellite', b'\x02\x00' * 320)
+		self.assertEqual(frames, [b'\x01\x00' * 320, b'\x02\x00' * 320])
+
+		# Unreadable frames are counted and reported once
+		audioManager.dispatchAudioFrame('satellite', b'\x01\x00\x00')
+		audioManager.dispatchAudioFrame('satellite', b'\x01\x00\x00')
+		self.assertEqual(len(frames), 2)
+		self.assertEqual(audioManager.audioFrameStats, {'assumedFormat': {'satellite': 4}, 'dropped': {'satellite': 2}})
+		self.assertEqual([call.kwargs['function'] for call in audioManager._logger.doLog.call_args_list].count('warning'), 1)
+
+		# Once announced, the device format is used
+		audioManager.onAudioFrameFormat('satellite', b'{"rate": 16000, "width": 3, "channels": 1}')
+		audioManager.dispatchAudioFrame('satellite', b'\x01\x00\x00')
+		self.assertEqual(frames[-1], b'\x01\x00\x00')
+		self.assertEqual(audioManager.audioFrameStats['assumedFormat'], {'satellite': 4})
+
+
 	def test_publish_audio_frames(self):
 		pass  # To be implemented or nothing to test()
 
@@ -0,0 +1,87 @@
+#  Copyright (c) 2021
+#
+#  This file, test_AsyncLogHandler.py, is part of Project Alice.
+#
+#  Project Alice is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>
+#
+#  Last modified: 2026.10.18 at 20:44:05 CEST
+
+import logging
+import threading
+import time
+from unittest import TestCase
+
+from core.util.model.AsyncLogHandler import AsyncLogHandler
+
+
+class ListHandler(logging.Handler):
+
+	def __init__(self, block: threading.Event = None):
+		super().__init__()
+		self.messages = list()
+		self.block = block
+
+
+	def emit(self, record: logging.LogRecord):
+		if self.block:
+			self.block.wait()
+		self.messages.append(record.getMessage())
+
+
+class TestAsyncLogHandler(TestCase):
+
+	def setUp(self):
+		self.logger = logging.getLogger('TestAsyncLogHandler')
+		self.logger.propagate = False
+		self.logger.setLevel(logging.DEBUG)
+
+
+	def test_emit(self):
+		target = ListHandler()
+		handler = AsyncLogHandler(target)
+		self.logger.addHandler(handler)
+		handler.start()
+		try:
+			for i in range(5):
+				self.logger.info('line %d', i)
+		finally:
+			handler.stop()
+			self.logger.removeHandler(handler)
+
+		self.assertEqual(target.messages, [f'line {i}' for i in range(5)])
+		self.assertEqual(handler.dropped, 0)
+
+
+	def test_overflow(self):
+		block = threading.Event()
+		target = ListHandler(block=block)
+		handler = AsyncLogHandler(target, capacity=3)
+		self.logger.addHandler(handler)
+		try:
+			for i in range(6):
+				self.logger.info('line %d', i)
+			self.assertEqual(handler.dropped, 3)
+
+			self.logger.info('line 6')
+			handler.start()
+			block.set()
+			while len(target.messages) < 3:
+				time.sleep(0.01)
+		finally:
+			handler.stop()
+			self.logger.removeHandler(handler)
+
+		self.assertEqual(handler.dropped, 4)
+		self.assertEqual(target.messages[:3], ['line 4', 'line 5', 'line 6'])
+		self.assertIn('dropped 4 records', target.messages[-1])
@@ -0,0 +1,66 @@
+#  Copyright (c) 2021
+#
+#  This file, test_BootProfiler.py, is part of Project Alice.
+#
+#  Project Alice is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>
+#
+#  Last modified: 2026.10.18 at 20:52:15 CEST
+
+import json
+import tempfile
+from pathlib import Path
+from unittest import TestCase, mock
+
+from core.util.model.BootProfiler import BootProfiler
+
+
+class TestBootProfiler(TestCase):
+
+	@mock.patch('core.base.SuperManager.SuperManager.getInstance')
+	def test_measure(self, mock_superManager):
+		with tempfile.TemporaryDirectory() as tmp:
+			path = Path(tmp, 'logs', 'bootTrace.json')
+
+			with mock.patch.object(BootProfiler, 'FLAG_FILE', Path(tmp, 'missing')):
+				profiler = BootProfiler()
+			self.assertFalse(profiler.enabled)
+			with profiler.measure(name='nothing'):
+				pass
+			self.assertFalse(profiler.save(path=path))
+			self.assertFalse(path.exists())
+
+			with mock.patch.object(BootProfiler, 'FLAG_FILE', Path(tmp)):
+				profiler = BootProfiler()
+			self.assertTrue(profiler.enabled)
+
+			with profiler.measure(name='Boot'):
+				with profiler.measure(name='TestManager.onStart', category='manager', skills=2):
+					sum(range(10000))
+				with self.assertRaises(ValueError):
+					with profiler.measure(name='Broken.onStart', category='skill'):
+						raise ValueError('nope')
+
+			self.assertTrue(profiler.save(path=path))
+			self.assertFalse(profiler.enabled)
+
+			trace = json.loads(path.read_text())
+			spans = {event['name']: event for event in trace['traceEvents'] if event['ph'] == 'X'}
+			self.assertEqual(set(spans), {'Boot', 'TestManager.onStart', 'Broken.onStart'})
+			self.assertEqual(spans['TestManager.onStart']['cat'], 'manager')
+			self.assertEqual(spans['TestManager.onStart']['args']['skills'], 2)
+			self.assertIn('cpuMs', spans['Boot']['args'])
+			self.assertIn('nope', spans['Broken.onStart']['args']['error'])
+			self.assertLessEqual(spans['Boot']['ts'], spans['TestManager.onStart']['ts'])
+			self.assertGreaterEqual(spans['Boot']['dur'], spans['TestManager.onStart']['dur'])
+			self.assertTrue(any(event['name'] == 'thread_name' for event in trace['traceEvents']))
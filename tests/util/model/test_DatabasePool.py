@@ -0,0 +1,82 @@
+#  Copyright (c) 2021
+#
+#  This file, test_DatabasePool.py, is part of Project Alice.
+#
+#  Project Alice is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>
+#
+#  Last modified: 2026.10.18 at 20:17:29 CEST
+
+import tempfile
+import threading
+from pathlib import Path
+from unittest import TestCase
+
+from core.util.model.DatabasePool import DatabasePool
+
+
+class TestDatabasePool(TestCase):
+
+	def setUp(self):
+		self._directory = tempfile.TemporaryDirectory()
+		self._pool = DatabasePool(database=str(Path(self._directory.name, 'test.db')))
+
+
+	def tearDown(self):
+		self._pool.close()
+		self._directory.cleanup()
+
+
+	def test_connect(self):
+		connection = self._pool.connect()
+		self.assertEqual(connection.execute('PRAGMA journal_mode').fetchone()[0], 'wal')
+		self.assertEqual(connection.execute('PRAGMA synchronous').fetchone()[0], 1)
+		connection.close()
+
+
+	def test_reader(self):
+		reader = self._pool.reader()
+		self.assertIs(self._pool.reader(), reader)
+
+		others = list()
+		thread = threading.Thread(target=lambda: others.append(self._pool.reader()))
+		thread.start()
+		thread.join()
+		self.assertIsNot(others[0], reader)
+		self.assertEqual(self._pool.size, 2)
+
+		# Connections of finished threads are closed when a new reader is opened
+		thread = threading.Thread(target=self._pool.reader)
+		thread.start()
+		thread.join()
+		self.assertEqual(self._pool.size, 2)
+
+
+	def test_writer(self):
+		with self._pool.writeLock:
+			writer = self._pool.writer()
+			writer.execute('CREATE TABLE test (value INTEGER)')
+			writer.execute('INSERT INTO test (value) VALUES (1)')
+			writer.commit()
+
+		self.assertIs(self._pool.writer(), writer)
+		self.assertEqual(self._pool.reader().execute('SELECT value FROM test').fetchone()['value'], 1)
+
+
+	def test_close(self):
+		self._pool.reader()
+		self._pool.writer()
+		self.assertEqual(self._pool.size, 2)
+
+		self._pool.close()
+		self.assertEqual(self._pool.size, 0)
@@ -17,7 +17,10 @@
 #
 #  Last modified: 2021.04.13 at 12:56:52 CEST
 
-from unittest import TestCase
+import logging
+from unittest import TestCase, mock
+
+from core.util.model.Logger import Logger
 
 
 class TestLogger(TestCase):
@@ -47,7 +50,24 @@ class TestLogger(TestCase):
 
 
 	def test_do_log(self):
-		pass  # To be implemented or nothing to test()
+		logger = Logger(prepend='[Test]')
+		logger._logger = mock.MagicMock()
+		logger._logger.isEnabledFor.side_effect = lambda level: level >= logging.INFO
+		build = mock.MagicMock(return_value='built')
+
+		logger.logDebug(build)
+		logger.logDebug('{} and {}', 'one', 'two')
+		build.assert_not_called()
+		logger._logger.debug.assert_not_called()
+
+		logger.logInfo(build)
+		logger.logInfo('{} and {}', 'one', 'two')
+		logger.logInfo('{not formatted}')
+		self.assertEqual([call.args[0] for call in logger._logger.info.call_args_list], [
+			'[Test]                              built',
+			'[Test]                              one and two',
+			'[Test]                              {not formatted}'
+		])
 
 
 	def test_do_plural(self):
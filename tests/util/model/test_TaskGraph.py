@@ -0,0 +1,79 @@
+#  Copyright (c) 2021
+#
+#  This file, test_TaskGraph.py, is part of Project Alice.
+#
+#  Project Alice is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>
+#
+#  Last modified: 2026.10.18 at 20:50:33 CEST
+
+import threading
+import time
+from unittest import TestCase, mock
+
+from core.util.model.TaskGraph import TaskGraph
+from core.util.model.WorkerPool import WorkerPool
+
+
+class TestTaskGraph(TestCase):
+
+	@mock.patch('core.base.SuperManager.SuperManager.getInstance')
+	def test_run(self, mock_superManager):
+		pool = WorkerPool(name='test', maxWorkers=4)
+		graph = TaskGraph(pool=pool)
+		lock = threading.Lock()
+		order = list()
+
+		def task(name: str):
+			time.sleep(0.05)
+			with lock:
+				order.append(name)
+
+		graph.add(name='core', func=task, args=['core'])
+		graph.add(name='weather', func=task, args=['weather'], dependencies=['core', 'unknown'])
+		graph.add(name='clock', func=task, args=['clock'])
+		graph.add(name='alarm', func=task, args=['alarm'], dependencies=['clock', 'weather'])
+		graph.add(name='broken', func=int, args=['nope'])
+
+		timings = graph.run()
+		self.assertEqual(set(order), {'core', 'weather', 'clock', 'alarm'})
+		self.assertLess(order.index('core'), order.index('weather'))
+		self.assertEqual(order[-1], 'alarm')
+		self.assertEqual(len(timings), 5)
+		self.assertIsNotNone(timings['broken']['error'])
+		self.assertGreaterEqual(timings['alarm']['start'], timings['weather']['start'] + timings['weather']['duration'])
+		# core and clock are independent and ran side by side
+		self.assertLess(abs(timings['core']['start'] - timings['clock']['start']), 0.04)
+		pool.shutdown()
+
+
+	@mock.patch('core.base.SuperManager.SuperManager.getInstance')
+	def test_cycle_and_abort(self, mock_superManager):
+		pool = WorkerPool(name='test', maxWorkers=4)
+		order = list()
+
+		graph = TaskGraph(pool=pool)
+		graph.add(name='a', func=order.append, args=['a'], dependencies=['b'])
+		graph.add(name='b', func=order.append, args=['b'], dependencies=['a'])
+		graph.run()
+		self.assertEqual(order, ['a', 'b'])
+
+		order.clear()
+		graph = TaskGraph(pool=pool)
+		graph.add(name='a', func=graph.abort)
+		graph.add(name='b', func=order.append, args=['b'], dependencies=['a'])
+		timings = graph.run()
+		self.assertTrue(graph.aborted)
+		self.assertEqual(order, list())
+		self.assertEqual(list(timings), ['a'])
+		pool.shutdown()
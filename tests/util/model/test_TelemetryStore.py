@@ -0,0 +1,56 @@
+#  Copyright (c) 2021
+#
+#  This file, test_TelemetryStore.py, is part of Project Alice.
+#
+#  Project Alice is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>
+#
+#  Last modified: 2026.10.18 at 20:19:14 CEST
+
+from unittest import TestCase
+
+from core.util.model.TelemetryData import TelemetryData
+from core.util.model.TelemetryStore import TelemetryStore
+from core.util.model.TelemetryType import TelemetryType
+
+
+class TestTelemetryStore(TestCase):
+
+	def test_update(self):
+		store = TelemetryStore()
+		self.assertTrue(store.update(ttype=TelemetryType.TEMPERATURE, value='21', service='Sensor', deviceId=1, timestamp=10, locationId=2))
+		self.assertFalse(store.update(ttype=TelemetryType.TEMPERATURE, value='21', service='Sensor', deviceId=1, timestamp=10, locationId=2))
+		self.assertTrue(store.update(ttype=TelemetryType.TEMPERATURE, value='22', service='Sensor', deviceId=1, timestamp=20, locationId=2))
+		self.assertTrue(store.update(ttype=TelemetryType.HUMIDITY, value='40', service='Sensor', deviceId=1, timestamp=20, locationId=2))
+		self.assertEqual(len(store), 2)
+
+		current = store.get(ttype=TelemetryType.TEMPERATURE, service='Sensor', deviceId=1, locationId=2)
+		self.assertEqual(current.value, '22')
+		self.assertEqual(current.timestamp, 20)
+
+
+	def test_find(self):
+		store = TelemetryStore()
+		store.add(TelemetryData({'type': 'temperature', 'value': '21', 'service': 'Sensor', 'deviceId': 1, 'timestamp': 10, 'locationId': 1}))
+		store.add(TelemetryData({'type': 'temperature', 'value': '18', 'service': 'Sensor', 'deviceId': 2, 'timestamp': 10, 'locationId': 2}))
+		store.add(TelemetryData({'type': 'humidity', 'value': '40', 'service': 'Sensor', 'deviceId': 2, 'timestamp': 10, 'locationId': 2}))
+
+		self.assertEqual(len(store.find()), 3)
+		self.assertEqual({data.deviceId for data in store.byType(TelemetryType.TEMPERATURE)}, {1, 2})
+		self.assertEqual({data.type for data in store.byLocation(2)}, {TelemetryType.TEMPERATURE, TelemetryType.HUMIDITY})
+		self.assertEqual([data.value for data in store.find(ttype=TelemetryType.TEMPERATURE, locationId=2)], ['18'])
+		self.assertEqual(store.find(ttype=TelemetryType.CO2), list())
+
+		store.clear()
+		self.assertEqual(len(store), 0)
+		self.assertEqual(store.byLocation(2), list())
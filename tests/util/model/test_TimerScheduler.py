@@ -0,0 +1,93 @@
+#  Copyright (c) 2021
+#
+#  This file, test_TimerScheduler.py, is part of Project Alice.
+#
+#  Project Alice is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>
+#
+#  Last modified: 2026.10.18 at 20:27:04 CEST
+
+import threading
+from unittest import TestCase, mock
+
+from core.util.model.ThreadTimer import ThreadTimer
+from core.util.model.TimerScheduler import TimerScheduler
+
+
+class TestTimerScheduler(TestCase):
+
+	@mock.patch('core.base.SuperManager.SuperManager.getInstance')
+	def test_schedule(self, mock_superManager):
+		scheduler = TimerScheduler(workers=1)
+		fired = list()
+		done = threading.Event()
+
+		def callback(name: str):
+			fired.append(name)
+			if name == 'last':
+				done.set()
+
+		timers = [ThreadTimer(scheduler=scheduler, interval=interval, callback=callback, args=[name]) for name, interval in (('last', 0.15), ('first', 0.01), ('cancelled', 0.05), ('second', 0.1))]
+		for timer in timers:
+			timer.start()
+
+		timers[2].cancel()
+		self.assertFalse(timers[2].is_alive())
+		self.assertTrue(timers[0].is_alive())
+		self.assertEqual(scheduler.stats['pending'], 3)
+
+		self.assertTrue(done.wait(2))
+		self.assertEqual(fired, ['first', 'second', 'last'])
+
+		stats = scheduler.stats
+		self.assertEqual(stats['pending'], 0)
+		self.assertEqual(stats['fired'], 3)
+		self.assertEqual(stats['cancelled'], 1)
+		self.assertGreaterEqual(stats['lagMax'], 0)
+
+		scheduler.stop()
+		self.assertRaises(RuntimeError, timers[0].start)
+
+
+	@mock.patch('core.base.SuperManager.SuperManager.getInstance')
+	def test_compact(self, mock_superManager):
+		scheduler = TimerScheduler(workers=1)
+		timers = [ThreadTimer(scheduler=scheduler, interval=60, callback=print) for _ in range(200)]
+		for timer in timers:
+			timer.start()
+
+		for timer in timers[:150]:
+			timer.cancel()
+
+		self.assertEqual(scheduler.stats['pending'], 50)
+		self.assertLess(len(scheduler._heap), 200)
+		scheduler.stop()
+
+
+	@mock.patch('core.base.SuperManager.SuperManager.getInstance')
+	def test_restart(self, mock_superManager):
+		scheduler = TimerScheduler(workers=1)
+		done = threading.Event()
+
+		ThreadTimer(scheduler=scheduler, interval=0.01, callback=done.set).start()
+		self.assertTrue(done.wait(2))
+		scheduler.stop()
+
+		done.clear()
+		ThreadTimer(scheduler=scheduler, interval=0.01, callback=done.set).start()
+		self.assertFalse(done.wait(0.1))
+
+		scheduler.start()
+		ThreadTimer(scheduler=scheduler, interval=0.01, callback=done.set).start()
+		self.assertTrue(done.wait(2))
+		scheduler.stop()
@@ -0,0 +1,85 @@
+#  Copyright (c) 2021
+#
+#  This file, test_WorkerPool.py, is part of Project Alice.
+#
+#  Project Alice is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>
+#
+#  Last modified: 2026.10.18 at 20:28:07 CEST
+
+import threading
+from unittest import TestCase, mock
+
+from core.ProjectAliceExceptions import WorkerPoolFull
+from core.util.model.WorkerPool import WorkerPool
+
+
+class TestWorkerPool(TestCase):
+
+	@mock.patch('core.base.SuperManager.SuperManager.getInstance')
+	def test_submit(self, mock_superManager):
+		pool = WorkerPool(name='test', maxWorkers=2)
+		futures = [pool.submit(func=pow, args=[i, 2]) for i in range(10)]
+		self.assertEqual([future.result(timeout=2) for future in futures], [i ** 2 for i in range(10)])
+
+		failing = pool.submit(func=int, args=['nope'])
+		self.assertRaises(ValueError, failing.result, 2)
+
+		stats = pool.stats
+		self.assertLessEqual(stats['workers'], 2)
+		self.assertEqual(stats['submitted'], 11)
+		self.assertEqual(stats['completed'], 11)
+		self.assertEqual(stats['failed'], 1)
+		pool.shutdown()
+
+
+	@mock.patch('core.base.SuperManager.SuperManager.getInstance')
+	def test_priority_and_limit(self, mock_superManager):
+		pool = WorkerPool(name='test', maxWorkers=1, queueSize=3)
+		release = threading.Event()
+		order = list()
+
+		blocker = pool.submit(func=release.wait)
+		while not pool.stats['active']:
+			release.wait(0.01)
+
+		last = pool.submit(func=order.append, args=['low'], priority=WorkerPool.PRIORITY_LOW)
+		pool.submit(func=order.append, args=['normal'])
+		pool.submit(func=order.append, args=['high'], priority=WorkerPool.PRIORITY_HIGH)
+		self.assertRaises(WorkerPoolFull, pool.submit, order.append, ['rejected'])
+		self.assertEqual(pool.stats['queueDepth'], 3)
+		self.assertEqual(pool.stats['rejected'], 1)
+
+		release.set()
+		blocker.result(timeout=2)
+		pool.shutdown(cancelPending=False)
+		last.result(timeout=2)
+		self.assertEqual(order, ['high', 'normal', 'low'])
+
+
+	@mock.patch('core.base.SuperManager.SuperManager.getInstance')
+	def test_base_exception(self, mock_superManager):
+		pool = WorkerPool(name='test', maxWorkers=1)
+
+		def leave():
+			raise SystemExit
+
+		future = pool.submit(func=leave)
+		self.assertRaises(SystemExit, future.result, 2)
+		self.assertEqual(pool.submit(func=pow, args=[2, 2]).result(timeout=2), 4)
+
+		stats = pool.stats
+		self.assertEqual(stats['active'], 0)
+		self.assertEqual(stats['failed'], 1)
+		pool.shutdown()
+
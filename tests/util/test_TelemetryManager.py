@@ -17,7 +17,9 @@
 #
 #  Last modified: 2021.04.13 at 12:56:52 CEST
 
-from unittest import TestCase
+from unittest import TestCase, mock
+
+from core.util.TelemetryManager import TelemetryManager
 
 
 class TestTelemetryManager(TestCase):
@@ -26,8 +28,51 @@ class TestTelemetryManager(TestCase):
 		pass  # To be implemented or nothing to test()
 
 
-	def test_on_quarter_hour(self):
-		pass  # To be implemented or nothing to test()
+	@mock.patch('core.util.TelemetryManager.time.time')
+	@mock.patch('core.base.SuperManager.SuperManager.getInstance')
+	def test_on_quarter_hour(self, mock_instance, mock_time):
+		mock_time.return_value = 86400 * 4000
+		mock_instance().ConfigManager.getAliceConfigByName.return_value = 0
+		telemetryManager = TelemetryManager()
+		telemetryManager._isActive = True
+		telemetryManager.onQuarterHour()
+
+		# Raw samples are kept as configured, every rollup resolution has its own retention
+		mock_instance().DatabaseManager.prune.assert_not_called()
+		pruned = {call.kwargs['tableName']: call.kwargs['values']['oldest'] for call in mock_instance().DatabaseManager.delete.call_args_list}
+		self.assertEqual(pruned, {
+			'telemetryMinute': 86400 * (4000 - 14),
+			'telemetryHour'  : 86400 * (4000 - 365),
+			'telemetryDay'   : 86400 * (4000 - 3650)
+		})
+
+
+	@mock.patch('core.base.SuperManager.SuperManager.getInstance')
+	def test_backfill_rollups(self, mock_instance):
+		samples = [{'id': i, 'type': 'temperature', 'service': 'Sensor', 'deviceId': 1, 'locationId': 1, 'timestamp': 60 * i, 'value': '20'} for i in range(1, 6)]
+
+		def fetch(tableName: str, query: str, values: dict = None):
+			if tableName in TelemetryManager.ROLLUPS:
+				return list()
+			if 'max(id)' in query:
+				return [{'maxId': 5}]
+			return [row for row in samples if values['lastId'] < row['id'] <= values['maxId']][:values['limit']]
+
+		telemetryManager = TelemetryManager()
+		telemetryManager._logger = mock.MagicMock()
+		telemetryManager.databaseFetch = mock.MagicMock(side_effect=fetch)
+		telemetryManager.storeRollups = mock.MagicMock()
+
+		# Not built while starting, but on a worker and only up to the samples stored so far
+		telemetryManager.backfillRollups()
+		telemetryManager.storeRollups.assert_not_called()
+		job = mock_instance().ThreadManager.submit.call_args.kwargs
+		self.assertEqual(job['pool'], 'io')
+
+		samples.append({'id': 6, 'type': 'temperature', 'service': 'Sensor', 'deviceId': 1, 'locationId': 1, 'timestamp': 360, 'value': '21'})
+		job['func'](*job['args'], chunkSize=2)
+		stored = [row['id'] for call in telemetryManager.storeRollups.call_args_list for row in call.args[0]]
+		self.assertEqual(stored, [1, 2, 3, 4, 5])
 
 
 	def test_load_data(self):
@@ -38,5 +83,83 @@ class TestTelemetryManager(TestCase):
 		pass  # To be implemented or nothing to test()
 
 
+	@mock.patch('core.base.SuperManager.SuperManager.getInstance')
+	def test_flush(self, mock_instance):
+		telemetryManager = TelemetryManager()
+		telemetryManager.databaseInsertMany = mock.MagicMock()
+
+		for i in range(3):
+			telemetryManager.queueData({'value': i})
+
+		self.assertEqual(telemetryManager.bufferStats['queueDepth'], 3)
+		telemetryManager.databaseInsertMany.assert_not_called()
+		mock_instance().ThreadManager.newTimer.assert_called_once()
+
+		telemetryManager.flush()
+		telemetryManager.databaseInsertMany.assert_called_once_with(tableName='telemetry', query=TelemetryManager.INSERT_QUERY, values=[{'value': 0}, {'value': 1}, {'value': 2}])
+		self.assertEqual(telemetryManager.bufferStats['queueDepth'], 0)
+		self.assertEqual(telemetryManager.bufferStats['flushedRows'], 3)
+
+		telemetryManager.databaseInsertMany.reset_mock()
+		for i in range(TelemetryManager.FLUSH_SIZE):
+			telemetryManager.queueData({'value': i})
+
+		telemetryManager.databaseInsertMany.assert_called_once()
+		self.assertEqual(telemetryManager.bufferStats['lastFlushSize'], TelemetryManager.FLUSH_SIZE)
+
+
+	@mock.patch('core.util.TelemetryManager.TelemetryManager.MAX_BUFFER', 4)
+	@mock.patch('core.base.SuperManager.SuperManager.getInstance')
+	def test_flush_failure(self, mock_instance):
+		telemetryManager = TelemetryManager()
+		telemetryManager._logger = mock.MagicMock()
+		telemetryManager.databaseInsertMany = mock.MagicMock(side_effect=Exception('database locked'))
+
+		for i in range(3):
+			telemetryManager.queueData({'value': i})
+		telemetryManager.flush()
+
+		# Failed samples go back at the head of the buffer and a retry is scheduled
+		self.assertEqual(telemetryManager.bufferStats['queueDepth'], 3)
+		self.assertEqual(telemetryManager.bufferStats['failedRows'], 3)
+		self.assertEqual(mock_instance().ThreadManager.newTimer.call_count, 2)
+
+		telemetryManager.queueData({'value': 3})
+		telemetryManager.queueData({'value': 4})
+		telemetryManager.flush()
+
+		# Bounded, the oldest samples are dropped
+		self.assertEqual(telemetryManager.bufferStats['droppedRows'], 1)
+
+		telemetryManager.databaseInsertMany.side_effect = None
+		telemetryManager.flush()
+		self.assertEqual(telemetryManager.databaseInsertMany.call_args.kwargs['values'], [{'value': 1}, {'value': 2}, {'value': 3}, {'value': 4}])
+		self.assertEqual(telemetryManager.bufferStats['queueDepth'], 0)
+
+
 	def test_get_data(self):
 		pass  # To be implemented or nothing to test()
+
+
+	def test_aggregate(self):
+		rows = [
+			{'type': 'temperature', 'service': 'Sensor', 'deviceId': 1, 'locationId': 1, 'timestamp': 3600, 'value': '20'},
+			{'type': 'temperature', 'service': 'Sensor', 'deviceId': 1, 'locationId': 1, 'timestamp': 3630, 'value': '22'},
+			{'type': 'temperature', 'service': 'Sensor', 'deviceId': 1, 'locationId': 1, 'timestamp': 3660, 'value': '24'},
+			{'type': 'state', 'service': 'Sensor', 'deviceId': 1, 'locationId': 1, 'timestamp': 3660, 'value': 'on'}
+		]
+		rollups = TelemetryManager.aggregate(rows)
+
+		self.assertEqual(len(rollups['telemetryMinute']), 2)
+		self.assertEqual(len(rollups['telemetryHour']), 1)
+		hour = rollups['telemetryHour'][0]
+		self.assertEqual((hour['bucket'], hour['minimum'], hour['maximum'], hour['total'], hour['count']), (3600, 20, 24, 66, 3))
+		self.assertEqual(rollups['telemetryDay'][0]['bucket'], 0)
+
+
+	def test_select_resolution(self):
+		self.assertIsNone(TelemetryManager.selectResolution(historyFrom=0, historyTo=3600))
+		self.assertEqual(TelemetryManager.selectResolution(historyFrom=0, historyTo=21600), 'telemetryMinute')
+		self.assertEqual(TelemetryManager.selectResolution(historyFrom=0, historyTo=86400 * 7), 'telemetryHour')
+		self.assertEqual(TelemetryManager.selectResolution(historyFrom=0, historyTo=86400 * 365), 'telemetryDay')
+		self.assertEqual(TelemetryManager.selectResolution(historyFrom=0, historyTo=86400 * 7, points=20000), 'telemetryMinute')
@@ -17,13 +17,27 @@
 #
 #  Last modified: 2021.04.13 at 12:56:52 CEST
 
-from unittest import TestCase
+import threading
+from unittest import TestCase, mock
+
+from core.util.ThreadManager import ThreadManager
 
 
 class TestThreadManager(TestCase):
 
-	def test_on_stop(self):
-		pass  # To be implemented or nothing to test()
+	@mock.patch('core.base.SuperManager.SuperManager.getInstance')
+	def test_on_stop(self, mock_superManager):
+		manager = ThreadManager()
+		manager.newPool(name='custom', maxWorkers=3)
+		manager.onStop()
+		self.assertRaises(RuntimeError, manager.submit, pow, 'io', args=[2, 2])
+
+		# A restart brings working pools back
+		manager.onStart()
+		self.assertEqual(manager.submit(func=pow, args=[2, 3]).result(timeout=2), 8)
+		self.assertEqual(manager.submit(func=pow, pool='custom', args=[2, 4]).result(timeout=2), 16)
+		self.assertEqual(manager.poolStats['custom']['maxWorkers'], 3)
+		manager.onStop()
 
 
 	def test_on_booted(self):
@@ -42,8 +56,20 @@ class TestThreadManager(TestCase):
 		pass  # To be implemented or nothing to test()
 
 
-	def test_do_later(self):
-		pass  # To be implemented or nothing to test()
+	@mock.patch('core.base.SuperManager.SuperManager.getInstance')
+	def test_do_later(self, mock_superManager):
+		manager = ThreadManager()
+		done = threading.Event()
+		threads = list()
+
+		def blocking(name: str):
+			threads.append(threading.current_thread().name)
+			done.set()
+
+		manager.doLater(interval=0.01, func=blocking, args=['upload'], pool='io')
+		self.assertTrue(done.wait(2))
+		self.assertTrue(threads[0].startswith('ioPool'))
+		manager.onStop()
 
 
 	def test_on_timer_end(self):
@@ -17,7 +17,11 @@
 #
 #  Last modified: 2021.04.13 at 12:56:52 CEST
 
-from unittest import TestCase
+from unittest import TestCase, mock
+
+from core.ProjectAliceExceptions import WorkerPoolFull
+from core.commons import constants
+from core.util.TimeManager import TimeManager
 
 
 class TestTimeManager(TestCase):
@@ -26,5 +30,27 @@ class TestTimeManager(TestCase):
 		pass  # To be implemented or nothing to test()
 
 
-	def test_timer_signal(self):
-		pass  # To be implemented or nothing to test()
+	@mock.patch('core.base.SuperManager.SuperManager.getInstance')
+	def test_timer_signal(self, mock_superManager):
+		threadManager = mock_superManager.return_value.ThreadManager
+		timeManager = TimeManager.__new__(TimeManager)
+		timeManager._logger = mock.MagicMock()
+		timeManager._name = 'TimeManager'
+
+		timeManager.timerSignal(15, constants.EVENT_QUARTER_HOUR)
+		threadManager.submit.assert_not_called()
+		threadManager.doLater.assert_called_once()
+
+		# The broadcast is queued on a pool, the next signal is armed by the timer itself
+		threadManager.reset_mock()
+		timeManager.timerSignal(15, constants.EVENT_QUARTER_HOUR, True)
+		job = threadManager.submit.call_args.kwargs
+		self.assertEqual(job['func'], timeManager.broadcast)
+		self.assertEqual(job['kwargs']['method'], constants.EVENT_QUARTER_HOUR)
+		threadManager.doLater.assert_called_once()
+
+		# A full pool skips one signal but never stops the chain
+		threadManager.reset_mock()
+		threadManager.submit.side_effect = WorkerPoolFull(message='full')
+		timeManager.timerSignal(15, constants.EVENT_QUARTER_HOUR, True)
+		threadManager.doLater.assert_called_once()
@@ -17,7 +17,12 @@
 #
 #  Last modified: 2021.04.13 at 12:56:52 CEST
 
-from unittest import TestCase
+import tempfile
+import wave
+from pathlib import Path
+from unittest import TestCase, mock
+
+from core.voice.model.Tts import Tts
 
 
 class TestTts(TestCase):
@@ -92,3 +97,96 @@ class TestTts(TestCase):
 
 	def test_on_say(self):
 		pass  # To be implemented or nothing to test()
+
+
+	def test_wav_duration(self):
+		with tempfile.TemporaryDirectory() as directory:
+			file = Path(directory, 'test.wav')
+			with wave.open(str(file), 'wb') as wav:
+				wav.setnchannels(1)
+				wav.setsampwidth(2)
+				wav.setframerate(16000)
+				wav.writeframes(b'\x00\x00' * 24000)
+
+			self.assertEqual(Tts.wavDuration(file), 1.5)
+
+
+	def test_split_sentences(self):
+		tts = Tts.__new__(Tts)
+		self.assertEqual(tts._splitSentences('Hello there!'), ['Hello there!'])
+		self.assertEqual(
+			tts._splitSentences('Ok. The weather today is sunny. Tomorrow it will rain a lot, sadly! Bye.'),
+			['Ok. The weather today is sunny.', 'Tomorrow it will rain a lot, sadly! Bye.']
+		)
+		self.assertEqual(tts._splitSentences('<speak>One sentence. Another sentence here.</speak>'), ['<speak>One sentence. Another sentence here.</speak>'])
+
+
+	@mock.patch('core.base.SuperManager.SuperManager.getInstance')
+	def test_precache(self, mock_superManager):
+		with tempfile.TemporaryDirectory() as directory:
+			cacheFile = Path(directory, 'hello.wav')
+			tts = Tts.__new__(Tts)
+			tts._logger = mock.MagicMock()
+			tts._supportsSSML = False
+			tts.cacheFile = lambda text: cacheFile
+			written = list()
+
+			def synthesize(text: str, cacheFile: Path) -> bool:
+				written.append(cacheFile)
+				cacheFile.write_bytes(b'data')
+				return True
+
+			tts._synthesize = synthesize
+
+			self.assertTrue(tts.precache('Hello'))
+			# Never synthesized straight to the cached file name
+			self.assertNotEqual(written[0], cacheFile)
+			self.assertEqual(cacheFile.read_bytes(), b'data')
+			self.assertEqual(list(Path(directory).iterdir()), [cacheFile])
+			mock_superManager.return_value.TTSManager.cache.add.assert_called_once_with(cacheFile)
+
+			self.assertFalse(tts.precache('Hello'))
+
+			cacheFile.unlink()
+			tts._synthesize = lambda text, cacheFile: cacheFile.write_bytes(b'half') and False
+			self.assertFalse(tts.precache('Hello'))
+			self.assertEqual(list(Path(directory).iterdir()), list())
+
+
+	@mock.patch('core.voice.model.Tts.time.monotonic')
+	@mock.patch('core.base.SuperManager.SuperManager.getInstance')
+	def test_speak_sentences(self, mock_superManager, mock_monotonic):
+		clock = [100.0]
+		mock_monotonic.side_effect = lambda: clock[0]
+		superManager = mock_superManager.return_value
+		superManager.TTSManager.cache.lookup.return_value = False
+		superManager.DeviceManager.getMainDevice.return_value.uid = 'main'
+
+		tts = Tts.__new__(Tts)
+		tts._logger = mock.MagicMock()
+		tts._supportsSSML = False
+		tts.cacheFile = lambda text: Path(text)
+		tts._duration = lambda file: 2.0
+		published = list()
+		tts._play = lambda file, session: published.append(clock[0])
+
+		def synthesize(text: str, cacheFile: Path) -> bool:
+			clock[0] += 1.0
+			return True
+
+		tts._synthesize = synthesize
+
+		session = mock.MagicMock(deviceUid='main', hasEnded=False)
+		tts._speakSentences(sentences=['First sentence.', 'Second sentence.', 'Third sentence.'], session=session)
+
+		# The mqtt thread is handed back at once, synthesis runs on a worker
+		self.assertEqual(published, list())
+		superManager.ThreadManager.submit.assert_called_once()
+		job = superManager.ThreadManager.submit.call_args.kwargs
+		job['func'](*job['args'])
+
+		self.assertEqual(published, [101.0, 102.0, 103.0])
+		superManager.ThreadManager.doLater.assert_called_once()
+		finishedAt = clock[0] + superManager.ThreadManager.doLater.call_args.kwargs['interval']
+		self.assertGreaterEqual(finishedAt, published[0] + 3 * 2.0)
+
@@ -0,0 +1,79 @@
+#  Copyright (c) 2021
+#
+#  This file, test_TtsCache.py, is part of Project Alice.
+#
+#  Project Alice is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>
+#
+#  Last modified: 2026.10.18 at 20:31:25 CEST
+
+import tempfile
+import time
+from pathlib import Path
+from unittest import TestCase, mock
+
+from core.voice.model.TtsCache import TtsCache
+
+
+class TestTtsCache(TestCase):
+
+	@mock.patch('core.base.SuperManager.SuperManager.getInstance')
+	def test_cache(self, mock_superManager):
+		with tempfile.TemporaryDirectory() as directory:
+			root = Path(directory)
+			voice = root / 'pico/en-US/male/en-US'
+			voice.mkdir(parents=True)
+
+			old = voice / 'old.wav'
+			old.write_bytes(b'0' * 100)
+			# Other files sharing the cache root are neither counted nor evicted
+			userSpeech = root / 'lastUserpeech_unknown_default.wav'
+			userSpeech.write_bytes(b'0' * 1000)
+			cache = TtsCache(root=root, folders=['pico'])
+			cache.load()
+			self.assertEqual(cache.size, 100)
+			cache.add(userSpeech)
+			self.assertEqual(cache.size, 100)
+
+			files = list()
+			for i in range(3):
+				file = voice / f'{i}.wav'
+				self.assertFalse(cache.lookup(file))
+				file.write_bytes(b'0' * 100)
+				cache.add(file)
+				files.append(file)
+
+			self.assertTrue(cache.lookup(old))
+			self.assertTrue(cache.lookup(files[0]))
+			self.assertEqual(cache.size, 400)
+
+			self.assertEqual(cache.evict(maxSize=250), 2)
+			self.assertTrue(old.exists())
+			self.assertTrue(files[0].exists())
+			self.assertFalse(files[1].exists())
+
+			stats = cache.stats
+			self.assertEqual(stats['entries'], 2)
+			self.assertEqual(stats['hits'], 2)
+			self.assertEqual(stats['misses'], 3)
+			self.assertEqual(stats['evictions'], 2)
+
+			cache.save()
+			reloaded = TtsCache(root=root, folders=['pico'])
+			reloaded.load()
+			self.assertEqual(reloaded.size, 200)
+
+			with mock.patch('core.voice.model.TtsCache.time.time', return_value=time.time() + 86400):
+				self.assertEqual(reloaded.evict(maxSize=1000, maxAge=3600), 2)
+			self.assertEqual(reloaded.size, 0)
+			self.assertTrue(userSpeech.exists())
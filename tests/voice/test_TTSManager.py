@@ -17,7 +17,11 @@
 #
 #  Last modified: 2021.04.13 at 12:56:52 CEST
 
-from unittest import TestCase
+import threading
+from collections import OrderedDict
+from unittest import TestCase, mock
+
+from core.voice.TTSManager import TTSManager
 
 
 class TestTTSManager(TestCase):
@@ -48,3 +52,36 @@ class TestTTSManager(TestCase):
 
 	def test_on_say(self):
 		pass  # To be implemented or nothing to test()
+
+
+	@mock.patch('core.base.SuperManager.SuperManager.getInstance')
+	def test_get_user_tts(self, mock_superManager):
+		mock_superManager.return_value.ConfigManager.getAliceConfigByName.return_value = ''
+		mock_superManager.return_value.LanguageManager.activeLanguageAndCountryCode = 'en-US'
+
+		manager = TTSManager.__new__(TTSManager)
+		manager._engines = OrderedDict()
+		manager._enginesLock = threading.Lock()
+		manager.ENGINE_CACHE_SIZE = 2
+		manager._loadTTS = mock.MagicMock(side_effect=lambda userTTS, user: mock.MagicMock(name=f'{userTTS}_{user.ttsVoice}'))
+
+		def user(tts: str, voice: str) -> mock.MagicMock:
+			return mock.MagicMock(tts=tts, ttsLanguage='', ttsType='', ttsVoice=voice)
+
+		first = manager.getUserTts(user('pico', 'a'))
+		self.assertIs(manager.getUserTts(user('Pico', 'a')), first)
+		self.assertEqual(manager._loadTTS.call_count, 1)
+
+		second = manager.getUserTts(user('pico', 'b'))
+		self.assertIsNot(second, first)
+		manager.getUserTts(user('pico', 'a'))
+		manager.getUserTts(user('amazon', 'c'))
+		self.assertEqual(manager._loadTTS.call_count, 3)
+		self.assertEqual(list(manager._engines), [('pico', 'en-US', '', 'a'), ('amazon', 'en-US', '', 'c')])
+
+		# Engines dropped from the cache are stopped
+		second.onStop.assert_called_once()
+		first.onStop.assert_not_called()
+		manager.clearEngines()
+		first.onStop.assert_called_once()
+		self.assertEqual(len(manager._engines), 0)